@@ -7,8 +7,12 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 from PIL import Image
 from matplotlib.patches import Arc
 import pandas as pd
+import queue
+import threading
 import time
-from scipy.optimize import root
+from concurrent.futures import Future
+from sintese import cache, checkpoint, cinematica, comparacao, decomposicao, inicializacao, motores, normalizacao, objetivos, paralelo, parada, refinamento
+from sintese.cinematica import Parametros
 
 # ---------------------------------------------------------------------------
 # Síntese de mecanismos - Interface GUI
@@ -26,6 +30,18 @@ from scipy.optimize import root
 # ---------------------------------------------------------------------------
 
 
+# Conjunto de 20 pontos de precisão (graus), o mesmo para todas as topologias,
+# usado quando "Entrada 1" é "1" e as demais caixas estão vazias
+ENTRADAS_20_PONTOS = (
+    0.37, 3.32, 9.13, 17.68, 28.75, 42.07, 57.30, 74.08, 91.99, 110.58,
+    129.42, 148.01, 165.92, 182.70, 197.93, 211.25, 222.32, 230.87, 236.68, 239.63,
+)
+SAIDAS_20_PONTOS = (
+    14.29, 15.73, 18.78, 23.73, 30.74, 39.49, 48.85, 56.77, 60.88, 59.71,
+    53.80, 45.60, 38.16, 33.51, 31.92, 32.47, 33.91, 35.33, 36.32, 36.81,
+)
+
+
 # Classe que define os objetos no loop da interface do CustomTkinter
 class App(ctk.CTk):
     def __init__(self):
@@ -34,6 +50,16 @@ class App(ctk.CTk):
         # Aqui chamamos o construtor da classe-pai (CTk) e delegamos a
         # construção dos componentes de interface para `init_ui()`.
         super().__init__()
+        self.pool_trabalho = None  # paralelo.PoolPersistente, criado na primeira otimização
+        self.fila_progresso = queue.Queue()  # Progresso da otimização (thread de segundo plano -> loop do Tk)
+        self.cancelamento = threading.Event()  # Pedido de cancelamento (botão "Cancelar" -> callback do DE)
+        self.cache_resultados = None  # cache.CacheResultados, aberto na primeira consulta
+        self.chave_resultado = None  # Chave no cache da síntese em andamento
+        self.derivados_cache = None  # cache.Derivados quando o resultado veio do cache
+        self.criterios_parada = []  # Critérios de `sintese.parada` consultados pelo callback do DE
+        self.orcamento = None  # parada.Orcamento da síntese em andamento, se houver orçamento
+        self.inicio_DE = ('latinhypercube', [])  # (método, vetores semeados) da população inicial do DE
+        self.tipo_resultado = None  # Mecanismo da síntese em andamento, gravado junto no cache
         self.init_ui()
 
         # Garante que, ao fechar a janela, plots do matplotlib sejam
@@ -42,11 +68,12 @@ class App(ctk.CTk):
 
     def on_closing(self):
         plt.close('all')
+        if self.pool_trabalho is not None:
+            self.pool_trabalho.encerrar()
         self.destroy()
 
     def init_ui(self):
 
-        self.initial_guess = None
         #243464
         # Constants
         #IMAGE_PATH1 = "C:\\Users\\Daniel\\OneDrive\\Documentos\\TCC\\Oertical_extenso_fundo_claro_ok.png"
@@ -168,6 +195,18 @@ class App(ctk.CTk):
             self.frames[frame_name] = ctk.CTkFrame(master=self.tabview.tab(tab_name), fg_color="#8eaef1", width=1920, height=515, border_color="#000000")
             self.frames[frame_name].place(relx=0, rely=0, anchor="nw")
 
+        # Janela "Opções avançadas" (motores do DE, checkpoint, cache, restrições...). A aba de
+        # configurações tem 1100 de largura, sem espaço para esses switches; a janela é aberta pelo
+        # botão "Opções avançadas" e, ao ser fechada, só é escondida (os switches continuam valendo).
+        self.janela_opcoes = ctk.CTkToplevel(self)
+        self.janela_opcoes.title("Opções avançadas")
+        self.janela_opcoes.geometry("880x520")
+        self.janela_opcoes.resizable(False, False)
+        self.janela_opcoes.withdraw()
+        self.janela_opcoes.protocol("WM_DELETE_WINDOW", self.janela_opcoes.withdraw)
+        self.frames["frame_opcoes"] = ctk.CTkFrame(master=self.janela_opcoes, fg_color="#8eaef1", width=880, height=520)
+        self.frames["frame_opcoes"].place(relx=0, rely=0, anchor="nw")
+
     def create_buttons(self):
         """Cria botões usados na interface e armazena-os em `self.buttons`.
 
@@ -178,13 +217,18 @@ class App(ctk.CTk):
 
         button_specs = [
             ("Home", self.frames["frame_2"], 0.1, 0.5, self.reset_ALL),
-            ("Otimizar", self.frames["frame_3"], 0.5, 0.8, self.entregar_p_otimizar),
+            ("Otimizar", self.frames["frame_3"], 0.5, 0.8, self.otimizar),
+            ("Opções avançadas", self.frames["frame_4_Configurações"], 0.5, 0.70, self.mostrar_opcoes_avancadas),
         ]
         for text, frame, relx, rely, command in button_specs:
             button = ctk.CTkButton(frame, text=text, corner_radius=32, fg_color=self.BUTTON_COLOR, hover_color=self.BUTTON_HOVER_COLOR, border_color=self.BUTTON_BORDER_COLOR, border_width=2, command=command, text_color=self.BUTTON_TEXT_COLOR)
             button.place(relx=relx, rely=rely, anchor="center")
             self.buttons[text] = button  # Store button reference
 
+        # Botão "Cancelar": aparece no lugar do "Otimizar" enquanto a otimização roda. Fica fora de
+        # `self.buttons` para não ser desativado por `disable_interactives`.
+        self.botao_cancelar = ctk.CTkButton(self.frames["frame_3"], text="Cancelar", corner_radius=32, fg_color=self.BUTTON_COLOR, hover_color=self.BUTTON_HOVER_COLOR, border_color=self.BUTTON_BORDER_COLOR, border_width=2, command=self.cancelar_otimizacao, text_color=self.BUTTON_TEXT_COLOR)
+
         # Botão de visualização de ângulos para cada aba de mecanismo
         for tab_name in ["Watt 1", "Watt 2", "Stephenson 1", "Stephenson 2", "Stephenson 3"]:
             frame_name = f"frame_4_{tab_name.replace(' ', '_')}"
@@ -406,6 +450,19 @@ class App(ctk.CTk):
         self.labelconfig17 = ctk.CTkLabel(self.frames["frame_4_Configurações"], text="Recombinação:", font=("Arial", 15), text_color="#000000")
         self.labelconfig17.place(relx=0.37, rely=0.94, anchor="e")
 
+        # Janela "Opções avançadas"
+        self.labelopcoes1 = ctk.CTkLabel(self.frames["frame_opcoes"], text="Tolerância do alvo (graus):", font=("Arial", 13), text_color="#000000")
+        self.labelopcoes1.place(relx=0.82, rely=0.24, anchor="e")
+
+        self.labelopcoes2 = ctk.CTkLabel(self.frames["frame_opcoes"], text="Margem de mi do alvo (graus):", font=("Arial", 13), text_color="#000000")
+        self.labelopcoes2.place(relx=0.82, rely=0.335, anchor="e")
+
+        self.labelopcoes3 = ctk.CTkLabel(self.frames["frame_opcoes"], text="Orçamento de tempo (s):", font=("Arial", 13), text_color="#000000")
+        self.labelopcoes3.place(relx=0.82, rely=0.43, anchor="e")
+
+        self.labelopcoes4 = ctk.CTkLabel(self.frames["frame_opcoes"], text="Orçamento de avaliações:", font=("Arial", 13), text_color="#000000")
+        self.labelopcoes4.place(relx=0.82, rely=0.525, anchor="e")
+
     def create_combo_boxes(self):
         """Cria comboboxes (drop-downs) usados na UI.
 
@@ -419,7 +476,7 @@ class App(ctk.CTk):
         self.combo_boxes = {}  # Dictionary to store combo box references
 
         # Combobox principal (seleção do mecanismo a otimizar)
-        self.combobox = ctk.CTkComboBox(self.frames["frame_3"], values=["Watt 1", "Watt 2", "Stephenson 1", "Stephenson 2", "Stephenson 3"], fg_color="#243464", border_color="#243464", dropdown_fg_color="#243464", text_color="#FFFFFF", dropdown_text_color="#FFFFFF")
+        self.combobox = ctk.CTkComboBox(self.frames["frame_3"], values=["Watt 1", "Watt 2", "Stephenson 1", "Stephenson 2", "Stephenson 3", "Comparar todos"], fg_color="#243464", border_color="#243464", dropdown_fg_color="#243464", text_color="#FFFFFF", dropdown_text_color="#FFFFFF")
         self.combobox.place(relx=0.5, rely=0.12, anchor="center")
         self.combo_boxes["main"] = self.combobox  # Store main combo box reference
 
@@ -432,7 +489,7 @@ class App(ctk.CTk):
                 self.combo_boxes[tab_name] = combobox  # Store combo box reference
             else:
                 # Aba de configurações usa valores diferentes
-                combobox = ctk.CTkComboBox(self.frames[frame_name], values=["randtobest1bin", "best1bin" ,"best1exp", "rand1bin", "rand1exp", "rand2bin", "rand2exp", "randtobest1exp", "currenttobest1bin", "currenttobest1exp", "best2exp", "best2bin"], fg_color="#243464", border_color="#243464", dropdown_fg_color="#243464", text_color="#FFFFFF", dropdown_text_color="#FFFFFF", width= 135)
+                combobox = ctk.CTkComboBox(self.frames[frame_name], values=["randtobest1bin", "best1bin" ,"best1exp", "rand1bin", "rand1exp", "rand2bin", "rand2exp", "randtobest1exp", "currenttobest1bin", "currenttobest1exp", "best2exp", "best2bin", "JADE", "SHADE", "L-SHADE"], fg_color="#243464", border_color="#243464", dropdown_fg_color="#243464", text_color="#FFFFFF", dropdown_text_color="#FFFFFF", width= 135)
                 combobox.place(relx=0.375, rely=0.78, anchor="w")
                 self.combo_boxes[tab_name] = combobox
 
@@ -487,6 +544,12 @@ class App(ctk.CTk):
             (self.frames["frame_4_Configurações"], "Padrão: 15", 0.375, 0.7),
             (self.frames["frame_4_Configurações"], "Padrão: 0.5, 1", 0.375, 0.86),
             (self.frames["frame_4_Configurações"], "Padrão: 0.7", 0.375, 0.94),
+            (self.frames["frame_opcoes"], "Semente (opcional)", 0.04, 0.93),
+            (self.frames["frame_opcoes"], "Padrão: 5°", 0.83, 0.24),
+            (self.frames["frame_opcoes"], "Padrão: 0°", 0.83, 0.335),
+            (self.frames["frame_opcoes"], "Segundos (opcional)", 0.83, 0.43),
+            (self.frames["frame_opcoes"], "Avaliações (opcional)", 0.83, 0.525),
+            (self.frames["frame_opcoes"], "Vetores iniciais: L1 ... L9 φ α λ (graus), separados por |", 0.52, 0.93),
 
 
         ]
@@ -496,6 +559,12 @@ class App(ctk.CTk):
                 entry = ctk.CTkEntry(frame, placeholder_text=placeholder, width=80, placeholder_text_color="#FFFFFF", fg_color="#243464", border_color="#243464")
                 entry.place(relx=relx, rely=rely, anchor="w")
                 self.entries[placeholder] = entry  # Store entry reference
+
+            elif frame == self.frames["frame_opcoes"]:
+                # Entradas da janela "Opções avançadas" (a dos vetores iniciais é longa)
+                entry = ctk.CTkEntry(frame, placeholder_text=placeholder, width=380 if placeholder.startswith("Vetores iniciais") else 110, placeholder_text_color="#FFFFFF", fg_color="#243464", border_color="#243464")
+                entry.place(relx=relx, rely=rely, anchor="w")
+                self.entries[placeholder] = entry
             
             elif rely > 0.25 and rely <= 0.65:
                 # Entradas médias para parâmetros de configuração
@@ -545,6 +614,20 @@ class App(ctk.CTk):
             ("Stephenson 1", self.frames["frame_4_Stephenson_1"], "Mostrar a numeração dos elos", 0.07, 0.02, self.MostrarElosEangulos),
             ("Stephenson 2", self.frames["frame_4_Stephenson_2"], "Mostrar a numeração dos elos", 0.07, 0.02, self.MostrarElosEangulos),
             ("Stephenson 3", self.frames["frame_4_Stephenson_3"], "Mostrar a numeração dos elos", 0.07, 0.02, self.MostrarElosEangulos),
+            ("Configurações", self.frames["frame_opcoes"], "Avaliação vetorizada da população", 0.04, 0.05, None),
+            ("Configurações", self.frames["frame_opcoes"], "Síntese em duas etapas (Watt 1 e Stephenson 1)", 0.04, 0.145, None),
+            ("Configurações", self.frames["frame_opcoes"], "Síntese normalizada (L1 fixo)", 0.04, 0.24, None),
+            ("Configurações", self.frames["frame_opcoes"], "DE assíncrono (steady-state)", 0.04, 0.335, None),
+            ("Configurações", self.frames["frame_opcoes"], "Retomar do checkpoint", 0.04, 0.43, None),
+            ("Configurações", self.frames["frame_opcoes"], "DE em ilhas (migração)", 0.04, 0.525, None),
+            ("Configurações", self.frames["frame_opcoes"], "Reaproveitar resultados (cache)", 0.04, 0.62, None),
+            ("Configurações", self.frames["frame_opcoes"], "Polimento por mínimos quadrados", 0.04, 0.715, None),
+            ("Configurações", self.frames["frame_opcoes"], "Restrições graduadas (regras de Deb)", 0.04, 0.81, None),
+            ("Configurações", self.frames["frame_opcoes"], "Abandono antecipado da avaliação", 0.52, 0.05, None),
+            ("Configurações", self.frames["frame_opcoes"], "Parar ao atingir o alvo", 0.52, 0.145, None),
+            ("Configurações", self.frames["frame_opcoes"], "Reinícios com população crescente (IPOP)", 0.52, 0.62, None),
+            ("Configurações", self.frames["frame_opcoes"], "Inicialização Sobol (em vez de hipercubo latino)", 0.52, 0.715, None),
+            ("Configurações", self.frames["frame_opcoes"], "Semear com projetos anteriores", 0.52, 0.81, None),
         ]
 
         for tab_name, frame, text, relx, rely, command in switch_specs:
@@ -1051,146 +1134,39 @@ class App(ctk.CTk):
         """
 
         # Função que é chamada por outras funções para calcular as posições do mecanismo e seus ângulos de importância (cinemática)
+        # As equações ficam em sintese.cinematica; aqui só se monta o conjunto de parâmetros atual de cada mecanismo
 
-        if TipoDeMec == 'W1':
-            
-            # Cálculo da cinemática do mecanismo
-            A_W1 = [0,0]
-            B_W1 = [self.L1_W1*math.cos(self.phi_W1),self.L1_W1*math.sin(self.phi_W1)]
-            C_W1 = [self.L2_W1*math.cos(AngDeEntrada),self.L2_W1*math.sin(AngDeEntrada)]
-            e1_W1 = math.sqrt((B_W1[0]-C_W1[0])**2 + (B_W1[1]-C_W1[1])**2)
-            omega_W1 = math.atan2(B_W1[1]-C_W1[1], B_W1[0]-C_W1[0])
-            delta_W1 = math.acos((self.L3_W1**2+e1_W1**2-self.L4_W1**2)/(2*e1_W1*self.L3_W1))
-            D_W1 = [C_W1[0] + self.L3_W1*math.cos(delta_W1+omega_W1),C_W1[1] + self.L3_W1*math.sin(delta_W1+omega_W1)]
-            E_W1 = [C_W1[0] + self.L5_W1*math.cos(delta_W1+omega_W1+self.alpha_W1),C_W1[1] + self.L5_W1*math.sin(delta_W1+omega_W1+self.alpha_W1)]
-            
-            beta1_W1 = math.atan2(D_W1[1]-B_W1[1], D_W1[0]-B_W1[0])
-            thetaO_W1 = beta1_W1-self.lambda_W1
-            G_W1  = [B_W1[0] + self.L6_W1*math.cos(thetaO_W1),B_W1[1] + self.L6_W1*math.sin(thetaO_W1)]
-            e2_W1 = math.sqrt((E_W1[0]-G_W1[0])**2 + (E_W1[1]-G_W1[1])**2)
-            beta2_W1 = math.atan2(E_W1[1]-G_W1[1], E_W1[0]-G_W1[0])
-            beta3_W1 = math.acos((self.L9_W1**2+e2_W1**2-self.L8_W1**2)/(2*self.L9_W1*e2_W1))
-            F_W1  = [G_W1[0] + self.L9_W1*math.cos(beta2_W1-beta3_W1),G_W1[1] + self.L9_W1*math.sin(beta2_W1-beta3_W1)]
-                
-            mi1_W1 = math.acos((self.L4_W1**2+self.L3_W1**2-e1_W1**2)/(2*self.L4_W1*self.L3_W1))           
-            mi2_W1 = math.acos((self.L8_W1**2+self.L9_W1**2-e2_W1**2)/(2*self.L8_W1*self.L9_W1))
+        par = self.parametros_mecanismo(TipoDeMec)
 
-            # Retorna os valores pertinentes calculados nesta função
-            return [A_W1, B_W1, C_W1, D_W1, E_W1, F_W1, G_W1, mi1_W1, mi2_W1, thetaO_W1]
-        
-            # Para os outros mecanismos desta função (Modelos_mecanismos), o funcionamento segue o mesmo modelo deste.
+        if TipoDeMec == 'S2':
+            gamma_S2 = float(cinematica.interpolar_gamma_S2(self.curva_S2, AngDeEntrada))
+            if math.isnan(gamma_S2):
+                # A varredura só deixa lacunas onde o mecanismo não monta em nenhum modo
+                raise ValueError("Stephenson 2 não monta para este ângulo de entrada")
+            return cinematica.posicao_S2(par, AngDeEntrada, gamma_S2)
 
-        elif TipoDeMec == 'W2':
-            A = [0,0]
-            B = [self.L1*math.cos(self.phi),self.L1*math.sin(self.phi)] 
-            C = [self.L2*math.cos(self.phi+self.alpha1),self.L2*math.sin(self.phi+self.alpha1)]
-            D = [self.L3*math.cos(AngDeEntrada),self.L3*math.sin(AngDeEntrada)]
-            x1 = math.sqrt((D[0]-C[0])**2 + (D[1]-C[1])**2)
-            Beta1 = math.atan2(C[1]-D[1], C[0]-D[0])
-            Beta2 = math.acos((self.L4**2+x1**2-self.L5**2)/(2*self.L4*x1))
-            E = [D[0]+self.L4*math.cos(Beta1+Beta2),D[1]+self.L4*math.sin(Beta1+Beta2)]
-            lambda0 = math.atan2(E[1]-C[1], E[0]-C[0])
-            F = [C[0]+self.L6*math.cos(lambda0-self.lambda1),C[1]+self.L6*math.sin(lambda0-self.lambda1)]
-            x2 = math.sqrt((F[0]-B[0])**2 + (F[1]-B[1])**2)
-            psi = math.atan2(F[1]-B[1], F[0]-B[0])
-            omega2 = math.acos((x2**2+self.L9**2-self.L8**2)/(2*self.L9*x2))
-            omega1 = psi-omega2-self.phi
-            thetaO = self.phi+omega1
-            G = [B[0]+self.L9*math.cos(thetaO),B[1]+self.L9*math.sin(thetaO)]
-            mi1 = math.acos((self.L4**2+self.L5**2-x1**2)/(2*self.L4*self.L5))
-            mi2 = math.acos((self.L8**2+self.L9**2-x2**2)/(2*self.L8*self.L9))
-
-            if(mi1 < 0):
-                mi1 = mi1+2*math.pi
-            if(mi2 < 0):
-                mi2 = mi2+2*math.pi
-
-            return [A, B, C, D, E, F, G, mi1, mi2, thetaO]
-        
-        elif TipoDeMec == 'S1':
+        return cinematica.posicao(TipoDeMec, par, AngDeEntrada)
 
-            A_S1 = [0,0]
-            B_S1 = [self.L1_S1*math.cos(self.phi_S1),self.L1_S1*math.sin(self.phi_S1)]
-            C_S1 = [self.L2_S1*math.cos(AngDeEntrada+self.alpha1_S1),self.L2_S1*math.sin(AngDeEntrada+self.alpha1_S1)]
-            D_S1 = [self.L3_S1*math.cos(AngDeEntrada),self.L3_S1*math.sin(AngDeEntrada)]
-            e1_S1 = math.sqrt((D_S1[0]-B_S1[0])**2 + (D_S1[1]-B_S1[1])**2)
-            beta_S1 = math.atan2(B_S1[1]-D_S1[1], B_S1[0]-D_S1[0])
-            omega_S1 = math.acos((e1_S1**2+self.L5_S1**2-self.L4_S1**2)/(2*e1_S1*self.L5_S1))
-            E_S1 = [D_S1[0] + self.L5_S1*math.cos(beta_S1+omega_S1), D_S1[1] + self.L5_S1*math.sin(beta_S1+omega_S1)]
-            ksi_S1 = math.atan2(E_S1[1]-B_S1[1], E_S1[0]-B_S1[0])
-            thetaO_S1 = ksi_S1 - self.lambda1_S1
-            F_S1 = [B_S1[0] + self.L6_S1*math.cos(ksi_S1-self.lambda1_S1), B_S1[1] + self.L6_S1*math.sin(ksi_S1-self.lambda1_S1)]
-            e2_S1 = math.sqrt((C_S1[0]-F_S1[0])**2 + (C_S1[1]-F_S1[1])**2)
-            gamma_S1 = math.atan2(C_S1[1]-F_S1[1], C_S1[0]-F_S1[0])
-            delta_S1 = math.acos((e2_S1**2+self.L9_S1**2-self.L8_S1**2)/(2*e2_S1*self.L9_S1))
-            G_S1 = [F_S1[0] + self.L9_S1*math.cos(gamma_S1-delta_S1), F_S1[1] + self.L9_S1*math.sin(gamma_S1-delta_S1)]
-            mi1_S1 = math.acos((self.L5_S1**2+self.L4_S1**2-e1_S1**2)/(2*self.L5_S1*self.L4_S1))
-            mi2_S1 = math.acos((self.L9_S1**2+self.L8_S1**2-e2_S1**2)/(2*self.L9_S1*self.L8_S1))
-
-            if(mi1_S1 < 0):
-                mi1_S1 = mi1_S1+2*math.pi
-            if(mi2_S1 < 0):
-                mi2_S1 = mi2_S1+2*math.pi
-
-            return [A_S1, B_S1, C_S1, D_S1, E_S1, F_S1, G_S1, mi1_S1, mi2_S1, thetaO_S1]
+    def parametros_mecanismo(self, TipoDeMec):
+        """Retorna os parâmetros atuais (após a otimização) do mecanismo `TipoDeMec` como `Parametros`."""
 
+        if TipoDeMec == 'W1':
+            return Parametros(self.L1_W1, self.L2_W1, self.L3_W1, self.L4_W1, self.L5_W1, self.L6_W1, self.L8_W1, self.L9_W1, self.phi_W1, self.alpha_W1, self.lambda_W1)
+        elif TipoDeMec == 'W2':
+            return Parametros(self.L1, self.L2, self.L3, self.L4, self.L5, self.L6, self.L8, self.L9, self.phi, self.alpha1, self.lambda1)
+        elif TipoDeMec == 'S1':
+            return Parametros(self.L1_S1, self.L2_S1, self.L3_S1, self.L4_S1, self.L5_S1, self.L6_S1, self.L8_S1, self.L9_S1, self.phi_S1, self.alpha1_S1, self.lambda1_S1)
         elif TipoDeMec == 'S2':
-            A_S2 = [0,0]
-            B_S2 = [self.L1_S2*math.cos(self.phi_S2),self.L1_S2*math.sin(self.phi_S2)]
-            C_S2 = [self.L3_S2*math.cos(AngDeEntrada+self.alpha1_S2),self.L3_S2*math.sin(AngDeEntrada+self.alpha1_S2)]
-            D_S2 = [self.L2_S2*math.cos(AngDeEntrada),self.L2_S2*math.sin(AngDeEntrada)]
-
-            E_S2 = [C_S2[0] + self.L4_S2*math.cos(self.gammaVetor_S2[np.int64(np.rad2deg(AngDeEntrada)*100)]), C_S2[1] + self.L4_S2*math.sin(self.gammaVetor_S2[np.int64(np.rad2deg(AngDeEntrada)*100)])]
-            e1_S2 = math.sqrt((E_S2[0]-D_S2[0])**2 + (E_S2[1]-D_S2[1])**2)
-            omega_S2 = math.atan2(E_S2[1]-D_S2[1], E_S2[0]-D_S2[0])
-            omega2_S2 = math.acos((e1_S2**2 + self.L5_S2**2 - self.L6_S2**2) / (2 * e1_S2 * self.L5_S2))
-            F_S2 = [D_S2[0] + self.L5_S2*math.cos(omega_S2-omega2_S2), D_S2[1] + self.L5_S2*math.sin(omega_S2-omega2_S2)]
-            omega3_S2 = math.atan2(E_S2[1]-F_S2[1], E_S2[0]-F_S2[0])
-            G_S2 = [F_S2[0] + self.L8_S2*math.cos(omega3_S2-self.lambda1_S2), F_S2[1] + self.L8_S2*math.sin(omega3_S2-self.lambda1_S2)]
-
-            thetaO_S2 = math.atan2(G_S2[1]-B_S2[1], G_S2[0]-B_S2[0])
-
-            e2_S2 = math.sqrt((F_S2[0]-B_S2[0])**2 + (F_S2[1]-B_S2[1])**2)
-
-            e3_S2 = math.sqrt((F_S2[0]-C_S2[0])**2 + (F_S2[1]-C_S2[1])**2)
-
-            mi1_S2 = math.acos((self.L4_S2**2 + self.L6_S2**2 - e3_S2**2) / (2 * self.L4_S2 * self.L6_S2))
-            mi2_S2 = math.acos((self.L8_S2**2+self.L9_S2**2-e2_S2**2)/(2*self.L8_S2*self.L9_S2))
-
-            if(mi1_S2 < 0):
-                mi1_S2 = mi1_S2+2*math.pi
-            if(mi2_S2 < 0):
-                mi2_S2 = mi2_S2+2*math.pi
-
-            return [A_S2, B_S2, C_S2, D_S2, E_S2, F_S2, G_S2, mi1_S2, mi2_S2, thetaO_S2]
-        
+            return Parametros(self.L1_S2, self.L2_S2, self.L3_S2, self.L4_S2, self.L5_S2, self.L6_S2, self.L8_S2, self.L9_S2, self.phi_S2, self.alpha1_S2, self.lambda1_S2)
         elif TipoDeMec == 'S3':
-            A_S3 = [0,0]
-            B_S3 = [self.L1_S3*math.cos(self.phi_S3),self.L1_S3*math.sin(self.phi_S3)]
-            C_S3 = [self.L2_S3*math.cos(self.phi_S3+self.alpha1_S3),self.L2_S3*math.sin(self.phi_S3+self.alpha1_S3)]
-            D_S3 = [self.L3_S3*math.cos(AngDeEntrada),self.L3_S3*math.sin(AngDeEntrada)]
-            e1_S3 = math.sqrt((D_S3[0]-C_S3[0])**2 + (D_S3[1]-C_S3[1])**2)
-            omega_S3 = math.acos((e1_S3**2+self.L5_S3**2-self.L4_S3**2)/(2*e1_S3*self.L5_S3))
-            beta_S3 = math.atan2(D_S3[1]-C_S3[1], D_S3[0]-C_S3[0])
-            F_S3 = [C_S3[0] + self.L5_S3*math.cos(beta_S3-omega_S3), C_S3[1] + self.L5_S3*math.sin(beta_S3-omega_S3)]
-            lambda0_S3 = math.atan2(D_S3[1]-F_S3[1], D_S3[0]-F_S3[0])
-            E_S3 = [F_S3[0] + self.L6_S3*math.cos(lambda0_S3-self.lambda1_S3), F_S3[1] + self.L6_S3*math.sin(lambda0_S3-self.lambda1_S3)]
-            e2_S3 = math.sqrt((E_S3[0]-B_S3[0])**2 + (E_S3[1]-B_S3[1])**2)
-            gamma_S3 = math.acos((e2_S3**2+self.L9_S3**2-self.L8_S3**2)/(2*e2_S3*self.L9_S3))
-            gamma1_S3 = math.atan2(E_S3[1]-B_S3[1], E_S3[0]-B_S3[0])
-            thetaO_S3 = gamma1_S3-gamma_S3
-            G_S3 = [B_S3[0] + self.L9_S3*math.cos(thetaO_S3), B_S3[1] + self.L9_S3*math.sin(thetaO_S3)]
-
-            mi1_S3 = math.acos((self.L5_S3**2+self.L4_S3**2-e1_S3**2)/(2*self.L5_S3*self.L4_S3))
-            mi2_S3 = math.acos((self.L8_S3**2+self.L9_S3**2-e2_S3**2)/(2*self.L8_S3*self.L9_S3))
-
-            if(mi1_S3 < 0):
-                mi1_S3 = mi1_S3+2*math.pi
-            if(mi2_S3 < 0):
-                mi2_S3 = mi2_S3+2*math.pi
-            
+            return Parametros(self.L1_S3, self.L2_S3, self.L3_S3, self.L4_S3, self.L5_S3, self.L6_S3, self.L8_S3, self.L9_S3, self.phi_S3, self.alpha1_S3, self.lambda1_S3)
+        raise ValueError(f"Tipo de mecanismo desconhecido: {TipoDeMec}")
 
-            return [A_S3, B_S3, C_S3, D_S3, E_S3, F_S3, G_S3, mi1_S3, mi2_S3, thetaO_S3]
+    def mostrar_opcoes_avancadas(self):
+        """Abre (ou traz para a frente) a janela "Opções avançadas" da síntese."""
+        self.janela_opcoes.deiconify()
+        self.janela_opcoes.lift()
+        self.janela_opcoes.focus()
 
     def mostrar_angulos(self):
         """Gera gráficos das relações entre ângulos importantes.
@@ -2128,12 +2104,18 @@ class App(ctk.CTk):
             except:
                 aaaaa =1
 
-    def entregar_p_otimizar(self):
+    def entregar_p_otimizar(self, config):
         """Lê entradas da UI e inicia o processo de otimização.
 
         Esta função coleta os pares de ângulos inseridos pelo usuário,
         configura variáveis iniciais e chama rotinas numéricas para
         encontrar parâmetros do mecanismo que atendam às especificações.
+
+        É um gerador conduzido por `otimizar`: no ponto da otimização ele
+        entrega (`yield`) a tarefa a executar em segundo plano e recebe de
+        volta o resultado, continuando no loop do Tk com a conferência e
+        os gráficos. `config` traz as configurações já lidas por
+        `ler_configuracoes`, repassadas às tarefas em segundo plano.
         """
         try:
             self.disable_interactives()
@@ -2231,21 +2213,9 @@ class App(ctk.CTk):
                 (self.entries["Entrada 5"].get() == "") & (self.entries["Saída 5"].get() == "")):
 
                 # 20 pontos - valores inseridos de baixo para cima
-                    self.thetaI_W1 = np.array([
-                        math.radians(0.37), math.radians(3.32), math.radians(9.13), math.radians(17.68),
-                        math.radians(28.75), math.radians(42.07), math.radians(57.30), math.radians(74.08),
-                        math.radians(91.99), math.radians(110.58), math.radians(129.42), math.radians(148.01),
-                        math.radians(165.92), math.radians(182.70), math.radians(197.93), math.radians(211.25),
-                        math.radians(222.32), math.radians(230.87), math.radians(236.68), math.radians(239.63)
-                    ])
+                    self.thetaI_W1 = np.radians(ENTRADAS_20_PONTOS)
 
-                    self.thetaOd_W1 = np.array([
-                        math.radians(14.29), math.radians(15.73), math.radians(18.78), math.radians(23.73),
-                        math.radians(30.74), math.radians(39.49), math.radians(48.85), math.radians(56.77),
-                        math.radians(60.88), math.radians(59.71), math.radians(53.80), math.radians(45.60),
-                        math.radians(38.16), math.radians(33.51), math.radians(31.92), math.radians(32.47),
-                        math.radians(33.91), math.radians(35.33), math.radians(36.32), math.radians(36.81)
-                    ])
+                    self.thetaOd_W1 = np.radians(SAIDAS_20_PONTOS)
                 else:
                     self.label4.configure(text="ERRO: Revise os dados preenchidos")
                     return
@@ -2267,7 +2237,7 @@ class App(ctk.CTk):
                 start = time.time()
 
                 # Entrega todos os dados para a função objetivo que otimizará o mecanismo
-                self.result_W1 = scipy.optimize.differential_evolution(App.funcx_W1, self.bounds_W1, args=(self.thetaI_W1, self.thetaOd_W1, self.n_W1, self.lb_W1, self.rb_W1), tol=1e-2, atol=1e-4, maxiter = 2000, callback = self.callbackAtualizacao, workers = -1, updating='deferred', popsize = 15, strategy='randtobest1bin')
+                self.result_W1 = yield lambda: self.executar_sintese('W1', objetivos.funcx_W1, objetivos.funcx_W1_vet, self.bounds_W1, (self.thetaI_W1, self.thetaOd_W1, self.n_W1, self.lb_W1, self.rb_W1), config)
                 end = time.time()
 
                 self.label4.configure(text="Conferindo ordem e ângulos de transmissão")
@@ -2317,29 +2287,8 @@ class App(ctk.CTk):
 
                 # Pega valores máximos e mínimos de todas as juntas em um alcance de 0 até o maior ângulo de entrada para definir os limites
                 # de x e y nos gráficos. Ou seja, é feito para enquadrar o mecanismo no gráfico.
-                THEI_W1 = [i for i in range(math.ceil(max(np.rad2deg(self.thetaI_W1))))]
-                Ax_W1, Bx_W1, Cx_W1, Dx_W1, Ex_W1, Fx_W1, Gx_W1 = [],[],[],[],[],[],[]
-                Ay_W1, By_W1, Cy_W1, Dy_W1, Ey_W1, Fy_W1, Gy_W1 = [],[],[],[],[],[],[]
-    
-                for i in range(len(THEI_W1)):
-                    try:
-                        AngE = math.radians(THEI_W1[i])
-                        [A_W1, B_W1, C_W1, D_W1, E_W1, F_W1, G_W1, mi1_W1, mi2_W1, thetaO_W1] = self.Modelos_mecanismos('W1', AngE)
-
-                        Ax_W1.append(A_W1[0]);Bx_W1.append(B_W1[0]);Cx_W1.append(C_W1[0]);Dx_W1.append(D_W1[0]);Ex_W1.append(E_W1[0]);Fx_W1.append(F_W1[0]);Gx_W1.append(G_W1[0])
-                        Ay_W1.append(A_W1[1]);By_W1.append(B_W1[1]);Cy_W1.append(C_W1[1]);Dy_W1.append(D_W1[1]);Ey_W1.append(E_W1[1]);Fy_W1.append(F_W1[1]);Gy_W1.append(G_W1[1])
-                    except:
-                        a=0
-
-
-                val_junt_X_W1 = [Ax_W1, Bx_W1, Cx_W1, Dx_W1, Ex_W1, Fx_W1, Gx_W1]
-                val_junt_Y_W1 = [Ay_W1, By_W1, Cy_W1, Dy_W1, Ey_W1, Fy_W1, Gy_W1]
-                flattened_X_W1 = [item for sublist in val_junt_X_W1 for item in sublist]
-                flattened_Y_W1 = [item for sublist in val_junt_Y_W1 for item in sublist]
-                self.x_min_W1 = min(flattened_X_W1) - 5
-                self.y_min_W1 = min(flattened_Y_W1) - 5
-                self.x_max_W1 = max(flattened_X_W1) + 5
-                self.y_max_W1 = max(flattened_Y_W1) + 5
+                self.x_min_W1, self.x_max_W1, self.y_min_W1, self.y_max_W1 = self.limites_grafico('W1', self.thetaI_W1)
+                self.guardar_resultado(self.result_W1, (self.x_min_W1, self.x_max_W1, self.y_min_W1, self.y_max_W1))
                         
                 if miok_W1 == self.n_W1:
                     self.label11x.configure(text="Ok")
@@ -2369,7 +2318,8 @@ class App(ctk.CTk):
                     'θI': np.round(np.rad2deg(self.thetaI_W1), 2).tolist(),  # Theta symbol
                     'θOd': np.round(np.rad2deg(self.thetaOd_W1), 2).tolist(),  # Theta symbol
                     'θO': np.round(np.rad2deg(self.thetaO_W1), 2).tolist(),  # Theta symbol
-                    'tempo otimizando': round(end - start, 2)
+                    'tempo otimizando': round(end - start, 2),
+                    'backend': ', '.join(self.backends_execucao)
                 }])
 
                 file_name = 'MarksData_W1.xlsx'
@@ -2530,21 +2480,9 @@ class App(ctk.CTk):
                 (self.entries["Entrada 5"].get() == "") & (self.entries["Saída 5"].get() == "")):
 
                 # 20 pontos - valores inseridos de baixo para cima
-                    self.thetaI = np.array([
-                        math.radians(0.37), math.radians(3.32), math.radians(9.13), math.radians(17.68),
-                        math.radians(28.75), math.radians(42.07), math.radians(57.30), math.radians(74.08),
-                        math.radians(91.99), math.radians(110.58), math.radians(129.42), math.radians(148.01),
-                        math.radians(165.92), math.radians(182.70), math.radians(197.93), math.radians(211.25),
-                        math.radians(222.32), math.radians(230.87), math.radians(236.68), math.radians(239.63)
-                    ])
+                    self.thetaI = np.radians(ENTRADAS_20_PONTOS)
 
-                    self.thetaOd = np.array([
-                        math.radians(14.29), math.radians(15.73), math.radians(18.78), math.radians(23.73),
-                        math.radians(30.74), math.radians(39.49), math.radians(48.85), math.radians(56.77),
-                        math.radians(60.88), math.radians(59.71), math.radians(53.80), math.radians(45.60),
-                        math.radians(38.16), math.radians(33.51), math.radians(31.92), math.radians(32.47),
-                        math.radians(33.91), math.radians(35.33), math.radians(36.32), math.radians(36.81)
-                    ])
+                    self.thetaOd = np.radians(SAIDAS_20_PONTOS)
                 elif ((self.entries["Entrada 1"].get() == "11") & (self.entries["Saída 1"].get() == "") &
                 (self.entries["Entrada 2"].get() == "") & (self.entries["Saída 2"].get() == "") &
                 (self.entries["Entrada 3"].get() == "") & (self.entries["Saída 3"].get() == "") &
@@ -2624,7 +2562,7 @@ class App(ctk.CTk):
                 self.n = len(self.thetaI)
                 self.bounds = [[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[0, math.radians(360)], [math.radians(0), math.radians(360)],[math.radians(0), math.radians(360)]]
                 start = time.time()
-                self.result = scipy.optimize.differential_evolution(App.funcx, self.bounds, args=(self.thetaI, self.thetaOd, self.n, self.lb, self.rb), tol=1e-2, atol=1e-4, maxiter = 2000, callback = self.callbackAtualizacao, workers = -1, updating='deferred', popsize = 15, strategy='randtobest1bin')
+                self.result = yield lambda: self.executar_sintese('W2', objetivos.funcx, objetivos.funcx_vet, self.bounds, (self.thetaI, self.thetaOd, self.n, self.lb, self.rb), config)
                 end = time.time()
 
                 self.label4.configure(text="Conferindo ordem e ângulos de transmissão")
@@ -2676,28 +2614,8 @@ class App(ctk.CTk):
                 else:
                     self.label4.configure(text="Erro")
 
-                THEI = [i for i in range(math.ceil(max(np.rad2deg(self.thetaI))))]
-                Ax, Bx, Cx, Dx, Ex, Fx, Gx = [],[],[],[],[],[],[]
-                Ay, By, Cy, Dy, Ey, Fy, Gy = [],[],[],[],[],[],[]
-                
-                for i in range(len(THEI)):
-                    try:
-                        AngE = math.radians(THEI[i])
-                        [A, B, C, D, E, F, G, mi1, mi2, thetaO] = self.Modelos_mecanismos('W2', AngE)
-
-                        Ax.append(A[0]);Bx.append(B[0]);Cx.append(C[0]);Dx.append(D[0]);Ex.append(E[0]);Fx.append(F[0]);Gx.append(G[0])
-                        Ay.append(A[1]);By.append(B[1]);Cy.append(C[1]);Dy.append(D[1]);Ey.append(E[1]);Fy.append(F[1]);Gy.append(G[1])
-                    except:
-                        aaaa =2
-
-                val_junt_X = [Ax, Bx, Cx, Dx, Ex, Fx, Gx]
-                val_junt_Y = [Ay, By, Cy, Dy, Ey, Fy, Gy]
-                flattened_X = [item for sublist in val_junt_X for item in sublist]
-                flattened_Y = [item for sublist in val_junt_Y for item in sublist]
-                self.x_min = min(flattened_X) - 5
-                self.y_min = min(flattened_Y) - 5
-                self.x_max = max(flattened_X) + 5
-                self.y_max = max(flattened_Y) + 5
+                self.x_min, self.x_max, self.y_min, self.y_max = self.limites_grafico('W2', self.thetaI)
+                self.guardar_resultado(self.result, (self.x_min, self.x_max, self.y_min, self.y_max))
 
                 self.label4.configure(text="Finalizado")
 
@@ -2721,7 +2639,8 @@ class App(ctk.CTk):
                         'θI': np.round(np.rad2deg(self.thetaI), 2).tolist(),  # Theta symbol
                         'θOd': np.round(np.rad2deg(self.thetaOd), 2).tolist(),  # Theta symbol
                         'θO': np.round(np.rad2deg(self.thetaO), 2).tolist(),  # Theta symbol
-                        'tempo otimizando': round(end - start, 2)
+                        'tempo otimizando': round(end - start, 2),
+                        'backend': ', '.join(self.backends_execucao)
                 }])
 
                 file_name = 'MarksData_W2.xlsx'
@@ -2853,21 +2772,9 @@ class App(ctk.CTk):
                 (self.entries["Entrada 5"].get() == "") & (self.entries["Saída 5"].get() == "")):
 
                 # 20 pontos - valores inseridos de baixo para cima
-                    self.thetaI_S1 = np.array([
-                        math.radians(0.37), math.radians(3.32), math.radians(9.13), math.radians(17.68),
-                        math.radians(28.75), math.radians(42.07), math.radians(57.30), math.radians(74.08),
-                        math.radians(91.99), math.radians(110.58), math.radians(129.42), math.radians(148.01),
-                        math.radians(165.92), math.radians(182.70), math.radians(197.93), math.radians(211.25),
-                        math.radians(222.32), math.radians(230.87), math.radians(236.68), math.radians(239.63)
-                    ])
+                    self.thetaI_S1 = np.radians(ENTRADAS_20_PONTOS)
 
-                    self.thetaOd_S1 = np.array([
-                        math.radians(14.29), math.radians(15.73), math.radians(18.78), math.radians(23.73),
-                        math.radians(30.74), math.radians(39.49), math.radians(48.85), math.radians(56.77),
-                        math.radians(60.88), math.radians(59.71), math.radians(53.80), math.radians(45.60),
-                        math.radians(38.16), math.radians(33.51), math.radians(31.92), math.radians(32.47),
-                        math.radians(33.91), math.radians(35.33), math.radians(36.32), math.radians(36.81)
-                    ])
+                    self.thetaOd_S1 = np.radians(SAIDAS_20_PONTOS)
                 else:
                     self.label4.configure(text="ERRO: Revise os dados preenchidos")
                     return
@@ -2887,7 +2794,7 @@ class App(ctk.CTk):
                 self.n_S1 = len(self.thetaI_S1)
                 self.bounds_S1 = [[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[math.radians(0), math.radians(359)], [math.radians(0), math.radians(359)],[math.radians(0), math.radians(359)]]
                 start = time.time()
-                self.result_S1 = scipy.optimize.differential_evolution(App.funcx_S1, self.bounds_S1, args=(self.thetaI_S1, self.thetaOd_S1, self.n_S1, self.lb_S1, self.rb_S1), tol=1e-2, atol=1e-4, maxiter = 2000, callback = self.callbackAtualizacao, workers = -1, updating='deferred', popsize = 15, strategy='randtobest1bin')
+                self.result_S1 = yield lambda: self.executar_sintese('S1', objetivos.funcx_S1, objetivos.funcx_S1_vet, self.bounds_S1, (self.thetaI_S1, self.thetaOd_S1, self.n_S1, self.lb_S1, self.rb_S1), config)
                 end = time.time()
 
                 self.label4.configure(text="Conferindo ordem e ângulos de transmissão")
@@ -2939,29 +2846,8 @@ class App(ctk.CTk):
                 else:
                     self.label4.configure(text="Erro")
 
-                THEI_S1 = [i for i in range(math.ceil(max(np.rad2deg(self.thetaI_S1))))]
-                Ax_S1, Bx_S1, Cx_S1, Dx_S1, Ex_S1, Fx_S1, Gx_S1 = [],[],[],[],[],[],[]
-                Ay_S1, By_S1, Cy_S1, Dy_S1, Ey_S1, Fy_S1, Gy_S1 = [],[],[],[],[],[],[]
-
-                for i in range(len(THEI_S1)):
-                    try:
-                        AngE = math.radians(THEI_S1[i])
-                        [A_S1, B_S1, C_S1, D_S1, E_S1, F_S1, G_S1, mi1_S1, mi2_S1, thetaO_S1] = self.Modelos_mecanismos('S1', AngE)
-
-                        Ax_S1.append(A_S1[0]);Bx_S1.append(B_S1[0]);Cx_S1.append(C_S1[0]);Dx_S1.append(D_S1[0]);Ex_S1.append(E_S1[0]);Fx_S1.append(F_S1[0]);Gx_S1.append(G_S1[0])
-                        Ay_S1.append(A_S1[1]);By_S1.append(B_S1[1]);Cy_S1.append(C_S1[1]);Dy_S1.append(D_S1[1]);Ey_S1.append(E_S1[1]);Fy_S1.append(F_S1[1]);Gy_W1.append(G_S1[1])
-                    except:
-                        a=0
-
-                val_junt_X_S1 = [Ax_S1, Bx_S1, Cx_S1, Dx_S1, Ex_S1, Fx_S1, Gx_S1]
-                val_junt_Y_S1 = [Ay_S1, By_S1, Cy_S1, Dy_S1, Ey_S1, Fy_S1, Gy_S1]
-                flattened_X_S1 = [item for sublist in val_junt_X_S1 for item in sublist]
-                flattened_Y_S1 = [item for sublist in val_junt_Y_S1 for item in sublist]
-
-                self.x_min_S1 = min(flattened_X_S1) - 5
-                self.y_min_S1 = min(flattened_Y_S1) - 5
-                self.x_max_S1 = max(flattened_X_S1) + 5
-                self.y_max_S1 = max(flattened_Y_S1) + 5
+                self.x_min_S1, self.x_max_S1, self.y_min_S1, self.y_max_S1 = self.limites_grafico('S1', self.thetaI_S1)
+                self.guardar_resultado(self.result_S1, (self.x_min_S1, self.x_max_S1, self.y_min_S1, self.y_max_S1))
 
                 self.label4.configure(text="Finalizado")
 
@@ -2985,7 +2871,8 @@ class App(ctk.CTk):
                         'θI': np.round(np.rad2deg(self.thetaI_S1), 2).tolist(),  # Theta symbol
                         'θOd': np.round(np.rad2deg(self.thetaOd_S1), 2).tolist(),  # Theta symbol
                         'θO': np.round(np.rad2deg(self.thetaO_S1), 2).tolist(),  # Theta symbol
-                        'tempo otimizando': round(end - start, 2)
+                        'tempo otimizando': round(end - start, 2),
+                        'backend': ', '.join(self.backends_execucao)
 
                 }])
 
@@ -3135,21 +3022,9 @@ class App(ctk.CTk):
                 (self.entries["Entrada 5"].get() == "") & (self.entries["Saída 5"].get() == "")):
 
                 # 20 pontos - valores inseridos de baixo para cima
-                    self.thetaI_S2 = np.array([
-                        math.radians(0.37), math.radians(3.32), math.radians(9.13), math.radians(17.68),
-                        math.radians(28.75), math.radians(42.07), math.radians(57.30), math.radians(74.08),
-                        math.radians(91.99), math.radians(110.58), math.radians(129.42), math.radians(148.01),
-                        math.radians(165.92), math.radians(182.70), math.radians(197.93), math.radians(211.25),
-                        math.radians(222.32), math.radians(230.87), math.radians(236.68), math.radians(239.63)
-                    ])
+                    self.thetaI_S2 = np.radians(ENTRADAS_20_PONTOS)
 
-                    self.thetaOd_S2 = np.array([
-                        math.radians(14.29), math.radians(15.73), math.radians(18.78), math.radians(23.73),
-                        math.radians(30.74), math.radians(39.49), math.radians(48.85), math.radians(56.77),
-                        math.radians(60.88), math.radians(59.71), math.radians(53.80), math.radians(45.60),
-                        math.radians(38.16), math.radians(33.51), math.radians(31.92), math.radians(32.47),
-                        math.radians(33.91), math.radians(35.33), math.radians(36.32), math.radians(36.81)
-                    ])
+                    self.thetaOd_S2 = np.radians(SAIDAS_20_PONTOS)
                 elif ((self.entries["Entrada 1"].get() == "11") & (self.entries["Saída 1"].get() == "") &
                 (self.entries["Entrada 2"].get() == "") & (self.entries["Saída 2"].get() == "") &
                 (self.entries["Entrada 3"].get() == "") & (self.entries["Saída 3"].get() == "") &
@@ -3228,9 +3103,8 @@ class App(ctk.CTk):
                 self.n_S2 = len(self.thetaI_S2)
                 self.bounds_S2 = [[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[0, math.radians(360)], [math.radians(0), math.radians(360)],[math.radians(0), math.radians(360)]]
                 start = time.time()
-                self.result_S2 = scipy.optimize.differential_evolution(App.funcx_S2, self.bounds_S2, args=(self.thetaI_S2, self.thetaOd_S2, self.n_S2, self.lb_S2, self.rb_S2), tol=1e-2, atol=1e-4, maxiter = 2000, callback = self.callbackAtualizacao, workers = -1, updating='deferred', popsize = 15, strategy='randtobest1bin')
+                self.result_S2 = yield lambda: self.executar_sintese('S2', objetivos.funcx_S2, objetivos.funcx_S2_vet, self.bounds_S2, (self.thetaI_S2, self.thetaOd_S2, self.n_S2, self.lb_S2, self.rb_S2), config)
                 end = time.time()
-                self.gammaVetor_S2 = []
                 initial_guess = 1
 
                 self.label4.configure(text="Conferindo ordem e ângulos de transmissão")
@@ -3247,33 +3121,12 @@ class App(ctk.CTk):
                 self.alpha1_S2 = self.result_S2.x[9]
                 self.lambda1_S2 = self.result_S2.x[10]
 
-                for thetaIS2alpha in range(36000):
-                    
-                    try:
-                        A_S2 = [0,0]
-                        B_S2 = [self.L1_S2*math.cos(self.phi_S2),self.L1_S2*math.sin(self.phi_S2)]
-                        C_S2 = [self.L3_S2*math.cos(np.deg2rad((thetaIS2alpha/100))+self.alpha1_S2),self.L3_S2*math.sin(np.deg2rad((thetaIS2alpha/100))+self.alpha1_S2)]
-                        D_S2 = [self.L2_S2*math.cos(np.deg2rad((thetaIS2alpha/100))),self.L2_S2*math.sin(np.deg2rad((thetaIS2alpha/100)))]
-
-                        def equation_to_solve(gamma_S2):
-                            
-                            E_S2 = [C_S2[0] + self.L4_S2 * math.cos(gamma_S2.item()), C_S2[1] + self.L4_S2 * math.sin(gamma_S2.item())]
-                            e1_S2 = math.sqrt((E_S2[0] - D_S2[0]) ** 2 + (E_S2[1] - D_S2[1]) ** 2)
-                            omega_S2 = math.atan2(E_S2[1] - D_S2[1], E_S2[0] - D_S2[0])
-                            omega2_S2 = math.acos((e1_S2 ** 2 + self.L5_S2 ** 2 - self.L6_S2 ** 2) / (2 * e1_S2 * self.L5_S2))
-                            F_S2 = [D_S2[0] + self.L5_S2 * math.cos(omega_S2 - omega2_S2), D_S2[1] + self.L5_S2 * math.sin(omega_S2 - omega2_S2)]
-                            omega3_S2 = math.atan2(E_S2[1] - F_S2[1], E_S2[0] - F_S2[0])
-                            G_S2 = [F_S2[0] + self.L8_S2 * math.cos(omega3_S2 - self.lambda1_S2), F_S2[1] + self.L8_S2 * math.sin(omega3_S2 - self.lambda1_S2)]
-
-                            return self.L9_S2 - math.sqrt((G_S2[0] - B_S2[0]) ** 2 + (G_S2[1] - B_S2[1]) ** 2)
-
-                        result = root(equation_to_solve, initial_guess, method='lm')
-                        solution_gamma_S2 = result.x[0]        
-                        initial_guess = solution_gamma_S2
-                        self.gammaVetor_S2.append(solution_gamma_S2)
-                    except:
-                        self.gammaVetor_S2.append(0)
-                    
+                # gamma_S2 para a volta completa por continuação, a partir do primeiro ponto de precisão e no mesmo modo de montagem usado na função objetivo
+                # (guardada no cache de resultados junto do vetor otimizado)
+                if self.derivados_cache is not None and self.derivados_cache.curva_S2 is not None:
+                    self.curva_S2 = self.derivados_cache.curva_S2
+                else:
+                    self.curva_S2 = cinematica.continuar_gamma_S2(self.parametros_mecanismo('S2'), self.thetaI_S2[0], initial_guess)
 
                 self.thetaO_S2 = []
 
@@ -3310,29 +3163,8 @@ class App(ctk.CTk):
                 else:
                     self.label4.configure(text="Erro")
 
-                THEI_S2 = [i for i in range(math.ceil(max(np.rad2deg(self.thetaI_S2))))]
-                Ax_S2, Bx_S2, Cx_S2, Dx_S2, Ex_S2, Fx_S2, Gx_S2 = [],[],[],[],[],[],[]
-                Ay_S2, By_S2, Cy_S2, Dy_S2, Ey_S2, Fy_S2, Gy_S2 = [],[],[],[],[],[],[]
-
-    
-                for i in range(len(THEI_S2)):
-                    try:    
-                        AngE = math.radians(THEI_S2[i])
-                        [A_S2, B_S2, C_S2, D_S2, E_S2, F_S2, G_S2, mi1_S2, mi2_S2, thetaO_S2] = self.Modelos_mecanismos('S2', AngE)
-
-                        Ax_S2.append(A_S2[0]);Bx_S2.append(B_S2[0]);Cx_S2.append(C_S2[0]);Dx_S2.append(D_S2[0]);Ex_S2.append(E_S2[0]);Fx_S2.append(F_S2[0]);Gx_S2.append(G_S2[0])
-                        Ay_S2.append(A_S2[1]);By_S2.append(B_S2[1]);Cy_S2.append(C_S2[1]);Dy_S2.append(D_S2[1]);Ey_S2.append(E_S2[1]);Fy_S2.append(F_S2[1]);Gy_S2.append(G_S2[1])
-                    except:
-                        a=0
-
-                val_junt_X_S2 = [Ax_S2, Bx_S2, Cx_S2, Dx_S2, Ex_S2, Fx_S2, Gx_S2]
-                val_junt_Y_S2 = [Ay_S2, By_S2, Cy_S2, Dy_S2, Ey_S2, Fy_S2, Gy_S2]
-                flattened_X_S2 = [item for sublist in val_junt_X_S2 for item in sublist]
-                flattened_Y_S2 = [item for sublist in val_junt_Y_S2 for item in sublist]
-                self.x_min_S2 = min(flattened_X_S2) - 5
-                self.y_min_S2 = min(flattened_Y_S2) - 5
-                self.x_max_S2 = max(flattened_X_S2) + 5
-                self.y_max_S2 = max(flattened_Y_S2) + 5
+                self.x_min_S2, self.x_max_S2, self.y_min_S2, self.y_max_S2 = self.limites_grafico('S2', self.thetaI_S2)
+                self.guardar_resultado(self.result_S2, (self.x_min_S2, self.x_max_S2, self.y_min_S2, self.y_max_S2), self.curva_S2)
 
                 self.label4.configure(text="Finalizado")
 
@@ -3356,7 +3188,8 @@ class App(ctk.CTk):
                         'θI': np.round(np.rad2deg(self.thetaI_S2), 2).tolist(),  # Theta symbol
                         'θOd': np.round(np.rad2deg(self.thetaOd_S2), 2).tolist(),  # Theta symbol
                         'θO': np.round(np.rad2deg(self.thetaO_S2), 2).tolist(),  # Theta symbol
-                        'tempo': round(end - start, 2)
+                        'tempo': round(end - start, 2),
+                        'backend': ', '.join(self.backends_execucao)
                 }])
 
                 file_name = 'MarksData_S2.xlsx'
@@ -3503,21 +3336,9 @@ class App(ctk.CTk):
                 (self.entries["Entrada 5"].get() == "") & (self.entries["Saída 5"].get() == "")):
 
                 # 20 pontos - valores inseridos de baixo para cima
-                    self.thetaI_S3 = np.array([
-                        math.radians(0.37), math.radians(3.32), math.radians(9.13), math.radians(17.68),
-                        math.radians(28.75), math.radians(42.07), math.radians(57.30), math.radians(74.08),
-                        math.radians(91.99), math.radians(110.58), math.radians(129.42), math.radians(148.01),
-                        math.radians(165.92), math.radians(182.70), math.radians(197.93), math.radians(211.25),
-                        math.radians(222.32), math.radians(230.87), math.radians(236.68), math.radians(239.63)
-                    ])
+                    self.thetaI_S3 = np.radians(ENTRADAS_20_PONTOS)
 
-                    self.thetaOd_S3 = np.array([
-                        math.radians(14.29), math.radians(15.73), math.radians(18.78), math.radians(23.73),
-                        math.radians(30.74), math.radians(39.49), math.radians(48.85), math.radians(56.77),
-                        math.radians(60.88), math.radians(59.71), math.radians(53.80), math.radians(45.60),
-                        math.radians(38.16), math.radians(33.51), math.radians(31.92), math.radians(32.47),
-                        math.radians(33.91), math.radians(35.33), math.radians(36.32), math.radians(36.81)
-                    ])
+                    self.thetaOd_S3 = np.radians(SAIDAS_20_PONTOS)
                 elif ((self.entries["Entrada 1"].get() == "11") & (self.entries["Saída 1"].get() == "") &
                 (self.entries["Entrada 2"].get() == "") & (self.entries["Saída 2"].get() == "") &
                 (self.entries["Entrada 3"].get() == "") & (self.entries["Saída 3"].get() == "") &
@@ -3596,7 +3417,7 @@ class App(ctk.CTk):
                 self.n_S3 = len(self.thetaI_S3)
                 self.bounds_S3 = [[30, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[5, 100],[0, math.radians(360)], [math.radians(0), math.radians(360)],[math.radians(0), math.radians(360)]]
                 start = time.time()
-                self.result_S3 = scipy.optimize.differential_evolution(App.funcx_S3, self.bounds_S3, args=(self.thetaI_S3, self.thetaOd_S3, self.n_S3, self.lb_S3, self.rb_S3), tol=1e-2, atol=1e-4, maxiter = 2000, callback = self.callbackAtualizacao, workers = -1, updating='deferred', popsize = 15, strategy='randtobest1bin')
+                self.result_S3 = yield lambda: self.executar_sintese('S3', objetivos.funcx_S3, objetivos.funcx_S3_vet, self.bounds_S3, (self.thetaI_S3, self.thetaOd_S3, self.n_S3, self.lb_S3, self.rb_S3), config)
                 end = time.time()
 
                 self.label4.configure(text="Conferindo ordem e ângulos de transmissão")
@@ -3647,27 +3468,8 @@ class App(ctk.CTk):
                 else:
                     self.label4.configure(text="Erro")
 
-                THEI_S3 = [i for i in range(math.ceil(max(np.rad2deg(self.thetaI_S3))))]
-                Ax_S3, Bx_S3, Cx_S3, Dx_S3, Ex_S3, Fx_S3, Gx_S3 = [],[],[],[],[],[],[]
-                Ay_S3, By_S3, Cy_S3, Dy_S3, Ey_S3, Fy_S3, Gy_S3 = [],[],[],[],[],[],[]
-
-
-                for i in range(len(THEI_S3)):
-                    try:    
-                        AngE = math.radians(THEI_S3[i])
-                        [A_S3, B_S3, C_S3, D_S3, E_S3, F_S3, G_S3, mi1_S3, mi2_S3, thetaO_S3] = self.Modelos_mecanismos('S3', AngE)
-
-                        Ax_S3.append(A_S3[0]);Bx_S3.append(B_S3[0]);Cx_S3.append(C_S3[0]);Dx_S3.append(D_S3[0]);Ex_S3.append(E_S3[0]);Fx_S3.append(F_S3[0]);Gx_S3.append(G_S3[0])
-                        Ay_S3.append(A_S3[1]);By_S3.append(B_S3[1]);Cy_S3.append(C_S3[1]);Dy_S3.append(D_S3[1]);Ey_S3.append(E_S3[1]);Fy_S3.append(F_S3[1]);Gy_S3.append(G_S3[1])
-                    except:
-                        a=0
-
-                val_junt_X_S3 = [Ax_S3, Bx_S3, Cx_S3, Dx_S3, Ex_S3, Fx_S3, Gx_S3]
-                val_junt_Y_S3 = [Ay_S3, By_S3, Cy_S3, Dy_S3, Ey_S3, Fy_S3, Gy_S3]
-                flattened_X_S3 = [item for sublist in val_junt_X_S3 for item in sublist]
-                flattened_Y_S3 = [item for sublist in val_junt_Y_S3 for item in sublist]
-                self.x_min_S3 = min(flattened_X_S3) - 5; self.y_min_S3 = min(flattened_Y_S3) - 5
-                self.x_max_S3 = max(flattened_X_S3) + 5; self.y_max_S3 = max(flattened_Y_S3) + 5
+                self.x_min_S3, self.x_max_S3, self.y_min_S3, self.y_max_S3 = self.limites_grafico('S3', self.thetaI_S3)
+                self.guardar_resultado(self.result_S3, (self.x_min_S3, self.x_max_S3, self.y_min_S3, self.y_max_S3))
 
                 self.label4.configure(text="Finalizado")
 
@@ -3691,7 +3493,8 @@ class App(ctk.CTk):
                     'θI': np.round(np.rad2deg(self.thetaI_S3), 2).tolist(),  # Theta symbol
                     'θOd': np.round(np.rad2deg(self.thetaOd_S3), 2).tolist(),  # Theta symbol
                     'θO': np.round(np.rad2deg(self.thetaO_S3), 2).tolist(),  # Theta symbol
-                    'tempo': round(end - start, 2)
+                    'tempo': round(end - start, 2),
+                    'backend': ', '.join(self.backends_execucao)
             }])
 
                 file_name = 'MarksData_S3.xlsx'
@@ -3742,6 +3545,9 @@ class App(ctk.CTk):
                 valoresotimizados_S3 = [round(self.L1_S3,3),round(self.L2_S3,3),round(self.L3_S3,3),round(self.L4_S3,3),round(self.L5_S3,3),round(self.L6_S3,3),round(self.L8_S3,3),round(self.L9_S3,3),round(math.degrees(self.phi_S3),3),round(math.degrees(self.alpha1_S3),3),round(math.degrees(self.lambda1_S3),3)]
                 valoresotimizadosTex_S3 = ', '.join(str(x) for x in valoresotimizados_S3)
                 self.label16_S3.configure(text=valoresotimizadosTex_S3)
+
+            elif self.combobox.get() == "Comparar todos":
+                yield from self.comparar_topologias(config)
             
             self.enable_interactives()
         except Exception as e:
@@ -3749,8 +3555,539 @@ class App(ctk.CTk):
             print(f"erro: {e}")
             self.enable_interactives()
 
-    def callbackAtualizacao(self, xk, convergence):
-        self.update()  # Atualização silenciosa, sem print
+    def comparar_topologias(self, config):
+        """Ramo "Comparar todos" de `entregar_p_otimizar` (gerador, como ele).
+
+        Lê os pontos de precisão como os ramos de cada mecanismo: os pares
+        Entrada/Saída preenchidos, do primeiro em diante e sem lacunas, ou
+        o conjunto de 20 pontos com "1" na Entrada 1. Sem pontos digitados
+        não há comparação, pois o conjunto padrão muda de um mecanismo para
+        outro. Com o limite de transmissão, sintetiza as cinco topologias
+        ao mesmo tempo (`comparacao.comparar`), cada uma com os limites do
+        seu ramo (L1 a partir de 30 no Stephenson 3, ângulos até 359° no
+        Stephenson 1) e com a estratégia, a semente e a inicialização de
+        `config`. Topologias claramente perdendo param cedo. A tabela
+        ordenada é mostrada numa janela e salva em
+        'Comparacao_topologias.xlsx'.
+        """
+        caixas = [(self.entries[f"Entrada {i}"].get(), self.entries[f"Saída {i}"].get()) for i in range(1, 6)]
+        if caixas[0] == ("1", "") and all(entrada == saida == "" for entrada, saida in caixas[1:]):
+            thetaI, thetaOd = np.radians(ENTRADAS_20_PONTOS), np.radians(SAIDAS_20_PONTOS)
+        else:
+            preenchidos = [entrada != "" and saida != "" for entrada, saida in caixas]
+            n = preenchidos.index(False) if False in preenchidos else len(caixas)
+            if n == 0 or any(entrada != "" or saida != "" for entrada, saida in caixas[n:]):
+                self.label4.configure(text="ERRO: Revise os dados preenchidos")
+                return
+            thetaI = np.radians([float(entrada) for entrada, _ in caixas[:n]])
+            thetaOd = np.radians([float(saida) for _, saida in caixas[:n]])
+
+        if self.entries["Padrão: 50"].get() == "":
+            Delta_mi = 50
+        else:
+            Delta_mi = float(self.entries["Padrão: 50"].get())
+        lb, rb = math.radians(90 - Delta_mi), math.radians(90 + Delta_mi)
+        args = (thetaI, thetaOd, len(thetaI), lb, rb)
+        bounds = {}
+        for tipo in comparacao.TIPOS_COMPARADOS:
+            elos = [[30, 100]] + [[5, 100]]*7 if tipo == 'S3' else [[5, 100]]*8
+            bounds[tipo] = elos + [[0, math.radians(359 if tipo == 'S1' else 360)]]*3
+        opcoes = {'tol': 1e-2, 'atol': 1e-4, 'maxiter': 2000, 'popsize': 15, 'strategy': config['estrategia'],
+                  'seed': config['semente'], 'init': 'sobol' if config['sobol'] else 'latinhypercube'}
+
+        self.label4.configure(text="Comparando as cinco topologias...")
+        start = time.time()
+        tabela = yield lambda: comparacao.comparar(bounds, args, cancelamento=self.cancelamento, **opcoes)
+        end = time.time()
+
+        nomes = {'W1': "Watt 1", 'W2': "Watt 2", 'S1': "Stephenson 1", 'S2': "Stephenson 2", 'S3': "Stephenson 3"}
+        marks_data = pd.DataFrame([{
+            'posição': posicao,
+            'mecanismo': nomes[linha['tipo']],
+            'erro': linha['erro'],
+            'erro máximo (º)': round(linha['erro_max'], 3),
+            'folga μ (º)': round(linha['folga_mi'], 3),
+            'viável': linha['viavel'],
+            'gerações': linha['nit'],
+            'situação': linha['situacao'],
+            'L1, L2, L3, L4, L5, L6, L8, L9, φ, α, λ': np.round(np.concatenate([linha['x'][:8], np.rad2deg(linha['x'][8:])]), 3).tolist(),
+        } for posicao, linha in enumerate(tabela, start=1)])
+        marks_data.to_excel('Comparacao_topologias.xlsx')
+
+        janela = ctk.CTkToplevel(self)
+        janela.title(f"Comparação das topologias ({round(end - start, 2)} s)")
+        texto = ctk.CTkTextbox(janela, width=760, height=220, font=("Courier New", 13))
+        texto.pack(fill="both", expand=True, padx=10, pady=10)
+        texto.insert("end", f"{'#':<3}{'Mecanismo':<15}{'Erro':>12}{'Erro máx (º)':>14}{'Folga μ (º)':>13}{'Viável':>8}{'Gerações':>10}  Situação\n")
+        for _, linha in marks_data.iterrows():
+            texto.insert("end", f"{linha['posição']:<3}{linha['mecanismo']:<15}{linha['erro']:>12.3e}{linha['erro máximo (º)']:>14.3f}{linha['folga μ (º)']:>13.3f}{'sim' if linha['viável'] else 'não':>8}{linha['gerações']:>10}  {linha['situação']}\n")
+        texto.configure(state="disabled")
+
+        self.label4.configure(text="Finalizado")
+
+    def executar_DE(self, funcao, funcao_vet, bounds, args, config):
+        """Executa a evolução diferencial para um mecanismo.
+
+        Com o switch "Avaliação vetorizada da população" ativo, a função
+        objetivo vetorizada (`funcao_vet`) recebe a população inteira
+        (11 x popsize) a cada geração, em um único processo. Caso
+        contrário, a forma de avaliação é escolhida por calibração
+        (`paralelo.PoolPersistente.calibrar`): vetorizada, threads ou os
+        processos do pool persistente da aplicação (`pool_de_trabalho`),
+        com o tamanho de lote medido como mais rápido. Com "DE assíncrono
+        (steady-state)" ativo (tem precedência), usa
+        `motores.de_assincrono`, que envia cada vetor-teste a um processo
+        assim que um núcleo fica livre, sem esperar a geração inteira.
+        Com "DE em ilhas (migração)" ativo, usa `motores.de_ilhas`: uma
+        população por processo, a primeira com a estratégia escolhida na
+        caixa de estratégias e as demais com as outras de
+        `motores.ESTRATEGIAS_ILHAS`, trocando os melhores indivíduos a
+        cada 20 gerações. Com "Abandono antecipado da avaliação" ativo
+        (no modo completo), usa `motores.de_abandono`: a avaliação de cada
+        vetor-teste para assim que o erro acumulado passa da energia do
+        alvo que ele disputa (`objetivos.ObjetivoComLimite`). Com JADE,
+        SHADE ou L-SHADE na caixa de estratégias (tem precedência sobre
+        todos), usa `motores.de_adaptativo`, vetorizado, que aprende F e CR
+        durante a busca no lugar da mutação e da recombinação fixas.
+
+        A forma usada é registrada em `self.backends_execucao`, que vai
+        para o resumo da otimização.
+
+        O estado do DE é salvo periodicamente em `checkpoints/` (ver
+        `sintese.checkpoint`). Com "Retomar do checkpoint" ativo e um
+        checkpoint salvo para o mesmo problema (mesmo mecanismo, pontos,
+        limites e modo), a busca continua dele: mesma população, mesmo
+        estado do gerador aleatório e só as gerações que faltavam. O
+        checkpoint é apagado quando a otimização termina sem cancelamento.
+
+        Com orçamento de tempo ou de avaliações (`self.orcamento`), o
+        limite de 2000 gerações é retirado e quem para a busca é o
+        orçamento (ou a convergência); no L-SHADE, a redução da população
+        acompanha o uso do orçamento.
+
+        Com "Reinícios com população crescente (IPOP)" ativo, a forma de
+        avaliação escolhida roda dentro de `motores.de_reinicios`: quando
+        a busca estagna (ou converge antes do fim das gerações), recomeça
+        com o dobro da população, e o resultado é o melhor do arquivo de
+        elite de todas as execuções.
+
+        A população inicial segue `self.inicio_DE` (ver `executar_sintese`):
+        hipercubo latino ou Sobol, com os vetores semeados no lugar dos
+        primeiros membros (`inicializacao.populacao_inicial`). No DE em
+        ilhas, essa população vai para as primeiras ilhas e as demais são
+        completadas com hipercubo latino (ver `motores.de_ilhas`).
+
+        `config` é o dicionário de `ler_configuracoes`: este método roda na
+        thread da otimização e não lê os widgets.
+        """
+        impressao = checkpoint.impressao(funcao, bounds, args)
+        salvo = checkpoint.carregar(impressao) if config['retomar'] else None
+        rng = np.random.default_rng(config['semente'])
+        init, maxiter = 'latinhypercube', 2000 if self.orcamento is None else parada.MAXITER_ORCAMENTO
+        metodo, vetores = self.inicio_DE
+        if metodo != 'latinhypercube' or vetores:
+            init = inicializacao.populacao_inicial(bounds, 15*len(bounds), metodo, vetores, rng)
+        if salvo is not None:
+            rng.bit_generator.state = salvo.estado_rng
+            init, maxiter = salvo.populacao, max(1, maxiter - salvo.nit)
+            self.backends_execucao.append(f"retomado da geração {salvo.nit}")
+
+        self.checkpoint = checkpoint.Checkpoint(impressao, rng, salvo.nit if salvo is not None else 0)
+        # Com o polimento por mínimos quadrados, o do scipy é dispensado (ver `executar_sintese`)
+        polir = not config['minimos_quadrados']
+        try:
+            if config['reinicios']:
+                execucao = lambda popsize, init, maxiter, callback: self.executar_DE_backend(funcao, funcao_vet, bounds, args, rng, init, maxiter, False, config, popsize = popsize, callback = callback)
+                resultado = motores.de_reinicios(execucao, funcao_vet, bounds, args=args, popsize = 15, maxiter = maxiter, callback = self.callbackAtualizacao, polish = polir, seed = rng, init = init)
+                self.backends_execucao = list(dict.fromkeys(self.backends_execucao))
+                self.backends_execucao.append(f"{resultado.reinicios} reinícios IPOP (populações {', '.join(map(str, resultado.populacoes))})")
+            else:
+                resultado = self.executar_DE_backend(funcao, funcao_vet, bounds, args, rng, init, maxiter, polir, config)
+        finally:
+            self.checkpoint.fechar()
+        if not self.cancelamento.is_set():
+            checkpoint.apagar(impressao)
+        return resultado
+
+    def executar_DE_backend(self, funcao, funcao_vet, bounds, args, rng, init, maxiter, polir, config, popsize=15, callback=None):
+        """Roda o DE com a forma de avaliação escolhida (ver `executar_DE`).
+
+        popsize e callback mudam só nos reinícios; por padrão, 15 e `callbackAtualizacao`.
+        """
+        callback = self.callbackAtualizacao if callback is None else callback
+        variante = motores.variante_adaptativa(config['estrategia'])
+        if variante is not None:
+            # Estratégias autoadaptativas: F e CR aprendidos durante a busca, em vez de mutação/recombinação fixas
+            self.backends_execucao.append(f"vetorizado, {config['estrategia']} autoadaptativo")
+            return motores.de_adaptativo(funcao_vet, bounds, args=args, variante = variante, tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, popsize = popsize, seed = rng, init = init, polish = polir, orcamento = self.orcamento)
+
+        if config['assincrono']:
+            self.backends_execucao.append("processos (assíncrono)")
+            return motores.de_assincrono(funcao, bounds, args=args, tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, workers = self.pool_de_trabalho(), popsize = popsize, seed = rng, init = init, polish = polir)
+
+        if config['ilhas']:
+            escolhida = config['estrategia']
+            estrategias = (escolhida,) + tuple(e for e in motores.ESTRATEGIAS_ILHAS if e != escolhida)
+            pool = self.pool_de_trabalho()
+            resultado = motores.de_ilhas(funcao_vet, bounds, args=args, estrategias=estrategias, ilhas = max(2, pool.processos), tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, workers = pool, popsize = popsize, seed = rng, init = init, polish = polir)
+            self.backends_execucao.append(f"{resultado.ilhas} ilhas ({', '.join(estrategias[:resultado.ilhas])})")
+            return resultado
+
+        objetivo_limite = objetivos.com_limite(funcao_vet) if config['abandono'] else None
+        if objetivo_limite is not None:
+            resultado = motores.de_abandono(objetivo_limite, bounds, args=args, tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, popsize = popsize, seed = rng, init = init, polish = polir)
+            self.backends_execucao.append(f"vetorizado com abandono antecipado ({objetivo_limite.custo_medio:.0%} dos pontos avaliados)")
+            return resultado
+
+        if config['vetorizado']:
+            self.backends_execucao.append("vetorizado")
+            return scipy.optimize.differential_evolution(funcao_vet, bounds, args=args, tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, vectorized=True, updating='deferred', popsize = popsize, strategy='randtobest1bin', rng = rng, init = init, polish = polir)
+
+        escolha = self.pool_de_trabalho().calibrar(funcao, funcao_vet, bounds, args, popsize = popsize)
+        self.backends_execucao.append(f"{escolha.descricao} (automático)")
+        if escolha.backend == 'vetorizado':
+            return scipy.optimize.differential_evolution(funcao_vet, bounds, args=args, tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, vectorized=True, updating='deferred', popsize = popsize, strategy='randtobest1bin', rng = rng, init = init, polish = polir)
+
+        with self.pool_de_trabalho().carregar(funcao, args, escolha.lote) as problema:
+            mapa = problema.mapa_threads if escolha.backend == 'threads' else problema.mapa
+            return scipy.optimize.differential_evolution(problema, bounds, tol=1e-2, atol=1e-4, maxiter = maxiter, callback = callback, workers = mapa, updating='deferred', popsize = popsize, strategy='randtobest1bin', rng = rng, init = init, polish = polir)
+
+    def pool_de_trabalho(self):
+        """Pool de processos da aplicação, criado na primeira chamada e reaproveitado até fechar a janela."""
+        if self.pool_trabalho is None:
+            self.pool_trabalho = paralelo.PoolPersistente(-1)
+        return self.pool_trabalho
+
+    def executar_sintese(self, TipoDeMec, funcao, funcao_vet, bounds, args, config):
+        """Otimiza o mecanismo `TipoDeMec` e retorna o resultado (vetor de 11 parâmetros em `x`).
+
+        Com "Reaproveitar resultados (cache)" ativo e uma semente digitada
+        (só execuções reproduzíveis vão para o cache), procura antes a mesma
+        síntese (mecanismo, pontos, delta mi, limites, configurações e
+        semente) no cache em disco (`sintese.cache`); num acerto, retorna o
+        resultado guardado sem otimizar, e `self.derivados_cache` traz os
+        dados derivados para o pós-processamento. Sem acerto, otimiza
+        (`executar_sintese_modo`) e deixa `self.chave_resultado` para que
+        `guardar_resultado` grave o resultado com os dados derivados.
+
+        Com "Polimento por mínimos quadrados" ativo, o DE roda sem o
+        polimento do scipy e o resultado final passa por
+        `refinamento.refinar` (least_squares nos resíduos de cada ponto,
+        com jacobiano analítico e os limites de mi como restrições).
+
+        Com "Parar ao atingir o alvo" ativo (modo completo), o DE para
+        assim que o melhor membro passa na conferência de precisão com a
+        tolerância e a margem de mi das Opções avançadas
+        (`parada.AlvoAtingido`), em vez de esperar a convergência.
+
+        Com orçamento de tempo e/ou de avaliações nas Opções avançadas
+        (`parada.Orcamento`, qualquer modo), a síntese para quando ele
+        acaba, e o uso do orçamento vai para o resumo da otimização.
+
+        A população inicial do DE é Sobol com "Inicialização Sobol" ativo
+        (hipercubo latino, senão). No modo completo, recebe também os
+        vetores de `vetores_iniciais` (digitados nas Opções avançadas e,
+        com "Semear com projetos anteriores", as últimas sínteses do
+        mesmo mecanismo).
+
+        Roda na thread da otimização: as configurações vêm de `config`
+        (`ler_configuracoes`, lido na thread do Tk).
+        """
+        self.backends_execucao = []
+        self.criterios_parada = []
+        self.orcamento = None
+        self.chave_resultado = self.derivados_cache = None
+        self.tipo_resultado = TipoDeMec
+        configuracao = self.configuracao_sintese(TipoDeMec, config)
+        if config['cache'] and config['semente'] is not None:
+            thetaI, thetaOd, n, lb, rb = args
+            self.chave_resultado = cache.chave(TipoDeMec, thetaI, thetaOd, lb, rb, bounds, configuracao, config['semente'])
+            if self.cache_resultados is None:
+                self.cache_resultados = cache.CacheResultados()
+            resultado = self.cache_resultados.buscar(self.chave_resultado)
+            if resultado is not None:
+                self.derivados_cache = resultado.derivados
+                self.backends_execucao.append("cache")
+                return resultado
+
+        self.inicio_DE = (configuracao['inicializacao'], configuracao.get('vetores_iniciais', []))
+        if configuracao['inicializacao'] == 'sobol':
+            self.backends_execucao.append("população inicial Sobol")
+        if self.inicio_DE[1]:
+            self.backends_execucao.append(f"{len(self.inicio_DE[1])} vetores semeados")
+        alvo = configuracao.get('alvo')
+        if alvo is not None:
+            alvo = parada.AlvoAtingido(TipoDeMec, args, *alvo)
+            self.criterios_parada.append(alvo)
+        orcamento = config['orcamento']
+        if orcamento is not None:
+            self.orcamento = parada.Orcamento(*orcamento)
+            self.criterios_parada.append(self.orcamento)
+
+        try:
+            resultado = self.executar_sintese_modo(TipoDeMec, funcao, funcao_vet, bounds, args, config)
+        finally:
+            self.criterios_parada = []
+        if alvo is not None and alvo.atingido:
+            self.backends_execucao.append(f"alvo atingido na geração {alvo.nit}")
+        if self.orcamento is not None:
+            self.backends_execucao.append(self.orcamento.relatorio())
+            self.orcamento = None
+        if config['minimos_quadrados'] and not self.cancelamento.is_set():
+            avaliacoes = resultado.nfev
+            resultado = refinamento.refinar(TipoDeMec, resultado, bounds, args)
+            self.backends_execucao.append(f"mínimos quadrados (+{resultado.nfev - avaliacoes} avaliações)")
+        return resultado
+
+    def executar_sintese_modo(self, TipoDeMec, funcao, funcao_vet, bounds, args, config):
+        """Otimiza o mecanismo `TipoDeMec` no modo escolhido nas Configurações.
+
+        Com o switch "Síntese em duas etapas" ativo, Watt 1 e Stephenson 1
+        são otimizados por `decomposicao.sintetizar_duas_etapas` (primeiro
+        os parâmetros que definem thetaO, depois a viabilidade de mi2);
+        se a etapa 2 não encontrar mi2 dentro dos limites, cai na
+        otimização completa. Com "Síntese normalizada" ativo (tem
+        precedência), L1 fica fixo e o resultado volta reescalado para as
+        unidades do usuário (`normalizacao.sintetizar_normalizado`). Os
+        demais casos vão para `executar_DE`, com as funções objetivo de
+        `objetivos.OBJETIVOS_GRADUADOS` se "Restrições graduadas" estiver
+        ativo.
+        """
+        executar = lambda funcao, funcao_vet, bounds, args: self.executar_DE(funcao, funcao_vet, bounds, args, config)
+        if config['normalizado']:
+            return normalizacao.sintetizar_normalizado(TipoDeMec, executar, bounds, args)
+
+        if config['duas_etapas'] and TipoDeMec in decomposicao.PARTICOES:
+            resultado = decomposicao.sintetizar_duas_etapas(TipoDeMec, executar, bounds, args)
+            if resultado.viavel:
+                return resultado
+
+        if config['graduadas']:
+            # Mesma cinemática, com a violação das restrições graduada em vez da penalidade fixa. A energia
+            # final volta para a função original, na mesma escala dos outros modos (cache, polimento).
+            resultado = self.executar_DE(*objetivos.OBJETIVOS_GRADUADOS[TipoDeMec], bounds, args, config)
+            resultado.fun = funcao(resultado.x, *args)
+            return resultado
+
+        return self.executar_DE(funcao, funcao_vet, bounds, args, config)
+
+    def configuracao_sintese(self, TipoDeMec, config):
+        """Configurações que mudam o resultado da síntese, para a chave do cache de resultados (a partir de `config`)."""
+        if config['normalizado']:
+            modo = 'normalizado'
+        elif config['duas_etapas'] and TipoDeMec in decomposicao.PARTICOES:
+            modo = 'duas_etapas'
+        else:
+            modo = 'completo'
+        configuracao = {'modo': modo, 'motor': 'scipy', 'strategy': 'randtobest1bin', 'tol': 1e-2, 'atol': 1e-4, 'maxiter': 2000, 'popsize': 15,
+                        'polimento': 'minimos_quadrados' if config['minimos_quadrados'] else 'scipy',
+                        'restricoes': 'graduadas' if config['graduadas'] and modo == 'completo' else 'penalidade'}
+        if motores.variante_adaptativa(config['estrategia']) is not None:
+            configuracao.update(motor='adaptativo', strategy=motores.variante_adaptativa(config['estrategia']))
+        elif config['assincrono']:
+            configuracao['motor'] = 'assincrono'
+        elif config['ilhas']:
+            configuracao.update(motor='ilhas', strategy=config['estrategia'])
+        elif config['abandono'] and modo == 'completo':
+            configuracao['motor'] = 'abandono'
+        configuracao['reinicios'] = config['reinicios']
+        configuracao['inicializacao'] = 'sobol' if config['sobol'] else 'latinhypercube'
+        if modo == 'completo':
+            # Nos outros modos o DE trabalha com vetores parciais (duas etapas) ou normalizados
+            configuracao['alvo'] = config['alvo']
+            configuracao['vetores_iniciais'] = [np.round(vetor, 9).tolist() for vetor in self.vetores_iniciais(TipoDeMec, config)]
+        configuracao['orcamento'] = config['orcamento']
+        return configuracao
+
+    def alvo_parada(self):
+        """[tolerância, margem de mi] em graus do "Parar ao atingir o alvo", ou None se desligado."""
+        if self.switches["Configurações Parar ao atingir o alvo"].get() == 0:
+            return None
+        tolerancia = self.entries["Padrão: 5°"].get().strip()
+        margem = self.entries["Padrão: 0°"].get().strip()
+        return [float(tolerancia) if tolerancia else parada.TOLERANCIA_PADRAO, float(margem) if margem else parada.MARGEM_PADRAO]
+
+    def orcamento_parada(self):
+        """[segundos, avaliações] do orçamento digitado nas Opções avançadas (None onde vazio), ou None sem orçamento."""
+        segundos = self.entries["Segundos (opcional)"].get().strip()
+        avaliacoes = self.entries["Avaliações (opcional)"].get().strip()
+        if not segundos and not avaliacoes:
+            return None
+        return [float(segundos) if segundos else None, int(avaliacoes) if avaliacoes else None]
+
+    def vetores_iniciais(self, TipoDeMec, config):
+        """Vetores de parâmetros (ângulos em radianos) para semear a população inicial do DE.
+
+        Os digitados nas Opções avançadas e, com "Semear com projetos
+        anteriores", o último resultado de `TipoDeMec` nesta sessão e os
+        guardados no cache de resultados (`cache.CacheResultados.projetos`).
+        """
+        vetores = list(config['vetores_digitados'])
+        if config['semear_projetos']:
+            try:
+                vetores.append(list(self.parametros_mecanismo(TipoDeMec)))
+            except AttributeError:
+                pass  # Mecanismo ainda não otimizado nesta sessão
+            if self.cache_resultados is None:
+                self.cache_resultados = cache.CacheResultados()
+            vetores.extend(self.cache_resultados.projetos(TipoDeMec))
+        return vetores
+
+    def semente(self):
+        """Semente do DE digitada nas Configurações, ou None (execução aleatória)."""
+        texto = self.entries["Semente (opcional)"].get().strip()
+        return int(texto) if texto else None
+
+    def limites_grafico(self, TipoDeMec, thetaI):
+        """Enquadramento (x_min, x_max, y_min, y_max) do mecanismo nos gráficos.
+
+        Pega os valores máximos e mínimos de todas as juntas de 0 até o
+        maior ângulo de entrada, de grau em grau, com 5 de margem. Ângulos
+        em que o mecanismo não monta são ignorados. Quando o resultado veio
+        do cache, usa o enquadramento guardado.
+        """
+        if self.derivados_cache is not None:
+            return self.derivados_cache.limites
+
+        juntas_x, juntas_y = [], []
+        for grau in range(math.ceil(max(np.rad2deg(thetaI)))):
+            try:
+                juntas = self.Modelos_mecanismos(TipoDeMec, math.radians(grau))[:7]
+            except (ValueError, ZeroDivisionError):
+                continue
+            juntas_x.extend(junta[0] for junta in juntas)
+            juntas_y.extend(junta[1] for junta in juntas)
+        return min(juntas_x) - 5, max(juntas_x) + 5, min(juntas_y) - 5, max(juntas_y) + 5
+
+    def guardar_resultado(self, resultado, limites, curva_S2=None):
+        """Grava no cache de resultados a síntese que acabou de ser pós-processada.
+
+        Guarda com o vetor o enquadramento dos gráficos e, no Stephenson 2,
+        a curva de gamma_S2. Nada é gravado se o cache estiver desligado ou
+        a execução não tiver semente, se o resultado já veio do cache ou se
+        a otimização foi cancelada (resultado parcial).
+        """
+        if self.chave_resultado is None or self.derivados_cache is not None or self.cancelamento.is_set():
+            return
+        derivados = cache.Derivados(limites, curva_S2)
+        self.cache_resultados.gravar(self.chave_resultado, resultado, derivados, self.tipo_resultado)
+        self.chave_resultado = None
+
+    def callbackAtualizacao(self, intermediate_result):
+        # Executa na thread da otimização: não mexe no Tk, só informa o progresso e registra o checkpoint.
+        # Retornar True interrompe o DE ao fim da geração atual (botão "Cancelar" ou um critério de parada).
+        self.fila_progresso.put(intermediate_result.convergence)
+        self.checkpoint.registrar(intermediate_result, forcar=self.cancelamento.is_set())
+        # Todos os critérios são consultados (o orçamento registra o uso da geração mesmo se outro já pediu a parada)
+        return any([criterio(intermediate_result) for criterio in self.criterios_parada]) or self.cancelamento.is_set()
+
+    def ler_configuracoes(self):
+        """Retrato das Configurações e das Opções avançadas num dicionário comum.
+
+        Chamado na thread do Tk (`otimizar`): a otimização em segundo plano
+        recebe só este dicionário e não lê os widgets. Campos numéricos
+        inválidos levantam ValueError.
+        """
+        def ligado(texto):
+            return self.switches[f"Configurações {texto}"].get() == 1
+
+        return {
+            'estrategia': self.combo_boxes["Configurações"].get(),
+            'cache': ligado("Reaproveitar resultados (cache)"),
+            'normalizado': ligado("Síntese normalizada (L1 fixo)"),
+            'duas_etapas': ligado("Síntese em duas etapas (Watt 1 e Stephenson 1)"),
+            'graduadas': ligado("Restrições graduadas (regras de Deb)"),
+            'minimos_quadrados': ligado("Polimento por mínimos quadrados"),
+            'assincrono': ligado("DE assíncrono (steady-state)"),
+            'ilhas': ligado("DE em ilhas (migração)"),
+            'abandono': ligado("Abandono antecipado da avaliação"),
+            'vetorizado': ligado("Avaliação vetorizada da população"),
+            'reinicios': ligado("Reinícios com população crescente (IPOP)"),
+            'sobol': ligado("Inicialização Sobol (em vez de hipercubo latino)"),
+            'retomar': ligado("Retomar do checkpoint"),
+            'semear_projetos': ligado("Semear com projetos anteriores"),
+            'semente': self.semente(),
+            'alvo': self.alvo_parada(),
+            'orcamento': self.orcamento_parada(),
+            'vetores_digitados': inicializacao.ler_vetores(self.entries["Vetores iniciais: L1 ... L9 φ α λ (graus), separados por |"].get()),
+        }
+
+    def otimizar(self):
+        """Comando do botão "Otimizar": conduz `entregar_p_otimizar` com a otimização em segundo plano.
+
+        As configurações são lidas aqui, antes de qualquer tarefa ir para a
+        thread da otimização (`ler_configuracoes`).
+        """
+        try:
+            config = self.ler_configuracoes()
+        except ValueError as e:
+            self.label4.configure(text="ERRO: Revise as Configurações e as Opções avançadas")
+            print(f"erro: {e}")
+            return
+        self.cancelamento.clear()
+        self.conduzir_otimizacao(self.entregar_p_otimizar(config), None)
+
+    def cancelar_otimizacao(self):
+        """Comando do botão "Cancelar".
+
+        O DE para ao fim da geração em andamento e retorna o melhor vetor
+        encontrado até ali, que segue para a conferência e os gráficos
+        normalmente. Os processos de trabalho são encerrados quando a
+        otimização termina (`acompanhar_otimizacao`).
+        """
+        self.cancelamento.set()
+        self.botao_cancelar.configure(state="disabled")
+        self.label4.configure(text="Cancelando...")
+
+    def conduzir_otimizacao(self, etapas, resultado, erro=None):
+        """Avança o gerador `etapas` e executa a próxima tarefa entregue por ele numa thread.
+
+        O loop do Tk continua livre; `acompanhar_otimizacao` consulta a
+        tarefa com `after()` e devolve o resultado (ou a exceção) ao gerador.
+        """
+        try:
+            tarefa = etapas.throw(erro) if erro is not None else etapas.send(resultado)
+        except StopIteration:
+            if self.cancelamento.is_set() and self.label4.cget("text") == "Finalizado":
+                self.label4.configure(text="Cancelado: melhor resultado até o cancelamento")
+            return
+
+        futuro = Future()
+
+        def executar():
+            try:
+                futuro.set_result(tarefa())
+            except BaseException as e:
+                futuro.set_exception(e)
+
+        self.geracoes = 0
+        self.botao_cancelar.configure(state="normal")
+        self.botao_cancelar.place(relx=0.5, rely=0.8, anchor="center")
+        threading.Thread(target=executar, daemon=True).start()
+        self.after(100, self.acompanhar_otimizacao, etapas, futuro)
+
+    def acompanhar_otimizacao(self, etapas, futuro):
+        """Atualiza o progresso a partir da fila e, quando a tarefa termina, retoma o gerador."""
+        while not self.fila_progresso.empty():
+            self.fila_progresso.get_nowait()
+            self.geracoes += 1
+        if self.geracoes > 0 and not self.cancelamento.is_set():
+            self.label4.configure(text=f"Calculando... (geração {self.geracoes})")
+
+        if not futuro.done():
+            self.after(100, self.acompanhar_otimizacao, etapas, futuro)
+            return
+
+        self.botao_cancelar.place_forget()
+        if self.cancelamento.is_set() and self.pool_trabalho is not None:
+            # Nenhuma tarefa fica pendente: o DE já retornou. O pool é recriado na próxima otimização.
+            self.pool_trabalho.encerrar()
+            self.pool_trabalho = None
+
+        if futuro.exception() is not None:
+            self.conduzir_otimizacao(etapas, None, futuro.exception())
+        else:
+            self.conduzir_otimizacao(etapas, futuro.result())
 
     def disable_interactives(self):
         # Disable all buttons
@@ -3796,295 +4133,6 @@ class App(ctk.CTk):
         for switch in self.switches.values():
             switch.configure(state="normal")
 
-# Funções objetivo de otimização de cada mecanismo
-    @staticmethod
-    def funcx_W1(p_W1, thetaI_W1, thetaOd_W1, n_W1, lb_W1, rb_W1):
-        """Função objetivo para otimização do mecanismo Watt 1.
-
-        p_W1: vetor de parâmetros (elos e ângulos fixos)
-        thetaI_W1: vetor de ângulos de entrada desejados (radianos)
-        thetaOd_W1: vetor de ângulos de saída alvo (radianos)
-        n_W1: número de pares
-        lb_W1, rb_W1: limites (inferior/superior) de qualidade de transmissão
-
-        Retorna a soma dos erros quadráticos entre thetaO calculado e
-        thetaOd_W1. Penaliza configurações que violam restrições.
-        """
-
-        L1_W1, L2_W1, L3_W1, L4_W1, L5_W1, L6_W1, L8_W1, L9_W1, phi_W1, alpha_W1, lambda_W1 = p_W1
-        # Inicialização de variável
-        thetaO_W1 = []
-        for i in range(n_W1):
-            try:
-                # Define as variáveis que serão modificadas até alcançar o objetivo da otimização
-                
-                # Cinemática do mecanismo
-                B_W1 = [L1_W1*math.cos(phi_W1),L1_W1*math.sin(phi_W1)]
-                C_W1 = [L2_W1*math.cos(thetaI_W1[i]),L2_W1*math.sin(thetaI_W1[i])]
-                e1_W1 = math.sqrt((B_W1[0]-C_W1[0])**2 + (B_W1[1]-C_W1[1])**2)
-                omega_W1 = math.atan2(B_W1[1]-C_W1[1], B_W1[0]-C_W1[0])
-                delta_W1 = math.acos((L3_W1**2+e1_W1**2-L4_W1**2)/(2*e1_W1*L3_W1))
-                D_W1 = [C_W1[0] + L3_W1*math.cos(delta_W1+omega_W1),C_W1[1] + L3_W1*math.sin(delta_W1+omega_W1)]
-                E_W1 = [C_W1[0] + L5_W1*math.cos(delta_W1+omega_W1+alpha_W1),C_W1[1] + L5_W1*math.sin(delta_W1+omega_W1+alpha_W1)]
-
-                beta1_W1 = math.atan2(D_W1[1]-B_W1[1], D_W1[0]-B_W1[0])
-                thetaO = beta1_W1-lambda_W1
-                
-                G_W1  = [B_W1[0] + L6_W1*math.cos(thetaO),B_W1[1] + L6_W1*math.sin(thetaO)]
-                e2_W1 = math.sqrt((E_W1[0]-G_W1[0])**2 + (E_W1[1]-G_W1[1])**2)
-                
-                L7_W1 = math.sqrt((D_W1[0]-E_W1[0])**2 + (D_W1[1]-E_W1[1])**2)
-                # Cálculo dos ângulos de qualidade de transmissão
-
-                mi1_W1 = math.acos((L4_W1**2+L3_W1**2-e1_W1**2)/(2*L4_W1*L3_W1))               
-                mi2_W1 = math.acos((L8_W1**2+L9_W1**2-e2_W1**2)/(2*L8_W1*L9_W1))
-                
-                # Calcula a àrea dos dois elos ternários
-                #AreaTri1_W1 = abs(L3_W1*math.sin(alpha_W1)*L5_W1)/(2)
-                #AreaTri2_W1 = abs(L4_W1*math.sin(lambda_W1)*L6_W1)/(2)
-                
-                # Restrições da otimização. Caso os ângulos de qualidade de transmissão não estejam de acordo com o definido, ou se a 
-                # àrea dos triângulos forem muito desproporcionais entre si, penaliza a função objetivo. Caso contrário, guarda em um vetor
-                # o ângulo de saída calculado
-                
-                if (mi1_W1<lb_W1) or (mi1_W1>rb_W1) or (mi2_W1<lb_W1) or (mi2_W1>rb_W1):
-                    thetaO_W1.append(999999999999)
-                else:
-                    thetaO_W1.append(thetaO)
-
-            # Caso aconteça uma indeterminação matemática (Ex: divisão por zero no arco tangente), penaliza a função objetivo
-            except:              
-                thetaO_W1.append(999999999999)
-
-        # Calcula a função objetivo como o erro ao quadrado de cada um dos ângulos de saída
-        thetaO_W1 = np.array(thetaO_W1)
-        thetaOd_W1 = np.array(thetaOd_W1)
-        
-        Fobj_W1 = np.sum((thetaO_W1-thetaOd_W1)**2)
-        return Fobj_W1
-    
-        # Para os outros mecanismos desta função, o funcionamento segue o mesmo modelo deste.
-    
-    @staticmethod
-    def funcx(p, thetaI, thetaOd, n, lb, rb):
-        """Função objetivo genérica usada para Watt 2.
-
-        Mesma ideia da função de Watt1: calcula thetaO para cada thetaI
-        e retorna a soma dos erros quadráticos vs thetaOd. Aplica
-        penalizações quando restrições não são atendidas.
-        """
-
-        # Use the stored values to perform a calculation
-        thetaO = []
-        for i in range(n):
-            try:
-                L1, L2, L3, L4, L5, L6, L8, L9, phi, alpha1, lambda1 = p
-
-                B = [L1*math.cos(phi),L1*math.sin(phi)] 
-                C = [L2*math.cos(phi+alpha1),L2*math.sin(phi+alpha1)]
-                D = [L3*math.cos(thetaI[i]),L3*math.sin(thetaI[i])]
-                x1 = math.sqrt((D[0]-C[0])**2 + (D[1]-C[1])**2)
-                Beta1 = math.atan2(C[1]-D[1], C[0]-D[0])
-                Beta2 = math.acos((L4**2+x1**2-L5**2)/(2*L4*x1))
-                E = [D[0]+L4*math.cos(Beta1+Beta2),D[1]+L4*math.sin(Beta1+Beta2)]
-                lambda0 = math.atan2(E[1]-C[1], E[0]-C[0])
-                F = [C[0]+L6*math.cos(lambda0-lambda1),C[1]+L6*math.sin(lambda0-lambda1)]
-                x2 = math.sqrt((F[0]-B[0])**2 + (F[1]-B[1])**2)
-                psi = math.atan2(F[1]-B[1], F[0]-B[0])     
-                omega2 = math.acos((x2**2+L9**2-L8**2)/(2*L9*x2))
-                omega1 = psi-omega2-phi  
-                mi1 = math.acos((L4**2+L5**2-x1**2)/(2*L4*L5))
-                mi2 = math.acos((L8**2+L9**2-x2**2)/(2*L8*L9))
-
-                AreaTri1 = abs(L1*math.sin(alpha1)*L2)/(2)
-                AreaTri2 = abs(L5*math.sin(lambda1)*L6)/(2)
-
-                if ((mi1<lb) or (mi1>rb) or (mi2<lb) or (mi2>rb)):
-                    thetaO.append(999999999999)
-                else:
-                    thetaO.append(phi+omega1)
-
-            except:                
-                thetaO.append(999999999999)
-
-        thetaO = np.array(thetaO)
-        thetaOd = np.array(thetaOd)
-        
-        Fobj = np.sum((thetaO-thetaOd)**2)
-
-        return Fobj
-
-    @staticmethod
-    def funcx_S1(p_S1, thetaI_S1, thetaOd_S1, n_S1, lb_S1, rb_S1):
-        """Função objetivo para Stephenson 1.
-
-        Implementa a cinemática e restrições específicas para S1 e
-        retorna a soma dos erros quadrados entre thetaO_S1 e thetaOd_S1.
-        """
-
-        thetaO_S1 = []
-        for i in range(n_S1):
-            try:
-                L1_S1, L2_S1, L3_S1, L4_S1, L5_S1, L6_S1, L8_S1, L9_S1, phi_S1, alpha1_S1, lambda1_S1 = p_S1
-
-                B_S1 = [L1_S1*math.cos(phi_S1),L1_S1*math.sin(phi_S1)]
-                C_S1 = [L2_S1*math.cos(thetaI_S1[i]+alpha1_S1),L2_S1*math.sin(thetaI_S1[i]+alpha1_S1)]
-                D_S1 = [L3_S1*math.cos(thetaI_S1[i]),L3_S1*math.sin(thetaI_S1[i])]
-                e1_S1 = math.sqrt((D_S1[0]-B_S1[0])**2 + (D_S1[1]-B_S1[1])**2)
-                beta_S1 = math.atan2(B_S1[1]-D_S1[1], B_S1[0]-D_S1[0])
-                omega_S1 = math.acos((e1_S1**2+L5_S1**2-L4_S1**2)/(2*e1_S1*L5_S1))
-                E_S1 = [D_S1[0] + L5_S1*math.cos(beta_S1+omega_S1), D_S1[1] + L5_S1*math.sin(beta_S1+omega_S1)]
-                ksi_S1 = math.atan2(E_S1[1]-B_S1[1], E_S1[0]-B_S1[0])
-                thetaO = ksi_S1 - lambda1_S1
-                F_S1 = [B_S1[0] + L6_S1*math.cos(ksi_S1-lambda1_S1), B_S1[1] + L6_S1*math.sin(ksi_S1-lambda1_S1)]
-                e2_S1 = math.sqrt((C_S1[0]-F_S1[0])**2 + (C_S1[1]-F_S1[1])**2)
-
-                mi1_S1 = math.acos((L5_S1**2+L4_S1**2-e1_S1**2)/(2*L5_S1*L4_S1))
-                mi2_S1 = math.acos((L9_S1**2+L8_S1**2-e2_S1**2)/(2*L9_S1*L8_S1))
-
-                AreaTri1_S1 = abs(L3_S1*math.sin(alpha1_S1)*L2_S1)/(2)
-                AreaTri2_S1 = abs(L4_S1*math.sin(lambda1_S1)*L6_S1)/(2)
-                
-                if ((mi1_S1<lb_S1) or (mi1_S1>rb_S1) or (mi2_S1<lb_S1) or (mi2_S1>rb_S1)):
-                    thetaO_S1.append(999999999999)
-                else:
-                    thetaO_S1.append(ksi_S1-lambda1_S1)
-                
-            except:              
-                thetaO_S1.append(999999999999)
-
-        thetaO_S1 = np.array(thetaO_S1)
-        thetaOd_S1 = np.array(thetaOd_S1)
-        
-        Fobj_S1 = np.sum((thetaO_S1-thetaOd_S1)**2)
-        return Fobj_S1
-
-    @staticmethod
-    def funcx_S2(p_S2, thetaI_S2, thetaOd_S2, n_S2, lb_S2, rb_S2):
-        """Função objetivo para Stephenson 2.
-
-        Observação: este caso resolve numericamente uma equação por ponto
-        (usando `root`) para determinar um ângulo intermediário
-        (`gamma_S2`) antes de calcular thetaO.
-        """
-
-        thetaO_S2 = []
-        L1_S2, L2_S2, L3_S2, L4_S2, L5_S2, L6_S2, L8_S2, L9_S2, phi_S2, alpha1_S2, lambda1_S2 = p_S2
-
-        B_S2 = [L1_S2*math.cos(phi_S2),L1_S2*math.sin(phi_S2)]
-        initial_guess = 1
-
-        for i in range(n_S2):
-
-            try:
-                
-                C_S2 = [L3_S2*math.cos(thetaI_S2[i]+alpha1_S2),L3_S2*math.sin(thetaI_S2[i]+alpha1_S2)]
-                D_S2 = [L2_S2*math.cos(thetaI_S2[i]),L2_S2*math.sin(thetaI_S2[i])]
-
-                def equation_to_solve(gamma_S2):
-                    # E_S2 as a function of gamma_S2
-                    E_S2 = [C_S2[0] + L4_S2 * math.cos(gamma_S2.item()), C_S2[1] + L4_S2 * math.sin(gamma_S2.item())]
-                    e1_S2 = math.sqrt((E_S2[0] - D_S2[0]) ** 2 + (E_S2[1] - D_S2[1]) ** 2)
-                    omega_S2 = math.atan2(E_S2[1] - D_S2[1], E_S2[0] - D_S2[0])
-                    omega2_S2 = math.acos((e1_S2 ** 2 + L5_S2 ** 2 - L6_S2 ** 2) / (2 * e1_S2 * L5_S2))
-                    F_S2 = [D_S2[0] + L5_S2 * math.cos(omega_S2 - omega2_S2), D_S2[1] + L5_S2 * math.sin(omega_S2 - omega2_S2)]
-                    omega3_S2 = math.atan2(E_S2[1] - F_S2[1], E_S2[0] - F_S2[0])
-                    G_S2 = [F_S2[0] + L8_S2 * math.cos(omega3_S2 - lambda1_S2), F_S2[1] + L8_S2 * math.sin(omega3_S2 - lambda1_S2)]
-
-                    # The equation to solve
-                    return L9_S2 - math.sqrt((G_S2[0] - B_S2[0]) ** 2 + (G_S2[1] - B_S2[1]) ** 2)
-
-                result = root(equation_to_solve, initial_guess, method='lm')
-                solution_gamma_S2 = result.x[0]
-
-                if solution_gamma_S2 < 0 or solution_gamma_S2 > 2 * math.pi:
-                    solution_gamma_S2 = (solution_gamma_S2 % (2 * math.pi))
-
-                E_S2 = [C_S2[0] + L4_S2*math.cos(solution_gamma_S2), C_S2[1] + L4_S2*math.sin(solution_gamma_S2)]
-                e1_S2 = math.sqrt((E_S2[0]-D_S2[0])**2 + (E_S2[1]-D_S2[1])**2)
-                omega_S2 = math.atan2(E_S2[1]-D_S2[1], E_S2[0]-D_S2[0])
-                omega2_S2 = math.acos((e1_S2**2 + L5_S2**2 - L6_S2**2) / (2 * e1_S2 * L5_S2))
-                F_S2 = [D_S2[0] + L5_S2*math.cos(omega_S2-omega2_S2), D_S2[1] + L5_S2*math.sin(omega_S2-omega2_S2)]
-                omega3_S2 = math.atan2(E_S2[1]-F_S2[1], E_S2[0]-F_S2[0])
-                G_S2 = [F_S2[0] + L8_S2*math.cos(omega3_S2-lambda1_S2), F_S2[1] + L8_S2*math.sin(omega3_S2-lambda1_S2)]
-
-                thetaO_S2compl = math.atan2(G_S2[1]-B_S2[1], G_S2[0]-B_S2[0])
-
-                e2_S2 = math.sqrt((F_S2[0]-B_S2[0])**2 + (F_S2[1]-B_S2[1])**2)
-                
-                e3_S2 = math.sqrt((F_S2[0]-C_S2[0])**2 + (F_S2[1]-C_S2[1])**2)
-
-                mi1_S2 = math.acos((L4_S2**2 + L6_S2**2 - e3_S2**2) / (2 * L4_S2 * L6_S2))
-                mi2_S2 = math.acos((L8_S2**2+L9_S2**2-e2_S2**2)/(2*L8_S2*L9_S2))
-
-                AreaTri1_S2 = abs(L2_S2*math.sin(alpha1_S2)*L3_S2)/(2)
-                AreaTri2_S2 = abs(L6_S2*math.sin(lambda1_S2)*L8_S2)/(2)
-
-                if ((mi1_S2<lb_S2) or (mi1_S2>rb_S2) or (mi2_S2<lb_S2) or (mi2_S2>rb_S2)):
-                    thetaO_S2.append(999999999999)
-                else:
-                    thetaO_S2.append(thetaO_S2compl)  
-
-            except:            
-                thetaO_S2.append(999999999999)
-        
-        thetaO_S2 = np.array(thetaO_S2)
-        thetaOd_S2 = np.array(thetaOd_S2)
-        
-        Fobj_S2 = np.sum((thetaO_S2-thetaOd_S2)**2)
-        return Fobj_S2
-
-    @staticmethod
-    def funcx_S3(p_S3, thetaI_S3, thetaOd_S3, n_S3, lb_S3, rb_S3):
-        """Função objetivo para Stephenson 3.
-
-        Implementa a cinemática de S3 e aplica as mesmas penalizações
-        por violação de restrições ou inconsistências geométricas.
-        """
-
-        thetaO_S3 = []
-        L1_S3, L2_S3, L3_S3, L4_S3, L5_S3, L6_S3, L8_S3, L9_S3, phi_S3, alpha1_S3, lambda1_S3 = p_S3
-
-        A_S3 = [0,0]
-        B_S3 = [L1_S3*math.cos(phi_S3),L1_S3*math.sin(phi_S3)]
-        C_S3 = [L2_S3*math.cos(phi_S3+alpha1_S3),L2_S3*math.sin(phi_S3+alpha1_S3)]
-
-        for i in range(n_S3):
-
-            try:
-                
-                D_S3 = [L3_S3*math.cos(thetaI_S3[i]),L3_S3*math.sin(thetaI_S3[i])]
-                e1_S3 = math.sqrt((D_S3[0]-C_S3[0])**2 + (D_S3[1]-C_S3[1])**2)
-                omega_S3 = math.acos((e1_S3**2+L5_S3**2-L4_S3**2)/(2*e1_S3*L5_S3))
-                beta_S3 = math.atan2(D_S3[1]-C_S3[1], D_S3[0]-C_S3[0])
-                F_S3 = [C_S3[0] + L5_S3*math.cos(beta_S3-omega_S3), C_S3[1] + L5_S3*math.sin(beta_S3-omega_S3)]
-                lambda0_S3 = math.atan2(D_S3[1]-F_S3[1], D_S3[0]-F_S3[0])
-                E_S3 = [F_S3[0] + L6_S3*math.cos(lambda0_S3-lambda1_S3), F_S3[1] + L6_S3*math.sin(lambda0_S3-lambda1_S3)]
-                e2_S3 = math.sqrt((E_S3[0]-B_S3[0])**2 + (E_S3[1]-B_S3[1])**2)
-                gamma_S3 = math.acos((e2_S3**2+L9_S3**2-L8_S3**2)/(2*e2_S3*L9_S3))
-                gamma1_S3 = math.atan2(E_S3[1]-B_S3[1], E_S3[0]-B_S3[0])
-                thetaO_S3compl = gamma1_S3-gamma_S3
-
-                mi1_S3 = math.acos((L5_S3**2+L4_S3**2-e1_S3**2)/(2*L5_S3*L4_S3))
-                mi2_S3 = math.acos((L8_S3**2+L9_S3**2-e2_S3**2)/(2*L8_S3*L9_S3))
-
-                AreaTri1_S3 = abs(L2_S3*math.sin(alpha1_S3)*L1_S3)/(2)
-                AreaTri2_S3 = abs(L4_S3*math.sin(lambda1_S3)*L6_S3)/(2)
-                
-                if ((mi1_S3<lb_S3) or (mi1_S3>rb_S3) or (mi2_S3<lb_S3) or (mi2_S3>rb_S3)):
-                    thetaO_S3.append(999999999999)
-                else:
-                    thetaO_S3.append(gamma1_S3-gamma_S3)  
-
-            except:            
-                thetaO_S3.append(999999999999)
-        
-        thetaO_S3 = np.array(thetaO_S3)
-        thetaOd_S3 = np.array(thetaOd_S3)
-        
-        Fobj_S3 = np.sum((thetaO_S3-thetaOd_S3)**2)
-        return Fobj_S3
-       
 
 if __name__ == "__main__":
     app = App()
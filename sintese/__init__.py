@@ -0,0 +1,68 @@
+"""Núcleo de síntese de mecanismos de seis barras, independente da GUI.
+
+Pode ser importado sem Tk/customtkinter (processos de trabalho, scripts
+em lote, testes):
+
+- `cinematica`: posição dos mecanismos Watt 1, Watt 2, Stephenson 1, 2 e 3
+  a partir de um conjunto de parâmetros `Parametros`.
+- `objetivos`: funções objetivo (escalares e vetorizadas) usadas pela
+  evolução diferencial, com penalidade fixa ou restrições graduadas.
+- `decomposicao`: síntese em duas etapas de Watt 1 e Stephenson 1.
+- `normalizacao`: síntese com L1 fixo (invariância de escala).
+- `motores`: motores de evolução diferencial alternativos ao do scipy
+  (DE assíncrono em regime permanente, DE em ilhas com migração, DE com
+  abandono antecipado da avaliação e DE autoadaptativo JADE/SHADE/
+  L-SHADE) e reinícios IPOP com população crescente sobre qualquer um
+  deles.
+- `inicializacao`: população inicial do DE (hipercubo latino ou Sobol)
+  semeada com projetos conhecidos.
+- `paralelo`: pool de processos persistente, com o problema carregado
+  uma vez em memória compartilhada.
+- `checkpoint`: gravação e leitura do estado do DE em disco, para retomar
+  otimizações longas.
+- `parada`: critérios de parada consultados a cada geração do DE (alvo
+  de precisão atingido, orçamento de tempo ou de avaliações) e detecção
+  de estagnação.
+- `refinamento`: refinamento local por mínimos quadrados, com jacobiano
+  analítico e os limites do ângulo de transmissão como restrições.
+- `cache`: cache em disco de resultados de síntese já calculados, com
+  os dados derivados usados pela interface.
+- `lote`: execução em lote de arquivos de tarefas, pela linha de comando
+  (`python -m sintese.lote tarefas.csv -o resultados.csv`).
+- `comparacao`: síntese simultânea das cinco topologias com parada
+  antecipada das que estão perdendo.
+- `bancada`: comparação de variantes da síntese em gerações até um projeto
+  viável e preciso (`python -m sintese.bancada`).
+"""
+
+from .cinematica import (
+    TIPOS,
+    CurvaS2,
+    Parametros,
+    continuar_gamma_S2,
+    interpolar_gamma_S2,
+    newton_gamma_S2,
+    posicao,
+    posicao_W1,
+    posicao_W2,
+    posicao_S1,
+    posicao_S2,
+    posicao_S3,
+    resolver_gamma_S2,
+    residuo_S2,
+    solucoes_gamma_S2,
+)
+from .objetivos import (
+    OBJETIVOS,
+    OBJETIVOS_GRADUADOS,
+    funcx_W1,
+    funcx,
+    funcx_S1,
+    funcx_S2,
+    funcx_S3,
+    funcx_W1_vet,
+    funcx_vet,
+    funcx_S1_vet,
+    funcx_S2_vet,
+    funcx_S3_vet,
+)
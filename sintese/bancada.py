@@ -0,0 +1,229 @@
+"""Bancada de comparação de variantes da síntese, sem interface gráfica.
+
+Uso:
+
+    python -m sintese.bancada [--tipos W1 S2] [--sementes 5] [--maxiter 1000] [--delta-mi 10]
+
+Para cada mecanismo, variante e semente, roda o DE no problema de
+referência do mecanismo (`problema`) e registra:
+
+- a geração em que o melhor membro fica viável (mi1 e mi2 dentro de
+  [lb, rb] em todos os pontos de precisão);
+- a geração em que, além de viável, erra no máximo `ALVO_GRAUS` em todos
+  os pontos (o mesmo critério de +-5 graus da interface). A execução
+  para nesse momento.
+
+A tabela impressa traz as medianas por mecanismo e variante, o número de
+sementes que atingiram o alvo, o maior erro final e o custo por
+avaliação (fração dos pontos de precisão de fato calculados; menor que 1
+só nas variantes com abandono antecipado), a mediana de reinícios (só
+nas variantes com reinícios) e o tempo. Gerações de quem não chegou
+contam como `maxiter` na mediana.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy.optimize import differential_evolution
+
+from .inicializacao import populacao_inicial
+from .lote import LIMITES_PADRAO, PADROES_DE, resumo
+from .motores import de_abandono, de_adaptativo, de_reinicios
+from .objetivos import CINEMATICAS_VET, OBJETIVOS, OBJETIVOS_GRADUADOS, ObjetivoComLimite
+
+
+ALVO_GRAUS = 5
+PONTOS = 20
+DELTA_MI = 10           # graus: 90 +- 10, cerca de 1 em 20 000 candidatos aleatórios é viável
+
+
+def problema(tipo, pontos=PONTOS, delta_mi=DELTA_MI, semente=0):
+    """Problema de referência de `tipo`: (bounds, args).
+
+    Os ângulos de saída vêm de um mecanismo sorteado (com `semente`) que é
+    viável em todos os pontos, de modo que existe um projeto viável com
+    erro zero e a comparação mede só a busca.
+    """
+
+    bounds, args, _ = _referencia(tipo, pontos, delta_mi, semente)
+    return bounds, args
+
+
+def projeto_anterior(tipo, pontos=PONTOS, delta_mi=DELTA_MI):
+    """Projeto anterior para semear o problema de referência de `tipo`.
+
+    É o mecanismo de referência de outra semente: viável nos mesmos
+    ângulos de entrada e delta mi, mas feito para outros ângulos de saída,
+    como a síntese anterior de um projeto parecido.
+    """
+
+    return _referencia(tipo, pontos, delta_mi, 1)[2]
+
+
+@lru_cache
+def _referencia(tipo, pontos, delta_mi, semente):
+    """(bounds, args, vetor do mecanismo sorteado) do problema de referência."""
+
+    thetaI = np.radians(np.linspace(40, 160, pontos))
+    lb, rb = math.radians(90 - delta_mi), math.radians(90 + delta_mi)
+    bounds = [[lo, hi] if i < 8 else [math.radians(lo), math.radians(hi)] for i, (lo, hi) in enumerate(LIMITES_PADRAO)]
+    limites = np.asarray(bounds)
+    rng = np.random.default_rng(semente)
+    while True:
+        P = limites[:, :1] + rng.random((11, 2000))*(limites[:, 1:] - limites[:, :1])
+        excesso = np.zeros((2000, pontos))
+        thetaO, mi1, mi2 = CINEMATICAS_VET[tipo](P, thetaI, pontos, excesso)
+        with np.errstate(invalid='ignore'):
+            viaveis = np.flatnonzero(np.all(np.isfinite(thetaO) & (mi1 >= lb) & (mi1 <= rb) & (mi2 >= lb) & (mi2 <= rb), axis=1))
+        if len(viaveis):
+            return bounds, (thetaI, thetaO[viaveis[0]], pontos, lb, rb), P[:, viaveis[0]]
+
+
+def _de_scipy(objetivos, metodo=None, semeado=False):
+    """Variante: `differential_evolution` vetorizado com as funções objetivo `objetivos`.
+
+    Com `metodo` ('latinhypercube' ou 'sobol'), a população inicial vem de
+    `inicializacao.populacao_inicial`, semeada com `projeto_anterior` se
+    `semeado`.
+    """
+
+    def executar(tipo, bounds, args, callback, **opcoes):
+        if metodo is not None:
+            rng = np.random.default_rng(opcoes.pop('seed'))
+            vetores = [projeto_anterior(tipo, args[2], _delta_mi(args))] if semeado else []
+            opcoes.update(init=populacao_inicial(bounds, opcoes['popsize']*len(bounds), metodo, vetores, rng), rng=rng)
+        return differential_evolution(objetivos[tipo][1], bounds, args=args, vectorized=True, updating='deferred',
+                                      callback=callback, **opcoes)
+    return executar
+
+
+def _delta_mi(args):
+    """delta mi (graus) do problema a partir de (thetaI, thetaOd, n, lb, rb)."""
+
+    return round(90 - math.degrees(args[3]), 9)
+
+
+def _de_abandono(tipo, bounds, args, callback, **opcoes):
+    """Variante: `motores.de_abandono` com `objetivos.ObjetivoComLimite` (penalidade fixa)."""
+
+    objetivo = ObjetivoComLimite(tipo)
+    opcoes.pop('strategy')
+    resultado = de_abandono(objetivo, bounds, args=args, callback=callback, **opcoes)
+    resultado.custo = objetivo.custo_medio
+    return resultado
+
+
+def _de_reinicios(injetar):
+    """Variante: `motores.de_reinicios` sobre o DE vetorizado do scipy (penalidade fixa)."""
+
+    def executar(tipo, bounds, args, callback, **opcoes):
+        funcao_vet = OBJETIVOS[tipo][1]
+        rng = np.random.default_rng(opcoes.pop('seed'))
+        popsize, maxiter, polish = opcoes.pop('popsize'), opcoes.pop('maxiter'), opcoes.pop('polish')
+
+        def execucao(popsize, init, maxiter, callback):
+            return differential_evolution(funcao_vet, bounds, args=args, vectorized=True, updating='deferred',
+                                          popsize=popsize, init=init, maxiter=maxiter, callback=callback,
+                                          polish=False, rng=rng, **opcoes)
+        resultado = de_reinicios(execucao, funcao_vet, bounds, args, popsize=popsize, injetar=injetar,
+                                 maxiter=maxiter, callback=callback, polish=polish, seed=rng)
+        return resultado
+    return executar
+
+
+def _de_adaptativo(variante):
+    """Variante: `motores.de_adaptativo` (JADE, SHADE ou L-SHADE) com a penalidade fixa."""
+
+    def executar(tipo, bounds, args, callback, **opcoes):
+        for chave in ('strategy', 'mutation', 'recombination'):
+            opcoes.pop(chave)
+        return de_adaptativo(OBJETIVOS[tipo][1], bounds, args=args, variante=variante, callback=callback, **opcoes)
+    return executar
+
+
+VARIANTES = {
+    'penalidade': _de_scipy(OBJETIVOS),
+    'sobol': _de_scipy(OBJETIVOS, 'sobol'),
+    'semeado': _de_scipy(OBJETIVOS, 'latinhypercube', semeado=True),
+    'graduadas': _de_scipy(OBJETIVOS_GRADUADOS),
+    'abandono': _de_abandono,
+    'reinicios': _de_reinicios(injetar=False),
+    'reinicios_elite': _de_reinicios(injetar=True),
+    'jade': _de_adaptativo('jade'),
+    'shade': _de_adaptativo('shade'),
+    'lshade': _de_adaptativo('lshade'),
+}
+
+
+def medir(tipo, variante, semente, maxiter=1000, delta_mi=DELTA_MI):
+    """Roda uma variante e retorna as gerações até viável e até o alvo (None se não chegou)."""
+
+    bounds, args = problema(tipo, delta_mi=delta_mi)
+    thetaI, thetaOd, n, lb, rb = args
+    marcas = {'viavel': None, 'alvo': None}
+
+    def callback(intermediate_result):
+        _, erro_max, folga = resumo(tipo, intermediate_result.x, thetaI, thetaOd, lb, rb)
+        if folga >= 0 and marcas['viavel'] is None:
+            marcas['viavel'] = intermediate_result.nit
+        if folga >= 0 and erro_max <= ALVO_GRAUS:
+            marcas['alvo'] = intermediate_result.nit
+            return True
+        return False
+
+    opcoes = dict(PADROES_DE, maxiter=maxiter, seed=semente, polish=False)
+    inicio = time.perf_counter()
+    resultado = VARIANTES[variante](tipo, bounds, args, callback, **opcoes)
+    _, erro_max, _ = resumo(tipo, resultado.x, thetaI, thetaOd, lb, rb)
+    return {'tipo': tipo, 'variante': variante, 'semente': semente, 'geracao_viavel': marcas['viavel'],
+            'geracao_alvo': marcas['alvo'], 'nit': resultado.nit, 'nfev': resultado.nfev, 'erro_max': erro_max,
+            'custo': resultado.get('custo', 1.0), 'reinicios': resultado.get('reinicios', 0),
+            'tempo': time.perf_counter() - inicio}
+
+
+def tabela(medidas, maxiter):
+    """Linhas de texto com as medianas por (tipo, variante)."""
+
+    linhas = [f"{'tipo':<5}{'variante':<14}{'viável':>8}{'alvo':>8}{'atingiu':>9}{'erro_max':>10}{'custo':>8}{'reinic.':>8}{'tempo':>8}"]
+    grupos = {}
+    for medida in medidas:
+        grupos.setdefault((medida['tipo'], medida['variante']), []).append(medida)
+    for (tipo, variante), grupo in grupos.items():
+        viavel = np.median([m['geracao_viavel'] or maxiter for m in grupo])
+        alvo = np.median([m['geracao_alvo'] or maxiter for m in grupo])
+        atingiu = sum(m['geracao_alvo'] is not None for m in grupo)
+        erro = np.median([m['erro_max'] for m in grupo])
+        custo = np.median([m['custo'] for m in grupo])
+        reinicios = np.median([m['reinicios'] for m in grupo])
+        tempo = np.median([m['tempo'] for m in grupo])
+        linhas.append(f"{tipo:<5}{variante:<14}{viavel:>8.0f}{alvo:>8.0f}{f'{atingiu}/{len(grupo)}':>9}"
+                      f"{erro:>10.2f}{custo:>8.2f}{reinicios:>8.1f}{tempo:>8.1f}")
+    return linhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sintese.bancada', description="Compara variantes da síntese em gerações até um projeto viável e preciso.")
+    parser.add_argument('--tipos', nargs='+', default=list(OBJETIVOS), choices=list(OBJETIVOS))
+    parser.add_argument('--variantes', nargs='+', default=list(VARIANTES), choices=list(VARIANTES))
+    parser.add_argument('--sementes', type=int, default=5, help="execuções por mecanismo e variante")
+    parser.add_argument('--maxiter', type=int, default=1000)
+    parser.add_argument('--delta-mi', type=float, default=DELTA_MI, help="limite do ângulo de transmissão (90 +- delta_mi)")
+    parser.add_argument('-p', '--processos', type=int, default=os.cpu_count())
+    opcoes = parser.parse_args(argv)
+
+    casos = [(tipo, variante, semente, opcoes.maxiter, opcoes.delta_mi)
+             for tipo in opcoes.tipos for variante in opcoes.variantes for semente in range(opcoes.sementes)]
+    with ProcessPoolExecutor(opcoes.processos) as pool:
+        medidas = list(pool.map(medir, *zip(*casos)))
+    print('\n'.join(tabela(medidas, opcoes.maxiter)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Cache em disco de resultados de síntese já calculados.
+
+Apertar "Otimizar" de novo com os mesmos dados repete um DE de minutos.
+Cada síntese concluída é guardada com uma chave que resume tudo o que
+determina o resultado: mecanismo, pontos de precisão, limites do ângulo
+de transmissão (delta mi), limites das variáveis, configurações do DE e
+semente. Só execuções reproduzíveis (com semente) devem ser guardadas:
+sem semente, cada execução é um sorteio diferente, e repetir a síntese
+deve sortear de novo. Junto do vetor otimizado ficam os dados derivados
+mais caros do pós-processamento (enquadramento dos gráficos e, para
+Stephenson 2, a curva de gamma_S2), de modo que um acerto dispensa
+também esse trabalho.
+
+A chave inclui `VERSAO_CODIGO`, calculada do código dos módulos que
+determinam o resultado (`MODULOS_RESULTADO`: equações, motores de DE,
+inicialização, parada, refinamento e modos de síntese): qualquer mudança
+neles invalida o cache, e os arquivos de versões antigas são apagados ao
+abrir o cache. O tamanho
+total é limitado a `TAMANHO_MAX` bytes, descartando primeiro as entradas
+usadas há mais tempo (a data de modificação do arquivo marca o último uso).
+
+Os resultados gravados com o tipo do mecanismo também servem de projetos
+anteriores para semear a população inicial de novas sínteses (`projetos`).
+"""
+
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from . import cinematica, decomposicao, inicializacao, motores, normalizacao, objetivos, parada, refinamento
+
+
+PASTA = 'cache_resultados'
+TAMANHO_MAX = 50*2**20      # bytes
+
+# Módulos cujo código muda o vetor otimizado para os mesmos dados e configurações
+MODULOS_RESULTADO = (cinematica, objetivos, motores, inicializacao, parada, refinamento, normalizacao, decomposicao)
+
+
+def _versao_codigo():
+    """Resumo do código de `MODULOS_RESULTADO`."""
+
+    resumo = hashlib.sha1()
+    for modulo in MODULOS_RESULTADO:
+        with open(modulo.__file__, 'rb') as arquivo:
+            resumo.update(arquivo.read())
+    return resumo.hexdigest()[:12]
+
+
+VERSAO_CODIGO = _versao_codigo()
+
+
+class Derivados(NamedTuple):
+    """Dados do pós-processamento guardados com o vetor otimizado (unidades dos elos)."""
+
+    limites: tuple              # (x_min, x_max, y_min, y_max) dos gráficos
+    curva_S2: cinematica.CurvaS2 = None
+
+
+def chave(TipoDeMec, thetaI, thetaOd, lb, rb, bounds, configuracoes, semente):
+    """Chave do cache para uma síntese.
+
+    configuracoes: dicionário (serializável em JSON) com tudo o que muda o
+    resultado além dos dados do problema (modo, motor, estratégia, tol...).
+    semente: semente do DE (execuções sem semente não devem ir para o cache).
+    """
+
+    dados = json.dumps([VERSAO_CODIGO, TipoDeMec, np.round(np.asarray(thetaI, dtype=float), 12).tolist(),
+                        np.round(np.asarray(thetaOd, dtype=float), 12).tolist(), round(lb, 12), round(rb, 12),
+                        np.round(np.asarray(bounds, dtype=float), 12).tolist(), configuracoes, semente],
+                       sort_keys=True)
+    return hashlib.sha1(dados.encode()).hexdigest()[:20]
+
+
+class CacheResultados:
+    """Resultados de síntese guardados em `pasta`, um arquivo .npz por chave."""
+
+    def __init__(self, pasta=PASTA, tamanho_max=TAMANHO_MAX):
+        self.pasta = pasta
+        self.tamanho_max = tamanho_max
+        os.makedirs(pasta, exist_ok=True)
+        for nome in os.listdir(pasta):
+            if nome.endswith('.npz') and not nome.startswith(VERSAO_CODIGO):
+                os.remove(os.path.join(pasta, nome))
+
+    def _arquivo(self, chave_resultado):
+        return os.path.join(self.pasta, f"{VERSAO_CODIGO}_{chave_resultado}.npz")
+
+    def buscar(self, chave_resultado):
+        """`OptimizeResult` guardado (com o atributo `derivados`), ou None."""
+
+        arquivo = self._arquivo(chave_resultado)
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            with np.load(arquivo, allow_pickle=False) as dados:
+                resultado = OptimizeResult(x=dados['x'], fun=float(dados['fun']), nit=int(dados['nit']),
+                                           nfev=int(dados['nfev']), message=str(dados['message']), success=True)
+                resultado.derivados = None
+                if 'limites' in dados:
+                    curva = None
+                    if 'curva_angulos' in dados:
+                        curva = cinematica.CurvaS2(float(dados['curva_inicio']), dados['curva_angulos'],
+                                                   dados['curva_gammas'], dados['curva_derivadas'])
+                    resultado.derivados = Derivados(tuple(dados['limites'].tolist()), curva)
+        except (OSError, ValueError, KeyError):
+            # Arquivo truncado ou de um formato antigo: trata como ausente
+            os.remove(arquivo)
+            return None
+        os.utime(arquivo)
+        return resultado
+
+    def gravar(self, chave_resultado, resultado, derivados=None, TipoDeMec=None):
+        """Guarda `resultado` (e os dados derivados, se houver) e descarta as entradas mais antigas.
+
+        Com `TipoDeMec`, o resultado também fica disponível em `projetos`.
+        """
+
+        dados = {'x': np.asarray(resultado.x, dtype=float), 'fun': float(resultado.fun), 'nit': int(resultado.nit),
+                 'nfev': int(resultado.nfev), 'message': str(resultado.message)}
+        if TipoDeMec is not None:
+            dados['tipo'] = np.array(TipoDeMec)
+        if derivados is not None:
+            dados['limites'] = np.asarray(derivados.limites, dtype=float)
+            if derivados.curva_S2 is not None:
+                curva = derivados.curva_S2
+                dados.update(curva_inicio=curva.inicio, curva_angulos=curva.angulos, curva_gammas=curva.gammas,
+                             curva_derivadas=curva.derivadas)
+
+        arquivo = self._arquivo(chave_resultado)
+        temporario = arquivo + '.tmp'
+        with open(temporario, 'wb') as saida:
+            np.savez(saida, **dados)
+        os.replace(temporario, arquivo)
+        self._limitar()
+
+    def projetos(self, TipoDeMec, quantos=5):
+        """Vetores otimizados de `TipoDeMec` guardados no cache, dos usados mais recentemente para trás.
+
+        Servem de projetos anteriores para semear a população inicial do DE
+        (`inicializacao.populacao_inicial`). Não marcam as entradas como usadas.
+        """
+
+        entradas = sorted(((os.stat(os.path.join(self.pasta, nome)).st_mtime, nome) for nome in os.listdir(self.pasta)
+                           if nome.endswith('.npz')), reverse=True)
+        vetores = []
+        for _, nome in entradas:
+            if len(vetores) >= quantos:
+                break
+            try:
+                with np.load(os.path.join(self.pasta, nome), allow_pickle=False) as dados:
+                    if 'tipo' in dados and str(dados['tipo']) == TipoDeMec:
+                        vetores.append(np.array(dados['x'], dtype=float))
+            except (OSError, ValueError):
+                continue
+        return vetores
+
+    def _limitar(self):
+        """Apaga as entradas usadas há mais tempo até o total caber em `tamanho_max`."""
+
+        entradas = []
+        for nome in os.listdir(self.pasta):
+            if nome.endswith('.npz'):
+                info = os.stat(os.path.join(self.pasta, nome))
+                entradas.append((info.st_mtime, info.st_size, nome))
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, nome in sorted(entradas):
+            if total <= self.tamanho_max:
+                break
+            os.remove(os.path.join(self.pasta, nome))
+            total -= tamanho
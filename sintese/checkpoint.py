@@ -0,0 +1,125 @@
+"""Checkpoints do estado da evolução diferencial em disco.
+
+O estado salvo é o necessário para continuar a busca: população (em
+unidades dos parâmetros), energias, estado do gerador aleatório e o
+número de gerações já feitas. Cada problema (função objetivo, limites e
+argumentos) tem sua impressão digital, que dá nome ao arquivo; retomar
+com os mesmos dados encontra o checkpoint certo.
+
+A gravação é feita por uma thread própria: o callback do DE só copia o
+estado e segue. Grava-se no máximo a cada `INTERVALO` segundos, sempre
+que a busca avançou alguma geração desde a última gravação (mesmo sem
+melhora da energia: a população e o gerador aleatório mudaram e retomar
+deles poupa essas gerações). Se a thread estiver ocupada, só o estado
+mais recente é gravado.
+Cada gravação vai para um arquivo temporário que substitui o anterior
+de uma vez, para que uma queda no meio não corrompa o checkpoint.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+
+PASTA = 'checkpoints'
+INTERVALO = 5.0         # segundos mínimos entre gravações
+
+
+class Estado(NamedTuple):
+    """Estado da evolução diferencial lido de um checkpoint."""
+
+    nit: int                    # gerações já feitas
+    populacao: np.ndarray       # (S, N), em unidades dos parâmetros
+    energias: np.ndarray        # (S,)
+    estado_rng: dict            # `Generator.bit_generator.state`
+
+
+def impressao(funcao, bounds, args):
+    """Impressão digital do problema (função objetivo, limites e argumentos fixos)."""
+
+    dados = pickle.dumps((funcao.__module__, funcao.__qualname__, np.asarray(bounds, dtype=float).tolist(),
+                          [np.asarray(a).tolist() if not isinstance(a, str) else a for a in args]))
+    return hashlib.sha1(dados).hexdigest()[:16]
+
+
+def caminho(impressao_problema, pasta=PASTA):
+    return os.path.join(pasta, f"checkpoint_{impressao_problema}.npz")
+
+
+def carregar(impressao_problema, pasta=PASTA):
+    """`Estado` salvo para o problema, ou None se não houver checkpoint."""
+
+    arquivo = caminho(impressao_problema, pasta)
+    if not os.path.exists(arquivo):
+        return None
+    with np.load(arquivo, allow_pickle=False) as dados:
+        estado_rng = pickle.loads(dados['estado_rng'].tobytes())
+        return Estado(int(dados['nit']), dados['populacao'], dados['energias'], estado_rng)
+
+
+def apagar(impressao_problema, pasta=PASTA):
+    arquivo = caminho(impressao_problema, pasta)
+    if os.path.exists(arquivo):
+        os.remove(arquivo)
+
+
+class Checkpoint:
+    """Grava periodicamente o estado de uma otimização em segundo plano.
+
+    `registrar` é chamado no callback do DE (a cada geração); `fechar`
+    grava o último estado pendente e encerra a thread de gravação.
+    `nit_inicial` soma as gerações de uma execução retomada às já salvas.
+    """
+
+    def __init__(self, impressao_problema, rng, nit_inicial=0, intervalo=INTERVALO, pasta=PASTA):
+        self.arquivo = caminho(impressao_problema, pasta)
+        self.rng = rng
+        self.nit_inicial = nit_inicial
+        self.intervalo = intervalo
+        self.ultima = -np.inf           # instante da última gravação registrada
+        self.nit_gravado = None         # geração da última gravação registrada
+        self.pendente = None
+        self.condicao = threading.Condition()
+        self.fechando = False
+        os.makedirs(pasta, exist_ok=True)
+        self.thread = threading.Thread(target=self._gravar, daemon=True)
+        self.thread.start()
+
+    def registrar(self, resultado, forcar=False):
+        """Copia o estado do `OptimizeResult` intermediário do DE para gravação."""
+
+        agora = time.monotonic()
+        nit = self.nit_inicial + resultado.nit
+        if not forcar and (agora - self.ultima < self.intervalo or nit == self.nit_gravado):
+            return
+        self.ultima, self.nit_gravado = agora, nit
+        estado = Estado(nit, np.array(resultado.population), np.array(resultado.population_energies),
+                        self.rng.bit_generator.state)
+        with self.condicao:
+            self.pendente = estado
+            self.condicao.notify()
+
+    def _gravar(self):
+        while True:
+            with self.condicao:
+                while self.pendente is None and not self.fechando:
+                    self.condicao.wait()
+                estado, self.pendente = self.pendente, None
+                if estado is None:
+                    return
+            temporario = self.arquivo + '.tmp'
+            with open(temporario, 'wb') as arquivo:
+                np.savez(arquivo, nit=estado.nit, populacao=estado.populacao, energias=estado.energias,
+                         estado_rng=np.frombuffer(pickle.dumps(estado.estado_rng), dtype=np.uint8))
+            os.replace(temporario, self.arquivo)
+
+    def fechar(self):
+        with self.condicao:
+            self.fechando = True
+            self.condicao.notify()
+        self.thread.join()
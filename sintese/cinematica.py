@@ -0,0 +1,663 @@
+"""Análise de posição dos mecanismos de seis barras, sem dependência da GUI.
+
+Cada função recebe um registro `Parametros` (elos e ângulos fixos, na
+mesma ordem do vetor otimizado pela evolução diferencial) e o ângulo de
+entrada em radianos, e retorna a mesma lista usada pela interface:
+[A, B, C, D, E, F, G, mi1, mi2, thetaO].
+
+Indeterminações matemáticas (ex.: acos de valor fora de [-1, 1]) geram
+exceções do módulo `math`, como na implementação original; quem chama
+decide como tratá-las.
+"""
+
+import bisect
+import math
+from typing import NamedTuple
+
+import numpy as np
+
+
+# Tipos de mecanismo suportados, na ordem das abas da interface
+TIPOS = ('W1', 'W2', 'S1', 'S2', 'S3')
+
+
+class Parametros(NamedTuple):
+    """Elos e ângulos fixos de um mecanismo (vetor de 11 posições do DE).
+
+    Para Watt 1, `alpha1` e `lambda1` correspondem a `alpha` e `lambda`.
+    """
+    L1: float
+    L2: float
+    L3: float
+    L4: float
+    L5: float
+    L6: float
+    L8: float
+    L9: float
+    phi: float
+    alpha1: float
+    lambda1: float
+
+
+def posicao_W1(par, AngDeEntrada):
+    """Posição do mecanismo Watt 1 para o ângulo de entrada `AngDeEntrada`."""
+
+    # Cálculo da cinemática do mecanismo
+    A_W1 = [0,0]
+    B_W1 = [par.L1*math.cos(par.phi),par.L1*math.sin(par.phi)]
+    C_W1 = [par.L2*math.cos(AngDeEntrada),par.L2*math.sin(AngDeEntrada)]
+    e1_W1 = math.sqrt((B_W1[0]-C_W1[0])**2 + (B_W1[1]-C_W1[1])**2)
+    omega_W1 = math.atan2(B_W1[1]-C_W1[1], B_W1[0]-C_W1[0])
+    delta_W1 = math.acos((par.L3**2+e1_W1**2-par.L4**2)/(2*e1_W1*par.L3))
+    D_W1 = [C_W1[0] + par.L3*math.cos(delta_W1+omega_W1),C_W1[1] + par.L3*math.sin(delta_W1+omega_W1)]
+    E_W1 = [C_W1[0] + par.L5*math.cos(delta_W1+omega_W1+par.alpha1),C_W1[1] + par.L5*math.sin(delta_W1+omega_W1+par.alpha1)]
+
+    beta1_W1 = math.atan2(D_W1[1]-B_W1[1], D_W1[0]-B_W1[0])
+    thetaO_W1 = beta1_W1-par.lambda1
+    G_W1  = [B_W1[0] + par.L6*math.cos(thetaO_W1),B_W1[1] + par.L6*math.sin(thetaO_W1)]
+    e2_W1 = math.sqrt((E_W1[0]-G_W1[0])**2 + (E_W1[1]-G_W1[1])**2)
+    beta2_W1 = math.atan2(E_W1[1]-G_W1[1], E_W1[0]-G_W1[0])
+    beta3_W1 = math.acos((par.L9**2+e2_W1**2-par.L8**2)/(2*par.L9*e2_W1))
+    F_W1  = [G_W1[0] + par.L9*math.cos(beta2_W1-beta3_W1),G_W1[1] + par.L9*math.sin(beta2_W1-beta3_W1)]
+
+    mi1_W1 = math.acos((par.L4**2+par.L3**2-e1_W1**2)/(2*par.L4*par.L3))
+    mi2_W1 = math.acos((par.L8**2+par.L9**2-e2_W1**2)/(2*par.L8*par.L9))
+
+    # Retorna os valores pertinentes calculados nesta função
+    return [A_W1, B_W1, C_W1, D_W1, E_W1, F_W1, G_W1, mi1_W1, mi2_W1, thetaO_W1]
+
+    # Para os outros mecanismos deste módulo, o funcionamento segue o mesmo modelo deste.
+
+
+def posicao_W2(par, AngDeEntrada):
+    """Posição do mecanismo Watt 2 para o ângulo de entrada `AngDeEntrada`."""
+
+    A = [0,0]
+    B = [par.L1*math.cos(par.phi),par.L1*math.sin(par.phi)]
+    C = [par.L2*math.cos(par.phi+par.alpha1),par.L2*math.sin(par.phi+par.alpha1)]
+    D = [par.L3*math.cos(AngDeEntrada),par.L3*math.sin(AngDeEntrada)]
+    x1 = math.sqrt((D[0]-C[0])**2 + (D[1]-C[1])**2)
+    Beta1 = math.atan2(C[1]-D[1], C[0]-D[0])
+    Beta2 = math.acos((par.L4**2+x1**2-par.L5**2)/(2*par.L4*x1))
+    E = [D[0]+par.L4*math.cos(Beta1+Beta2),D[1]+par.L4*math.sin(Beta1+Beta2)]
+    lambda0 = math.atan2(E[1]-C[1], E[0]-C[0])
+    F = [C[0]+par.L6*math.cos(lambda0-par.lambda1),C[1]+par.L6*math.sin(lambda0-par.lambda1)]
+    x2 = math.sqrt((F[0]-B[0])**2 + (F[1]-B[1])**2)
+    psi = math.atan2(F[1]-B[1], F[0]-B[0])
+    omega2 = math.acos((x2**2+par.L9**2-par.L8**2)/(2*par.L9*x2))
+    omega1 = psi-omega2-par.phi
+    thetaO = par.phi+omega1
+    G = [B[0]+par.L9*math.cos(thetaO),B[1]+par.L9*math.sin(thetaO)]
+    mi1 = math.acos((par.L4**2+par.L5**2-x1**2)/(2*par.L4*par.L5))
+    mi2 = math.acos((par.L8**2+par.L9**2-x2**2)/(2*par.L8*par.L9))
+
+    if(mi1 < 0):
+        mi1 = mi1+2*math.pi
+    if(mi2 < 0):
+        mi2 = mi2+2*math.pi
+
+    return [A, B, C, D, E, F, G, mi1, mi2, thetaO]
+
+
+def posicao_S1(par, AngDeEntrada):
+    """Posição do mecanismo Stephenson 1 para o ângulo de entrada `AngDeEntrada`."""
+
+    A_S1 = [0,0]
+    B_S1 = [par.L1*math.cos(par.phi),par.L1*math.sin(par.phi)]
+    C_S1 = [par.L2*math.cos(AngDeEntrada+par.alpha1),par.L2*math.sin(AngDeEntrada+par.alpha1)]
+    D_S1 = [par.L3*math.cos(AngDeEntrada),par.L3*math.sin(AngDeEntrada)]
+    e1_S1 = math.sqrt((D_S1[0]-B_S1[0])**2 + (D_S1[1]-B_S1[1])**2)
+    beta_S1 = math.atan2(B_S1[1]-D_S1[1], B_S1[0]-D_S1[0])
+    omega_S1 = math.acos((e1_S1**2+par.L5**2-par.L4**2)/(2*e1_S1*par.L5))
+    E_S1 = [D_S1[0] + par.L5*math.cos(beta_S1+omega_S1), D_S1[1] + par.L5*math.sin(beta_S1+omega_S1)]
+    ksi_S1 = math.atan2(E_S1[1]-B_S1[1], E_S1[0]-B_S1[0])
+    thetaO_S1 = ksi_S1 - par.lambda1
+    F_S1 = [B_S1[0] + par.L6*math.cos(ksi_S1-par.lambda1), B_S1[1] + par.L6*math.sin(ksi_S1-par.lambda1)]
+    e2_S1 = math.sqrt((C_S1[0]-F_S1[0])**2 + (C_S1[1]-F_S1[1])**2)
+    gamma_S1 = math.atan2(C_S1[1]-F_S1[1], C_S1[0]-F_S1[0])
+    delta_S1 = math.acos((e2_S1**2+par.L9**2-par.L8**2)/(2*e2_S1*par.L9))
+    G_S1 = [F_S1[0] + par.L9*math.cos(gamma_S1-delta_S1), F_S1[1] + par.L9*math.sin(gamma_S1-delta_S1)]
+    mi1_S1 = math.acos((par.L5**2+par.L4**2-e1_S1**2)/(2*par.L5*par.L4))
+    mi2_S1 = math.acos((par.L9**2+par.L8**2-e2_S1**2)/(2*par.L9*par.L8))
+
+    if(mi1_S1 < 0):
+        mi1_S1 = mi1_S1+2*math.pi
+    if(mi2_S1 < 0):
+        mi2_S1 = mi2_S1+2*math.pi
+
+    return [A_S1, B_S1, C_S1, D_S1, E_S1, F_S1, G_S1, mi1_S1, mi2_S1, thetaO_S1]
+
+
+def posicao_S2(par, AngDeEntrada, gamma_S2):
+    """Posição do mecanismo Stephenson 2 para o ângulo de entrada `AngDeEntrada`.
+
+    `gamma_S2` é o ângulo do elo L4, obtido previamente com
+    `resolver_gamma_S2` (o fechamento de S2 não tem solução direta pela
+    sequência de díades usada nos demais mecanismos).
+    """
+
+    A_S2 = [0,0]
+    B_S2 = [par.L1*math.cos(par.phi),par.L1*math.sin(par.phi)]
+    C_S2 = [par.L3*math.cos(AngDeEntrada+par.alpha1),par.L3*math.sin(AngDeEntrada+par.alpha1)]
+    D_S2 = [par.L2*math.cos(AngDeEntrada),par.L2*math.sin(AngDeEntrada)]
+
+    E_S2 = [C_S2[0] + par.L4*math.cos(gamma_S2), C_S2[1] + par.L4*math.sin(gamma_S2)]
+    e1_S2 = math.sqrt((E_S2[0]-D_S2[0])**2 + (E_S2[1]-D_S2[1])**2)
+    omega_S2 = math.atan2(E_S2[1]-D_S2[1], E_S2[0]-D_S2[0])
+    omega2_S2 = math.acos((e1_S2**2 + par.L5**2 - par.L6**2) / (2 * e1_S2 * par.L5))
+    F_S2 = [D_S2[0] + par.L5*math.cos(omega_S2-omega2_S2), D_S2[1] + par.L5*math.sin(omega_S2-omega2_S2)]
+    omega3_S2 = math.atan2(E_S2[1]-F_S2[1], E_S2[0]-F_S2[0])
+    G_S2 = [F_S2[0] + par.L8*math.cos(omega3_S2-par.lambda1), F_S2[1] + par.L8*math.sin(omega3_S2-par.lambda1)]
+
+    thetaO_S2 = math.atan2(G_S2[1]-B_S2[1], G_S2[0]-B_S2[0])
+
+    e2_S2 = math.sqrt((F_S2[0]-B_S2[0])**2 + (F_S2[1]-B_S2[1])**2)
+
+    e3_S2 = math.sqrt((F_S2[0]-C_S2[0])**2 + (F_S2[1]-C_S2[1])**2)
+
+    mi1_S2 = math.acos((par.L4**2 + par.L6**2 - e3_S2**2) / (2 * par.L4 * par.L6))
+    mi2_S2 = math.acos((par.L8**2+par.L9**2-e2_S2**2)/(2*par.L8*par.L9))
+
+    if(mi1_S2 < 0):
+        mi1_S2 = mi1_S2+2*math.pi
+    if(mi2_S2 < 0):
+        mi2_S2 = mi2_S2+2*math.pi
+
+    return [A_S2, B_S2, C_S2, D_S2, E_S2, F_S2, G_S2, mi1_S2, mi2_S2, thetaO_S2]
+
+
+def residuo_S2(gamma_S2, par, AngDeEntrada):
+    """Equação de fechamento de S2 em gamma_S2: L9 - |G - B|.
+
+    Usada com `scipy.optimize.root`, que entrega `gamma_S2` como array de
+    um elemento.
+    """
+    gamma_S2 = np.ravel(gamma_S2)[0]
+
+    B_S2 = [par.L1*math.cos(par.phi),par.L1*math.sin(par.phi)]
+    C_S2 = [par.L3*math.cos(AngDeEntrada+par.alpha1),par.L3*math.sin(AngDeEntrada+par.alpha1)]
+    D_S2 = [par.L2*math.cos(AngDeEntrada),par.L2*math.sin(AngDeEntrada)]
+
+    E_S2 = [C_S2[0] + par.L4 * math.cos(gamma_S2), C_S2[1] + par.L4 * math.sin(gamma_S2)]
+    e1_S2 = math.sqrt((E_S2[0] - D_S2[0]) ** 2 + (E_S2[1] - D_S2[1]) ** 2)
+    omega_S2 = math.atan2(E_S2[1] - D_S2[1], E_S2[0] - D_S2[0])
+    omega2_S2 = math.acos((e1_S2 ** 2 + par.L5 ** 2 - par.L6 ** 2) / (2 * e1_S2 * par.L5))
+    F_S2 = [D_S2[0] + par.L5 * math.cos(omega_S2 - omega2_S2), D_S2[1] + par.L5 * math.sin(omega_S2 - omega2_S2)]
+    omega3_S2 = math.atan2(E_S2[1] - F_S2[1], E_S2[0] - F_S2[0])
+    G_S2 = [F_S2[0] + par.L8 * math.cos(omega3_S2 - par.lambda1), F_S2[1] + par.L8 * math.sin(omega3_S2 - par.lambda1)]
+
+    return par.L9 - math.sqrt((G_S2[0] - B_S2[0]) ** 2 + (G_S2[1] - B_S2[1]) ** 2)
+
+
+# Solução direta do fechamento de S2
+#
+# A tríade E-F-G (elo ternário) fica presa a C (L4), D (L5) e B (L9). Com o
+# ângulo teta do segmento F->E como incógnita, subtrair |F-D|² = L5² das
+# outras duas equações de fechamento deixa um sistema linear em F; voltando
+# em |F-D|² = L5² obtém-se um polinômio trigonométrico de grau 3 em teta,
+# ou seja, um polinômio de grau 6 em z = exp(i*teta). Suas raízes sobre o
+# círculo unitário são todas as configurações de montagem possíveis.
+
+_AMOSTRAS_S2 = 8        # pontos de amostragem do polinômio trigonométrico (>= 2*3+1)
+_TOL_FECHAMENTO_S2 = 1e-7
+
+
+def _triade_S2(par, AngDeEntrada, teta):
+    """Pontos B, C, D, E, F do S2 para o ângulo `teta` (direção F->E) do ternário.
+
+    Retorna também o determinante do sistema linear em F (F é
+    indeterminado onde ele se anula). Opera elemento a elemento com
+    broadcasting entre `par`, `AngDeEntrada` e `teta`.
+    """
+
+    Bx, By = par.L1*np.cos(par.phi), par.L1*np.sin(par.phi)
+    Cx, Cy = par.L3*np.cos(AngDeEntrada+par.alpha1), par.L3*np.sin(AngDeEntrada+par.alpha1)
+    Dx, Dy = par.L2*np.cos(AngDeEntrada), par.L2*np.sin(AngDeEntrada)
+
+    ux, uy = np.cos(teta), np.sin(teta)
+    vx, vy = np.cos(teta-par.lambda1), np.sin(teta-par.lambda1)
+
+    # F.p = r1 (de |E-C|² - |F-D|²) e F.q = r2 (de |G-B|² - |F-D|²)
+    px, py = par.L6*ux - Cx + Dx, par.L6*uy - Cy + Dy
+    qx, qy = par.L8*vx - Bx + Dx, par.L8*vy - By + Dy
+    DD = Dx**2 + Dy**2
+    r1 = (par.L4**2 - par.L5**2 - par.L6**2 + 2*par.L6*(ux*Cx + uy*Cy) - (Cx**2 + Cy**2) + DD)/2
+    r2 = (par.L9**2 - par.L5**2 - par.L8**2 + 2*par.L8*(vx*Bx + vy*By) - (Bx**2 + By**2) + DD)/2
+
+    det = px*qy - py*qx
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Fx = (r1*qy - r2*py)/det
+        Fy = (px*r2 - qx*r1)/det
+    Ex, Ey = Fx + par.L6*ux, Fy + par.L6*uy
+
+    return (Bx, By), (Cx, Cy), (Dx, Dy), (Ex, Ey), (Fx, Fy), det
+
+
+def solucoes_gamma_S2(par, AngDeEntrada):
+    """Todas as soluções de `residuo_S2` (modos de montagem), sem iteração.
+
+    Aceita `par` com campos em array e `AngDeEntrada` em array (com
+    broadcasting) e retorna um array com forma (..., 6): os valores de
+    `gamma_S2` em (-pi, pi], com NaN onde não há solução real. Só são
+    mantidas as soluções no mesmo ramo da díade D-F-E usado em
+    `posicao_S2` (F = D + L5*u(omega - omega2), com 0 <= omega2 <= pi).
+    """
+
+    AngDeEntrada = np.asarray(AngDeEntrada, dtype=float)
+    par = Parametros._make(np.asarray(campo, dtype=float)[..., None] for campo in par)
+    AngDeEntrada = AngDeEntrada[..., None]
+
+    # Coeficientes do polinômio trigonométrico P(teta) = sum c_m exp(i*m*teta), |m| <= 3
+    teta = 2*np.pi*np.arange(_AMOSTRAS_S2)/_AMOSTRAS_S2
+    _, _, (Dx, Dy), _, (Fx, Fy), det = _triade_S2(par, AngDeEntrada, teta)
+    with np.errstate(invalid='ignore'):
+        P = ((Fx - Dx)*det)**2 + ((Fy - Dy)*det)**2 - (par.L5*det)**2
+    c = np.fft.fft(P, axis=-1)/_AMOSTRAS_S2
+    a = np.concatenate([c[..., -3:], c[..., :4]], axis=-1)      # z**3 * P(teta) em potências crescentes de z
+
+    # Raízes em lote pela matriz companheira
+    forma = a.shape[:-1]
+    a = a.reshape(-1, 7)
+    companheira = np.zeros((a.shape[0], 6, 6), dtype=complex)
+    companheira[:, 1:, :-1] = np.eye(5)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        companheira[:, 0, :] = -a[:, 5::-1]/a[:, 6:7]
+    z = np.full((a.shape[0], 6), np.nan, dtype=complex)
+    ok = np.all(np.isfinite(companheira), axis=(1, 2))
+    if np.any(ok):
+        z[ok] = np.linalg.eigvals(companheira[ok])
+    teta = np.angle(z).reshape(forma + (6,))
+
+    # Confere o fechamento (descarta raízes fora do círculo unitário) e o ramo de F
+    _, (Cx, Cy), (Dx, Dy), (Ex, Ey), (Fx, Fy), _ = _triade_S2(par, AngDeEntrada, teta)
+    with np.errstate(invalid='ignore'):
+        escala = par.L1 + par.L2 + par.L3 + par.L4 + par.L5
+        valido = np.abs(np.hypot(Fx - Dx, Fy - Dy) - par.L5) <= _TOL_FECHAMENTO_S2*escala
+        valido &= (Ex - Dx)*(Fy - Dy) - (Ey - Dy)*(Fx - Dx) <= _TOL_FECHAMENTO_S2*escala**2
+        gamma_S2 = np.arctan2(Ey - Cy, Ex - Cx)
+
+    return np.where(valido, gamma_S2, np.nan)
+
+
+def escolher_gamma_S2(solucoes, referencia=1):
+    """Escolhe, entre `solucoes` (última dimensão), a mais próxima de `referencia`.
+
+    A distância é angular (módulo 2*pi). Retorna NaN onde não há solução.
+    """
+
+    distancia = np.abs(np.remainder(solucoes - np.asarray(referencia)[..., None] + np.pi, 2*np.pi) - np.pi)
+    distancia = np.where(np.isnan(solucoes), np.inf, distancia)
+    k = np.argmin(distancia, axis=-1)
+    gamma_S2 = np.take_along_axis(solucoes, k[..., None], axis=-1)[..., 0]
+    return gamma_S2
+
+
+# Newton em lote para o fechamento do S2 (população x pontos de precisão)
+
+def _residuo_derivada_S2(par, AngDeEntrada, gamma_S2):
+    """`residuo_S2` e sua derivada analítica em gamma_S2, elemento a elemento (arrays).
+
+    Segue a mesma cadeia E -> F -> G de `posicao_S2`, derivando cada passo
+    (regra da cadeia). Retorna NaN onde a díade D-F-E não fecha.
+    """
+
+    Bx, By = par.L1*np.cos(par.phi), par.L1*np.sin(par.phi)
+    Cx, Cy = par.L3*np.cos(AngDeEntrada+par.alpha1), par.L3*np.sin(AngDeEntrada+par.alpha1)
+    Dx, Dy = par.L2*np.cos(AngDeEntrada), par.L2*np.sin(AngDeEntrada)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # E e dE/dgamma
+        Ex, Ey = Cx + par.L4*np.cos(gamma_S2), Cy + par.L4*np.sin(gamma_S2)
+        dEx, dEy = -par.L4*np.sin(gamma_S2), par.L4*np.cos(gamma_S2)
+
+        # Díade D-F-E
+        ux, uy = Ex - Dx, Ey - Dy
+        e1 = np.hypot(ux, uy)
+        de1 = (ux*dEx + uy*dEy)/e1
+        omega = np.arctan2(uy, ux)
+        domega = (ux*dEy - uy*dEx)/e1**2
+        k = (e1**2 + par.L5**2 - par.L6**2)/(2*e1*par.L5)
+        omega2 = np.arccos(k)
+        dk = de1*(e1**2 - par.L5**2 + par.L6**2)/(2*e1**2*par.L5)
+        domega2 = -dk/np.sqrt(1 - k**2)
+        Fx, Fy = Dx + par.L5*np.cos(omega-omega2), Dy + par.L5*np.sin(omega-omega2)
+        dFx, dFy = -par.L5*(domega-domega2)*np.sin(omega-omega2), par.L5*(domega-domega2)*np.cos(omega-omega2)
+
+        # Ternário E-F-G
+        vx, vy = Ex - Fx, Ey - Fy
+        omega3 = np.arctan2(vy, vx)
+        domega3 = (vx*(dEy - dFy) - vy*(dEx - dFx))/(vx**2 + vy**2)
+        Gx, Gy = Fx + par.L8*np.cos(omega3-par.lambda1), Fy + par.L8*np.sin(omega3-par.lambda1)
+        dGx, dGy = dFx - par.L8*domega3*np.sin(omega3-par.lambda1), dFy + par.L8*domega3*np.cos(omega3-par.lambda1)
+
+        wx, wy = Gx - Bx, Gy - By
+        e4 = np.hypot(wx, wy)
+        R = par.L9 - e4
+        dR = -(wx*dGx + wy*dGy)/e4
+
+    return R, dR
+
+
+_ITERACOES_NEWTON_S2 = 25
+_PASSO_NEWTON_S2 = 0.5      # rad, limite do passo de Newton (mantém a raiz perto do chute, como o 'lm')
+_SALTO_MAX_S2 = 0.15         # rad, afastamento máximo do chute antes de a raia ser rejeitada (troca de ramo)
+
+
+def newton_gamma_S2(par, AngDeEntrada, gamma0=1):
+    """Newton em lote para `residuo_S2`, com derivada analítica.
+
+    `par` (campos em array) e `AngDeEntrada` são combinados por
+    broadcasting e cada elemento é uma raia independente, com a sua
+    própria máscara de convergência: só as raias ativas são avaliadas a
+    cada iteração. Retorna `gamma_S2` em (-pi, pi], com NaN nas raias que
+    não convergiram (saíram do domínio, derivada nula, excesso de
+    iterações ou afastamento de mais de `_SALTO_MAX_S2` do chute, sinal
+    de que o Newton pulou para outro modo de montagem).
+    """
+
+    campos = np.broadcast_arrays(*(np.asarray(campo, dtype=float) for campo in par),
+                                 np.asarray(AngDeEntrada, dtype=float), np.asarray(gamma0, dtype=float))
+    forma = campos[0].shape
+    campos = [np.ravel(campo) for campo in campos]
+    par, AngDeEntrada, gamma_S2 = Parametros._make(campos[:11]), campos[11], campos[12].copy()
+    gamma0 = campos[12]
+    tol = 1e-10*(par.L1 + par.L2 + par.L3 + par.L4 + par.L5)
+
+    resultado = np.full(gamma_S2.shape, np.nan)
+    ativo = np.arange(gamma_S2.size)
+    for _ in range(_ITERACOES_NEWTON_S2):
+        if ativo.size == 0:
+            break
+        par_a = Parametros._make(campo[ativo] for campo in par)
+        R, dR = _residuo_derivada_S2(par_a, AngDeEntrada[ativo], gamma_S2[ativo])
+
+        convergiu = np.abs(R) < tol[ativo]
+        resultado[ativo[convergiu]] = gamma_S2[ativo[convergiu]]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            passo = np.clip(-R/dR, -_PASSO_NEWTON_S2, _PASSO_NEWTON_S2)
+        segue = ~convergiu & np.isfinite(passo)
+        gamma_S2[ativo[segue]] += passo[segue]
+        segue &= np.abs(gamma_S2[ativo] - gamma0[ativo]) <= _SALTO_MAX_S2
+        ativo = ativo[segue]
+
+    return np.remainder(resultado + np.pi, 2*np.pi).reshape(forma) - np.pi
+
+
+def resolver_gamma_S2(par, AngDeEntrada, referencia=1):
+    """`gamma_S2` que fecha o S2 em `AngDeEntrada`, seguindo um só modo de montagem.
+
+    O último eixo de `AngDeEntrada` (com broadcasting) é a sequência de
+    pontos de precisão. O primeiro ponto parte de `referencia` (1
+    reproduz o chute inicial usado antes com `root`) e cada ponto
+    seguinte parte do gamma_S2 do anterior, de modo que o mecanismo não
+    troca de modo de montagem no meio do movimento. Cada ponto é
+    resolvido por `newton_gamma_S2`; as raias em que o Newton não
+    converge ou salta de ramo caem na solução direta
+    (`solucoes_gamma_S2`), no modo mais próximo do chute. Retorna NaN
+    onde o mecanismo não monta.
+    """
+
+    campos = np.broadcast_arrays(*(np.asarray(campo, dtype=float) for campo in par),
+                                 np.asarray(AngDeEntrada, dtype=float), np.asarray(referencia, dtype=float))
+    forma = campos[0].shape
+    campos = [np.reshape(campo, (-1, forma[-1] if forma else 1)) for campo in campos]
+    par, AngDeEntrada = Parametros._make(campos[:11]), campos[11]
+
+    gamma_S2 = np.full(AngDeEntrada.shape, np.nan)
+    chute = campos[12][:, 0].copy()
+    for j in range(AngDeEntrada.shape[1]):
+        par_j = Parametros._make(campo[:, j] for campo in par)
+        gamma_j = newton_gamma_S2(par_j, AngDeEntrada[:, j], chute)
+        falhou = np.isnan(gamma_j)
+        if np.any(falhou):
+            par_f = Parametros._make(campo[falhou] for campo in par_j)
+            gamma_j[falhou] = escolher_gamma_S2(solucoes_gamma_S2(par_f, AngDeEntrada[falhou, j]), chute[falhou])
+        gamma_S2[:, j] = gamma_j
+        # onde o ponto não monta, o próximo parte do último valor válido
+        chute = np.where(np.isnan(gamma_j), chute, gamma_j)
+    return gamma_S2.reshape(forma)[()]
+
+
+# Varredura da volta completa do S2 por continuação
+#
+# Em vez de resolver gamma_S2 em uma grade fixa de ângulos de entrada, a
+# curva R(ang, gamma) = 0 é seguida por comprimento de arco (preditor
+# tangente + corretor de Newton) com passo adaptativo. Guarda-se só as
+# amostras aceitas e a derivada d(gamma)/d(ang) em cada uma, o que permite
+# interpolar por Hermite cúbico em qualquer ângulo.
+
+class CurvaS2(NamedTuple):
+    """Amostras de gamma_S2 ao longo da volta, geradas por `continuar_gamma_S2`.
+
+    `angulos` é crescente e cobre [inicio, inicio + 2*pi]; trechos em que o
+    mecanismo não monta (ou trava num ponto morto) são separados por uma
+    amostra com `gammas` = NaN.
+    """
+    inicio: float
+    angulos: np.ndarray
+    gammas: np.ndarray
+    derivadas: np.ndarray
+
+
+_PASSO_MAX_S2 = math.radians(2)
+_PASSO_MIN_S2 = 1e-7
+_GIRO_MAX_S2 = 0.1          # rad entre tangentes consecutivas
+_DELTA_S2 = 1e-7            # passo das diferenças finitas
+
+
+def _fechamento_S2(par, AngDeEntrada, gamma_S2):
+    """`residuo_S2` e suas derivadas (d/dang, d/dgamma) por diferenças centrais; NaN fora do domínio."""
+
+    try:
+        R = residuo_S2(gamma_S2, par, AngDeEntrada)
+        R_ang = (residuo_S2(gamma_S2, par, AngDeEntrada+_DELTA_S2) - residuo_S2(gamma_S2, par, AngDeEntrada-_DELTA_S2))/(2*_DELTA_S2)
+        R_gamma = (residuo_S2(gamma_S2+_DELTA_S2, par, AngDeEntrada) - residuo_S2(gamma_S2-_DELTA_S2, par, AngDeEntrada))/(2*_DELTA_S2)
+    except ValueError:
+        return math.nan, math.nan, math.nan
+    return R, R_ang, R_gamma
+
+
+def _corrigir_S2(par, ang, gamma_S2, t_ang, t_gamma, tol):
+    """Corretor de Newton sobre o plano normal à tangente (t_ang, t_gamma) que passa pelo ponto previsto."""
+
+    ang0, gamma0 = ang, gamma_S2
+    for _ in range(6):
+        R, R_ang, R_gamma = _fechamento_S2(par, ang, gamma_S2)
+        if math.isnan(R):
+            return None
+        if abs(R) < tol:
+            return ang, gamma_S2, R_ang, R_gamma
+        # [R_ang R_gamma; t_ang t_gamma] * d = -[R; t.(x - x0)]
+        N = t_ang*(ang-ang0) + t_gamma*(gamma_S2-gamma0)
+        det = R_ang*t_gamma - R_gamma*t_ang
+        if det == 0:
+            return None
+        ang -= (R*t_gamma - R_gamma*N)/det
+        gamma_S2 -= (R_ang*N - R*t_ang)/det
+    return None
+
+
+def _proximo_ramo_S2(par, de, ate, referencia):
+    """Primeiro ângulo em (de, ate] em que o S2 monta e o gamma_S2 mais próximo de `referencia` ali.
+
+    Procura em blocos de 10° numa grade de 0,1° pela solução direta e
+    refina a borda por bissecção. Retorna None se não monta em nenhum
+    ponto do intervalo.
+    """
+
+    while de < ate:
+        grade = de + np.radians(0.1)*np.arange(1, 101)
+        grade = grade[grade <= ate] if grade[-1] > ate else grade
+        if grade.size == 0:
+            grade = np.array([ate])
+        existe = np.any(np.isfinite(solucoes_gamma_S2(par, grade)), axis=-1)
+        if np.any(existe):
+            k = int(np.argmax(existe))
+            b = grade[k]
+            if k > 0:
+                a = grade[k-1]
+                for _ in range(20):
+                    meio = (a+b)/2
+                    if np.any(np.isfinite(solucoes_gamma_S2(par, meio))):
+                        b = meio
+                    else:
+                        a = meio
+            return b, float(escolher_gamma_S2(solucoes_gamma_S2(par, b), referencia))
+        de = grade[-1]
+    return None
+
+
+def continuar_gamma_S2(par, inicio=0, referencia=1):
+    """Segue gamma_S2 por uma volta completa da entrada a partir de `inicio`.
+
+    O ponto de partida é o de `resolver_gamma_S2` com `referencia`. Quando o ramo chega a um ponto morto ou
+    deixa de montar, a varredura salta para o próximo ângulo em que o
+    mecanismo volta a montar, no modo mais próximo do último valor.
+    Retorna uma `CurvaS2`.
+    """
+
+    fim = inicio + 2*math.pi
+    tol = 1e-10*(par.L1 + par.L2 + par.L3 + par.L4 + par.L5)
+    angulos, gammas, derivadas = [], [], []
+
+    gamma_S2 = float(resolver_gamma_S2(par, inicio, referencia))
+    if math.isnan(gamma_S2):
+        partida = _proximo_ramo_S2(par, inicio, fim, referencia)
+    else:
+        partida = (inicio, gamma_S2)
+    while partida is not None:
+        ang, gamma_S2 = partida
+        R, R_ang, R_gamma = _fechamento_S2(par, ang, gamma_S2)
+        if math.isnan(R):
+            break
+        if angulos:
+            angulos.append((angulos[-1] + ang)/2); gammas.append(math.nan); derivadas.append(math.nan)
+        angulos.append(ang); gammas.append(gamma_S2); derivadas.append(-R_ang/R_gamma)
+
+        # Tangente à curva, orientada no sentido de ângulo de entrada crescente
+        norma = math.hypot(R_ang, R_gamma)
+        t_ang, t_gamma = -R_gamma/norma, R_ang/norma
+        if t_ang < 0:
+            t_ang, t_gamma = -t_ang, -t_gamma
+
+        passo = _PASSO_MAX_S2
+        while ang < fim:
+            passo = min(passo, (fim - ang)/t_ang if t_ang > 0 else passo)
+            novo = _corrigir_S2(par, ang + passo*t_ang, gamma_S2 + passo*t_gamma, t_ang, t_gamma, tol)
+            if novo is not None:
+                ang_n, gamma_n, R_ang, R_gamma = novo
+                if math.hypot(ang_n - ang - passo*t_ang, gamma_n - gamma_S2 - passo*t_gamma) > passo/2:
+                    novo = None     # o corretor caiu em outro ramo
+            if novo is not None:
+                norma = math.hypot(R_ang, R_gamma)
+                tn_ang, tn_gamma = -R_gamma/norma, R_ang/norma
+                if tn_ang*t_ang + tn_gamma*t_gamma < 0:
+                    tn_ang, tn_gamma = -tn_ang, -tn_gamma
+                giro = math.acos(min(1, tn_ang*t_ang + tn_gamma*t_gamma))
+                if ang_n <= ang or tn_ang <= 0 or giro > _GIRO_MAX_S2:
+                    novo = None     # passou de um ponto morto ou curvou demais: reduz o passo
+            if novo is None:
+                passo /= 2
+                if passo < _PASSO_MIN_S2:
+                    break
+                continue
+
+            ang, gamma_S2, t_ang, t_gamma = ang_n, gamma_n, tn_ang, tn_gamma
+            angulos.append(ang); gammas.append(gamma_S2); derivadas.append(-R_ang/R_gamma)
+            if giro < _GIRO_MAX_S2/4:
+                passo = min(2*passo, _PASSO_MAX_S2)
+
+        if ang >= fim - 1e-12:
+            break
+        partida = _proximo_ramo_S2(par, ang, fim, gamma_S2)
+
+    return CurvaS2(inicio, np.array(angulos), np.array(gammas), np.array(derivadas))
+
+
+def _hermite_S2(x, x0, x1, g0, g1, d0, d1):
+    """Hermite cúbico entre duas amostras; secante perto de ponto morto (a derivada explode, gamma ~ raiz do ângulo)."""
+
+    h = x1 - x0
+    s = (x - x0)/h
+    secante = (g1 - g0)/h
+    linear = (np.abs(d0 - secante) > 4*np.abs(secante) + 1) | (np.abs(d1 - secante) > 4*np.abs(secante) + 1)
+    gamma_S2 = (2*s**3 - 3*s**2 + 1)*g0 + (s**3 - 2*s**2 + s)*h*d0 + (-2*s**3 + 3*s**2)*g1 + (s**3 - s**2)*h*d1
+    gamma_S2 = np.where(linear, g0 + s*(g1 - g0), gamma_S2)
+    return np.where(s == 0, g0, gamma_S2)
+
+
+def interpolar_gamma_S2(curva, AngDeEntrada):
+    """gamma_S2 em `AngDeEntrada` por interpolação de Hermite cúbica sobre uma `CurvaS2`.
+
+    O ângulo é reduzido à volta [inicio, inicio + 2*pi). Retorna NaN fora
+    dos trechos em que o mecanismo monta.
+    """
+
+    n = len(curva.angulos)
+    if np.ndim(AngDeEntrada) == 0:
+        # Caminho escalar (chamado ponto a ponto pela interface), sem alocar arrays
+        x = curva.inicio + (float(AngDeEntrada) - curva.inicio) % (2*math.pi)
+        if n < 2 or x < curva.angulos[0] or x > curva.angulos[-1]:
+            return math.nan
+        k = min(max(bisect.bisect_right(curva.angulos, x) - 1, 0), n - 2)
+        return float(_hermite_S2(x, curva.angulos[k], curva.angulos[k+1], curva.gammas[k], curva.gammas[k+1],
+                                 curva.derivadas[k], curva.derivadas[k+1]))
+
+    x = curva.inicio + np.remainder(np.asarray(AngDeEntrada, dtype=float) - curva.inicio, 2*np.pi)
+    if n < 2:
+        return np.full(np.shape(x), np.nan)
+    k = np.clip(np.searchsorted(curva.angulos, x, side='right') - 1, 0, n - 2)
+    gamma_S2 = _hermite_S2(x, curva.angulos[k], curva.angulos[k+1], curva.gammas[k], curva.gammas[k+1],
+                           curva.derivadas[k], curva.derivadas[k+1])
+    return np.where((x < curva.angulos[0]) | (x > curva.angulos[-1]), np.nan, gamma_S2)
+
+
+def posicao_S3(par, AngDeEntrada):
+    """Posição do mecanismo Stephenson 3 para o ângulo de entrada `AngDeEntrada`."""
+
+    A_S3 = [0,0]
+    B_S3 = [par.L1*math.cos(par.phi),par.L1*math.sin(par.phi)]
+    C_S3 = [par.L2*math.cos(par.phi+par.alpha1),par.L2*math.sin(par.phi+par.alpha1)]
+    D_S3 = [par.L3*math.cos(AngDeEntrada),par.L3*math.sin(AngDeEntrada)]
+    e1_S3 = math.sqrt((D_S3[0]-C_S3[0])**2 + (D_S3[1]-C_S3[1])**2)
+    omega_S3 = math.acos((e1_S3**2+par.L5**2-par.L4**2)/(2*e1_S3*par.L5))
+    beta_S3 = math.atan2(D_S3[1]-C_S3[1], D_S3[0]-C_S3[0])
+    F_S3 = [C_S3[0] + par.L5*math.cos(beta_S3-omega_S3), C_S3[1] + par.L5*math.sin(beta_S3-omega_S3)]
+    lambda0_S3 = math.atan2(D_S3[1]-F_S3[1], D_S3[0]-F_S3[0])
+    E_S3 = [F_S3[0] + par.L6*math.cos(lambda0_S3-par.lambda1), F_S3[1] + par.L6*math.sin(lambda0_S3-par.lambda1)]
+    e2_S3 = math.sqrt((E_S3[0]-B_S3[0])**2 + (E_S3[1]-B_S3[1])**2)
+    gamma_S3 = math.acos((e2_S3**2+par.L9**2-par.L8**2)/(2*e2_S3*par.L9))
+    gamma1_S3 = math.atan2(E_S3[1]-B_S3[1], E_S3[0]-B_S3[0])
+    thetaO_S3 = gamma1_S3-gamma_S3
+    G_S3 = [B_S3[0] + par.L9*math.cos(thetaO_S3), B_S3[1] + par.L9*math.sin(thetaO_S3)]
+
+    mi1_S3 = math.acos((par.L5**2+par.L4**2-e1_S3**2)/(2*par.L5*par.L4))
+    mi2_S3 = math.acos((par.L8**2+par.L9**2-e2_S3**2)/(2*par.L8*par.L9))
+
+    if(mi1_S3 < 0):
+        mi1_S3 = mi1_S3+2*math.pi
+    if(mi2_S3 < 0):
+        mi2_S3 = mi2_S3+2*math.pi
+
+    return [A_S3, B_S3, C_S3, D_S3, E_S3, F_S3, G_S3, mi1_S3, mi2_S3, thetaO_S3]
+
+
+def posicao(TipoDeMec, par, AngDeEntrada, gamma_S2=None):
+    """Despacha para a análise de posição de `TipoDeMec` ('W1', ..., 'S3')."""
+
+    if TipoDeMec == 'W1':
+        return posicao_W1(par, AngDeEntrada)
+    elif TipoDeMec == 'W2':
+        return posicao_W2(par, AngDeEntrada)
+    elif TipoDeMec == 'S1':
+        return posicao_S1(par, AngDeEntrada)
+    elif TipoDeMec == 'S2':
+        if gamma_S2 is None:
+            gamma_S2 = float(resolver_gamma_S2(par, AngDeEntrada))
+            if math.isnan(gamma_S2):
+                raise ValueError("Stephenson 2 não monta para este ângulo de entrada")
+        return posicao_S2(par, AngDeEntrada, gamma_S2)
+    elif TipoDeMec == 'S3':
+        return posicao_S3(par, AngDeEntrada)
+    raise ValueError(f"Tipo de mecanismo desconhecido: {TipoDeMec}")
@@ -0,0 +1,120 @@
+"""Comparação simultânea das cinco topologias para os mesmos pontos de precisão.
+
+Cada mecanismo (W1, W2, S1, S2, S3) roda o DE vetorizado em um processo
+próprio, de modo que os núcleos são divididos entre as topologias. Os
+processos publicam a melhor energia a cada geração num vetor em memória
+compartilhada; depois de `GERACOES_MINIMAS` gerações, uma topologia cuja
+melhor energia seja mais de `FATOR_DERROTA` vezes a da líder para cedo,
+liberando o núcleo. Os pontos de precisão são os mesmos para todas; os
+limites das variáveis podem ser próprios de cada topologia (o
+Stephenson 3, por exemplo, começa L1 em 30). O resultado é uma tabela ordenada: primeiro as
+soluções que respeitam os limites do ângulo de transmissão, depois pelo
+erro.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+from scipy.optimize import differential_evolution
+
+from .inicializacao import populacao_inicial
+from .lote import resumo
+from .motores import de_adaptativo, variante_adaptativa
+from .objetivos import OBJETIVOS
+
+
+TIPOS_COMPARADOS = ('W1', 'W2', 'S1', 'S2', 'S3')
+GERACOES_MINIMAS = 100
+FATOR_DERROTA = 100     # em energia (soma dos quadrados), ou seja, 10 vezes o erro angular
+
+_melhores = None        # memória compartilhada, no processo de trabalho: melhor energia de cada topologia
+_parar = None           # memória compartilhada: pedido de parada (cancelamento) de cada topologia
+
+
+def _iniciar(melhores, parar):
+    global _melhores, _parar
+    _melhores, _parar = melhores, parar
+
+
+def _sintetizar(indice, bounds, args, opcoes):
+    """Roda o DE de `TIPOS_COMPARADOS[indice]` (executa no processo de trabalho)."""
+
+    parou_cedo = False
+
+    def callback(intermediate_result):
+        nonlocal parou_cedo
+        _melhores[indice] = intermediate_result.fun
+        if _parar[indice]:
+            return True
+        if intermediate_result.nit < GERACOES_MINIMAS:
+            return False
+        lider = min(e for j, e in enumerate(_melhores) if j != indice)
+        parou_cedo = intermediate_result.fun > FATOR_DERROTA*lider
+        return parou_cedo
+
+    funcao_vet = OBJETIVOS[TIPOS_COMPARADOS[indice]][1]
+    opcoes = dict(opcoes)
+    rng = np.random.default_rng(opcoes.pop('seed', None))
+    init = opcoes.pop('init', 'latinhypercube')
+    if init != 'latinhypercube' and isinstance(init, str):
+        init = populacao_inicial(bounds, opcoes.get('popsize', 15)*len(bounds), init, rng=rng)
+    variante = variante_adaptativa(opcoes.get('strategy'))
+    inicio = time.perf_counter()
+    if variante is None:
+        resultado = differential_evolution(funcao_vet, bounds, args=args, vectorized=True, updating='deferred',
+                                           callback=callback, seed=rng, init=init, **opcoes)
+    else:
+        for chave in ('strategy', 'mutation', 'recombination'):
+            opcoes.pop(chave, None)
+        resultado = de_adaptativo(funcao_vet, bounds, args=args, variante=variante, callback=callback, seed=rng,
+                                  init=init, **opcoes)
+    resultado.parou_cedo = parou_cedo
+    resultado.cancelado = bool(_parar[indice])
+    resultado.tempo = time.perf_counter() - inicio
+    return resultado
+
+
+def comparar(bounds, args, processos=None, cancelamento=None, **opcoes):
+    """Sintetiza as cinco topologias ao mesmo tempo e retorna a tabela ordenada.
+
+    bounds: limites das 11 variáveis, iguais para todas as topologias, ou
+    um dicionário {tipo: limites} com os de cada uma.
+    args: (thetaI, thetaOd, n, lb, rb), como nas funções objetivo.
+    processos: número de processos (padrão: núcleos, no máximo 5).
+    cancelamento: `threading.Event` opcional; quando ativado, todas as
+    topologias param ao fim da geração corrente com o melhor até ali.
+    opcoes: configurações do `differential_evolution` (tol, maxiter,
+    strategy, seed, init...). Com strategy 'JADE', 'SHADE' ou 'L-SHADE',
+    cada topologia roda `motores.de_adaptativo`; init 'sobol' gera a
+    população inicial por `inicializacao.populacao_inicial`.
+
+    Cada linha da tabela é um dicionário com tipo, erro (função objetivo),
+    erro_max e folga_mi (graus, ver `lote.resumo`), viavel, x, nit,
+    tempo e situação ('concluído', 'parado cedo' ou 'cancelado').
+    """
+
+    thetaI, thetaOd, n, lb, rb = args
+    limites = bounds if isinstance(bounds, dict) else dict.fromkeys(TIPOS_COMPARADOS, bounds)
+    processos = min(len(TIPOS_COMPARADOS), processos or os.cpu_count())
+    melhores = multiprocessing.Array('d', [np.inf]*len(TIPOS_COMPARADOS), lock=False)
+    parar = multiprocessing.Array('b', [0]*len(TIPOS_COMPARADOS), lock=False)
+
+    with ProcessPoolExecutor(processos, initializer=_iniciar, initargs=(melhores, parar)) as pool:
+        futuros = [pool.submit(_sintetizar, i, limites[tipo], args, opcoes) for i, tipo in enumerate(TIPOS_COMPARADOS)]
+        while wait(futuros, timeout=0.2).not_done:
+            if cancelamento is not None and cancelamento.is_set():
+                parar[:] = [1]*len(TIPOS_COMPARADOS)
+        resultados = [futuro.result() for futuro in futuros]
+
+    tabela = []
+    for tipo, resultado in zip(TIPOS_COMPARADOS, resultados):
+        _, erro_max, folga = resumo(tipo, resultado.x, thetaI, thetaOd, lb, rb)
+        situacao = 'cancelado' if resultado.cancelado else 'parado cedo' if resultado.parou_cedo else 'concluído'
+        tabela.append({'tipo': tipo, 'erro': float(resultado.fun), 'erro_max': erro_max, 'folga_mi': folga,
+                       'viavel': folga >= 0, 'x': resultado.x, 'nit': resultado.nit,
+                       'tempo': resultado.tempo, 'situacao': situacao})
+    tabela.sort(key=lambda linha: (not linha['viavel'], linha['erro']))
+    return tabela
@@ -0,0 +1,105 @@
+"""Síntese em duas etapas para Watt 1 e Stephenson 1.
+
+Nesses dois mecanismos o ângulo de saída depende só de parte do vetor de
+11 parâmetros:
+
+- Watt 1: thetaO = beta1 - lambda usa L1, L2, L3, L4, phi e lambda;
+- Stephenson 1: thetaO = ksi - lambda1 usa L1, L3, L4, L5, phi e lambda1.
+
+Os demais elos e o ângulo alpha só entram no ângulo de transmissão mi2.
+A etapa 1 ajusta o subvetor que carrega o erro (6 dimensões, com a
+restrição de mi1); a etapa 2 é uma busca de viabilidade nos 5 parâmetros
+restantes, que maximiza a folga de mi2 em relação a [lb, rb].
+"""
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from .objetivos import _cinematica_S1_vet, _cinematica_W1_vet, _fobj_vet, funcx_S1, funcx_W1
+
+
+# Índices do vetor de 11 parâmetros (L1, L2, L3, L4, L5, L6, L8, L9, phi, alpha, lambda) de cada etapa
+PARTICOES = {
+    'W1': ((0, 1, 2, 3, 8, 10), (4, 5, 6, 7, 9)),
+    'S1': ((0, 2, 3, 4, 8, 10), (1, 5, 6, 7, 9)),
+}
+
+_CINEMATICA = {'W1': _cinematica_W1_vet, 'S1': _cinematica_S1_vet}
+_OBJETIVO = {'W1': funcx_W1, 'S1': funcx_S1}
+
+
+def montar_vetor(TipoDeMec, q, r):
+    """Junta o subvetor da etapa 1 (`q`) e o da etapa 2 (`r`) no vetor de 11 parâmetros.
+
+    `q` e `r` podem ser vetores ou matrizes (k, S), como no DE vetorizado.
+    """
+
+    indices1, indices2 = PARTICOES[TipoDeMec]
+    q = np.reshape(q, (len(indices1), -1))
+    r = np.reshape(r, (len(indices2), -1))
+    p = np.empty((11, max(q.shape[1], r.shape[1])))
+    p[list(indices1)] = q
+    p[list(indices2)] = r
+    return p
+
+
+def funcx_etapa1_vet(q, TipoDeMec, thetaI, thetaOd, n, lb, rb):
+    """Etapa 1 (vetorizada): erro quadrático de thetaO com a restrição de mi1 apenas."""
+
+    # Os parâmetros da etapa 2 não afetam thetaO nem mi1; NaN neles só contamina mi2, que é ignorado
+    p = montar_vetor(TipoDeMec, q, np.full(len(PARTICOES[TipoDeMec][1]), np.nan))
+    thetaO, mi1, _ = _CINEMATICA[TipoDeMec](p, thetaI, n)
+    return _fobj_vet(thetaO, mi1, mi1, thetaOd, lb, rb)
+
+
+def funcx_etapa1(q, TipoDeMec, thetaI, thetaOd, n, lb, rb):
+    """Etapa 1 para um único candidato (modo com `workers`)."""
+
+    return float(funcx_etapa1_vet(q, TipoDeMec, thetaI, thetaOd, n, lb, rb)[0])
+
+
+def violacao_etapa2_vet(r, TipoDeMec, q, thetaI, n, lb, rb):
+    """Etapa 2 (vetorizada): pior violação de lb <= mi2 <= rb entre os pontos de precisão.
+
+    Valor negativo significa viável, com folga igual ao módulo (rad).
+    Onde mi2 é indeterminado, retorna pi.
+    """
+
+    thetaO, mi1, mi2 = _CINEMATICA[TipoDeMec](montar_vetor(TipoDeMec, q, r), thetaI, n)
+    violacao = np.maximum(lb - mi2, mi2 - rb)
+    violacao = np.where(np.isfinite(violacao), violacao, np.pi)
+    return np.max(violacao, axis=1)
+
+
+def violacao_etapa2(r, TipoDeMec, q, thetaI, n, lb, rb):
+    """Etapa 2 para um único candidato (modo com `workers`)."""
+
+    return float(violacao_etapa2_vet(r, TipoDeMec, q, thetaI, n, lb, rb)[0])
+
+
+def sintetizar_duas_etapas(TipoDeMec, executar, bounds, args):
+    """Otimiza `TipoDeMec` ('W1' ou 'S1') em duas etapas.
+
+    executar(funcao, funcao_vet, bounds, args): roda a evolução
+    diferencial e retorna um `OptimizeResult` (ex.: `App.executar_DE`).
+    bounds: limites dos 11 parâmetros; args: (thetaI, thetaOd, n, lb, rb).
+
+    Retorna um `OptimizeResult` com o vetor completo em `x`, a função
+    objetivo original em `fun`, o total de avaliações das duas etapas em
+    `nfev` e `viavel` indicando se a etapa 2 encontrou mi2 dentro dos
+    limites. Se não encontrou, quem chama pode recorrer à otimização
+    completa.
+    """
+
+    thetaI, thetaOd, n, lb, rb = args
+    indices1, indices2 = PARTICOES[TipoDeMec]
+
+    etapa1 = executar(funcx_etapa1, funcx_etapa1_vet, [bounds[i] for i in indices1], (TipoDeMec, thetaI, thetaOd, n, lb, rb))
+    etapa2 = executar(violacao_etapa2, violacao_etapa2_vet, [bounds[i] for i in indices2], (TipoDeMec, etapa1.x, thetaI, n, lb, rb))
+
+    x = montar_vetor(TipoDeMec, etapa1.x, etapa2.x)[:, 0]
+    return OptimizeResult(x=x, fun=_OBJETIVO[TipoDeMec](x, thetaI, thetaOd, n, lb, rb),
+                          nfev=etapa1.nfev + etapa2.nfev, nit=etapa1.nit + etapa2.nit,
+                          success=etapa1.success and etapa2.fun <= 0, viavel=etapa2.fun <= 0,
+                          folga_mi2=-etapa2.fun, etapa1=etapa1, etapa2=etapa2,
+                          message="Síntese em duas etapas")
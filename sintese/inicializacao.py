@@ -0,0 +1,90 @@
+"""População inicial da evolução diferencial.
+
+O DE começa espalhado pelos limites largos das variáveis (elos de 5 a
+100, ângulos em toda a volta), onde poucos candidatos são viáveis. Aqui
+a população inicial é:
+
+- quase-aleatória: hipercubo latino (o padrão do scipy) ou sequência de
+  Sobol embaralhada, que cobre o espaço de forma mais uniforme;
+- semeada com vetores conhecidos (projetos anteriores ou digitados pelo
+  usuário), que substituem os primeiros membros. Um projeto viável para
+  outros ângulos de saída com os mesmos ângulos de entrada costuma ser
+  viável também para o problema novo, e a estratégia 'randtobest1bin'
+  puxa a população para perto dele desde a primeira geração.
+
+A população sai em unidades dos parâmetros, pronta para o `init` do
+scipy e dos motores de `motores`.
+"""
+
+import math
+import re
+
+import numpy as np
+from scipy.stats import qmc
+
+
+METODOS = ('latinhypercube', 'sobol')
+
+
+def populacao_inicial(bounds, tamanho, metodo='latinhypercube', vetores=(), rng=None):
+    """Matriz (tamanho, N) com a população inicial em unidades dos parâmetros.
+
+    metodo: 'latinhypercube' ou 'sobol'.
+    vetores: vetores de N parâmetros injetados no lugar dos primeiros
+    membros (no máximo metade da população). Ângulos fora dos limites
+    são trazidos para dentro somando voltas inteiras; o que ainda ficar
+    fora é cortado no limite.
+    """
+
+    if metodo not in METODOS:
+        raise ValueError(f"método de inicialização desconhecido: {metodo}")
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    N = len(limites)
+    rng = np.random.default_rng(rng)
+
+    if metodo == 'sobol':
+        # Sobol equilibrado em potências de 2: sorteia o bloco seguinte e usa o começo dele
+        amostra = qmc.Sobol(d=N, scramble=True, seed=rng).random_base2(max(1, math.ceil(math.log2(tamanho))))[:tamanho]
+    else:
+        amostra = qmc.LatinHypercube(d=N, seed=rng).random(tamanho)
+    populacao = lo + amostra*(hi - lo)
+
+    vetores = np.asarray(vetores, dtype=float).reshape(-1, N)[:tamanho//2]
+    if len(vetores):
+        populacao[:len(vetores)] = ajustar_aos_limites(vetores, bounds)
+    return populacao
+
+
+def ajustar_aos_limites(vetores, bounds):
+    """Traz os vetores (M, N) para dentro de `bounds`.
+
+    Nos ângulos (as três últimas variáveis), soma voltas inteiras antes de
+    cortar, pois phi e phi + 2pi descrevem o mesmo mecanismo.
+    """
+
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    vetores = np.array(vetores, dtype=float, ndmin=2)
+    angulos = vetores[:, 8:]
+    vetores[:, 8:] = lo[8:] + np.mod(angulos - lo[8:], 2*np.pi)
+    return np.clip(vetores, lo, hi)
+
+
+def ler_vetores(texto):
+    """Vetores de 11 parâmetros digitados (L1 ... L9, phi, alfa, lambda em graus).
+
+    Os números de cada vetor vão separados por espaço, ',' ou ';', e os
+    vetores, por '|' ou quebra de linha. Retorna uma lista de vetores com
+    os ângulos em radianos.
+    """
+
+    vetores = []
+    for trecho in re.split(r'[|\n]+', texto or ''):
+        numeros = [float(v) for v in re.split(r'[\s;,]+', trecho.strip()) if v]
+        if not numeros:
+            continue
+        if len(numeros) != 11:
+            raise ValueError(f"cada vetor inicial precisa de 11 valores (L1 ... lambda), não {len(numeros)}")
+        vetores.append(numeros[:8] + [math.radians(v) for v in numeros[8:]])
+    return vetores
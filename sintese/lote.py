@@ -0,0 +1,317 @@
+"""Execução em lote, sem interface gráfica, de arquivos de tarefas de síntese.
+
+Uso:
+
+    python -m sintese.lote tarefas.csv -o resultados.csv [--processos 8]
+
+O arquivo de tarefas é CSV (uma tarefa por linha) ou JSON (lista de
+objetos, ou {"tarefas": [...]}). Campos de cada tarefa:
+
+- tipo: W1, W2, S1, S2 ou S3 (ou "Watt 1", ..., "Stephenson 3");
+- entrada, saida: ângulos de entrada e de saída desejados (graus). No
+  CSV, separados por espaço ou ';', como nas Configurações da interface;
+- delta_mi: limite do ângulo de transmissão, 90 +- delta_mi (padrão 50);
+- limites_inferiores, limites_superiores: 11 valores (L1, L2, L3, L4, L5,
+  L6, L8, L9 e phi, alfa, lambda em graus). Padrão: elos de 5 a 100 e
+  ângulos de 0 a 360;
+- modo: completo (padrão), duas_etapas (só W1 e S1) ou normalizado;
+- polimento: scipy (padrão, o polimento do próprio DE) ou
+  minimos_quadrados (`refinamento.refinar` sobre o resultado final);
+- restricoes: penalidade (padrão, a penalidade fixa das funções objetivo)
+  ou graduadas (`objetivos.OBJETIVOS_GRADUADOS`, só no modo completo);
+- tolerancia_alvo, margem_mi: com tolerancia_alvo (graus), o DE para
+  assim que o melhor vetor erra no máximo isso em todos os pontos, com
+  mi1/mi2 a pelo menos margem_mi graus dos limites (padrão 0;
+  `parada.AlvoAtingido`, só no modo completo);
+- tempo_max, avaliacoes_max: orçamento da tarefa em segundos de relógio
+  e/ou em avaliações da função objetivo (`parada.Orcamento`). Com
+  orçamento e sem maxiter na tarefa, o número de gerações fica livre. O
+  uso sai na coluna orcamento;
+- reinicios: número máximo de reinícios IPOP (padrão 0, sem reinícios).
+  Quando o DE estagna ou converge antes do maxiter, recomeça com o dobro
+  da população, guardando os melhores vetores (`motores.de_reinicios`);
+- inicializacao: latinhypercube (padrão) ou sobol, a população inicial
+  do DE (`inicializacao.populacao_inicial`);
+- vetores_iniciais: vetores de 11 parâmetros (L1 ... L9, phi, alfa,
+  lambda em graus) semeados na população inicial, separados por '|'.
+  Só no modo completo;
+- tol, atol, maxiter, popsize, strategy, mutation, recombination, seed:
+  configurações do `differential_evolution` (padrões da interface).
+  strategy jade, shade ou lshade (ou JADE, SHADE, L-SHADE) troca o DE do
+  scipy por `motores.de_adaptativo`, que aprende F e CR sozinho (mutation
+  e recombination são ignorados);
+- id: identificador livre (padrão: número da linha).
+
+As tarefas rodam em paralelo, uma por processo, cada uma com o DE
+vetorizado. Cada resultado é gravado no arquivo de saída assim que sai
+(CSV, ou JSON Lines se a extensão for .jsonl). Uma tarefa com erro gera
+uma linha com a mensagem e não interrompe o lote.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy.optimize import differential_evolution
+
+from . import decomposicao, inicializacao, motores, normalizacao, parada, refinamento
+from .cinematica import Parametros, posicao
+from .objetivos import OBJETIVOS, OBJETIVOS_GRADUADOS
+
+
+NOMES = {'Watt 1': 'W1', 'Watt 2': 'W2', 'Stephenson 1': 'S1', 'Stephenson 2': 'S2', 'Stephenson 3': 'S3'}
+MODOS = ('completo', 'duas_etapas', 'normalizado')
+POLIMENTOS = ('scipy', 'minimos_quadrados')
+RESTRICOES = ('penalidade', 'graduadas')
+LIMITES_PADRAO = [[5, 100]]*8 + [[0, 360]]*3          # elos e ângulos (graus)
+PADROES_DE = {'tol': 1e-2, 'atol': 1e-4, 'maxiter': 2000, 'popsize': 15, 'strategy': 'randtobest1bin',
+              'mutation': (0.5, 1), 'recombination': 0.7, 'seed': None}
+PARAMETROS = ('L1', 'L2', 'L3', 'L4', 'L5', 'L6', 'L8', 'L9', 'phi', 'alpha', 'lambda')
+COLUNAS = ('id', 'tipo', 'modo', 'n', 'erro', 'erro_max', 'folga_mi', 'viavel') + PARAMETROS + \
+          ('thetaO', 'nit', 'nfev', 'tempo', 'orcamento', 'mensagem')
+
+
+def _numeros(valor):
+    """Lista de floats a partir de uma lista ou de um texto separado por espaço, ',' ou ';'."""
+
+    if valor is None or valor == '':
+        return None
+    if isinstance(valor, str):
+        return [float(v) for v in re.split(r'[\s;,]+', valor.strip()) if v]
+    return [float(v) for v in np.atleast_1d(valor)]
+
+
+def ler_tarefas(caminho):
+    """Lê o arquivo de tarefas (CSV ou JSON) e retorna uma lista de dicionários."""
+
+    with open(caminho, encoding='utf-8') as arquivo:
+        if caminho.lower().endswith('.json'):
+            dados = json.load(arquivo)
+            tarefas = dados['tarefas'] if isinstance(dados, dict) else dados
+        else:
+            tarefas = list(csv.DictReader(arquivo))
+    for i, tarefa in enumerate(tarefas, start=1):
+        tarefa.setdefault('id', i)
+        if tarefa['id'] in (None, ''):
+            tarefa['id'] = i
+    return tarefas
+
+
+def preparar(tarefa):
+    """Converte uma tarefa lida do arquivo em (tipo, modo, restrições, bounds, args, opções do DE)."""
+
+    tipo = NOMES.get(str(tarefa['tipo']).strip(), str(tarefa['tipo']).strip())
+    if tipo not in OBJETIVOS:
+        raise ValueError(f"tipo de mecanismo desconhecido: {tarefa['tipo']}")
+    modo = (tarefa.get('modo') or 'completo').strip()
+    if modo not in MODOS or (modo == 'duas_etapas' and tipo not in decomposicao.PARTICOES):
+        raise ValueError(f"modo inválido para {tipo}: {modo}")
+    restricoes = (tarefa.get('restricoes') or 'penalidade').strip()
+    if restricoes not in RESTRICOES or (restricoes == 'graduadas' and modo != 'completo'):
+        raise ValueError(f"restricoes inválidas para o modo {modo}: {restricoes}")
+
+    thetaI = np.radians(_numeros(tarefa['entrada']))
+    thetaOd = np.radians(_numeros(tarefa['saida']))
+    if len(thetaI) != len(thetaOd) or len(thetaI) == 0:
+        raise ValueError("entrada e saida precisam ter o mesmo número (> 0) de ângulos")
+    delta_mi = (_numeros(tarefa.get('delta_mi')) or [50])[0]
+    lb, rb = math.radians(90 - delta_mi), math.radians(90 + delta_mi)
+
+    inferiores = _numeros(tarefa.get('limites_inferiores')) or [lo for lo, _ in LIMITES_PADRAO]
+    superiores = _numeros(tarefa.get('limites_superiores')) or [hi for _, hi in LIMITES_PADRAO]
+    if len(inferiores) != 11 or len(superiores) != 11:
+        raise ValueError("os limites precisam de 11 valores")
+    bounds = [[lo, hi] if i < 8 else [math.radians(lo), math.radians(hi)]
+              for i, (lo, hi) in enumerate(zip(inferiores, superiores))]
+
+    polimento = (tarefa.get('polimento') or 'scipy').strip()
+    if polimento not in POLIMENTOS:
+        raise ValueError(f"polimento inválido: {polimento}")
+
+    opcoes = dict(PADROES_DE, polish=polimento == 'scipy')
+    for chave in PADROES_DE:
+        valor = tarefa.get(chave)
+        if valor in (None, ''):
+            continue
+        if chave == 'strategy':
+            opcoes[chave] = str(valor).strip()
+        elif chave == 'mutation':
+            numeros = _numeros(valor)
+            opcoes[chave] = tuple(numeros) if len(numeros) == 2 else numeros[0]
+        elif chave in ('maxiter', 'popsize', 'seed'):
+            opcoes[chave] = int(float(valor))
+        else:
+            opcoes[chave] = float(valor)
+
+    criterios = parada.Criterios()
+    tolerancia = _numeros(tarefa.get('tolerancia_alvo'))
+    if tolerancia:
+        if modo != 'completo':
+            raise ValueError(f"tolerancia_alvo só vale no modo completo, não em {modo}")
+        margem = (_numeros(tarefa.get('margem_mi')) or [parada.MARGEM_PADRAO])[0]
+        criterios.append(parada.AlvoAtingido(tipo, (thetaI, thetaOd, len(thetaI), lb, rb), tolerancia[0], margem))
+    segundos = _numeros(tarefa.get('tempo_max'))
+    avaliacoes = _numeros(tarefa.get('avaliacoes_max'))
+    if segundos or avaliacoes:
+        criterios.append(parada.Orcamento(segundos[0] if segundos else None, int(avaliacoes[0]) if avaliacoes else None))
+        if tarefa.get('maxiter') in (None, ''):
+            opcoes['maxiter'] = parada.MAXITER_ORCAMENTO
+    if criterios:
+        opcoes['callback'] = criterios
+
+    return tipo, modo, restricoes, bounds, (thetaI, thetaOd, len(thetaI), lb, rb), opcoes
+
+
+def resumo(TipoDeMec, x, thetaI, thetaOd, lb, rb):
+    """Ângulos de saída, maior erro (graus) e folga do ângulo de transmissão (graus) de um vetor `x`.
+
+    A folga é a menor distância de mi1 e mi2 aos limites [lb, rb] nos
+    pontos de precisão; negativa quando algum ponto viola os limites.
+    Pontos em que o mecanismo não monta dão thetaO NaN e folga -inf.
+    """
+
+    par = Parametros._make(np.asarray(x, dtype=float))
+    thetaO, folgas = [], []
+    for AngE in thetaI:
+        try:
+            *_, mi1, mi2, theta = posicao(TipoDeMec, par, AngE)
+        except (ValueError, ZeroDivisionError):
+            thetaO.append(math.nan)
+            folgas.append(-math.inf)
+            continue
+        thetaO.append(theta)
+        folgas.append(min(mi1 - lb, rb - mi1, mi2 - lb, rb - mi2))
+    thetaO = np.array(thetaO)
+    erro = np.abs(np.angle(np.exp(1j*(thetaO - np.asarray(thetaOd)))))
+    return np.degrees(thetaO), float(np.degrees(np.max(erro))), float(np.degrees(min(folgas)))
+
+
+def executar_tarefa(tarefa):
+    """Roda uma tarefa e retorna a linha de resultado (executa no processo de trabalho)."""
+
+    linha = {'id': tarefa.get('id'), 'tipo': tarefa.get('tipo'), 'modo': tarefa.get('modo') or 'completo'}
+    inicio = time.perf_counter()
+    try:
+        tipo, modo, restricoes, bounds, args, opcoes = preparar(tarefa)
+        reinicios = int(float(tarefa.get('reinicios') or 0))
+        metodo = (tarefa.get('inicializacao') or 'latinhypercube').strip()
+        vetores = inicializacao.ler_vetores(tarefa.get('vetores_iniciais'))
+        if metodo not in inicializacao.METODOS:
+            raise ValueError(f"inicializacao inválida: {metodo}")
+        if vetores and modo != 'completo':
+            raise ValueError(f"vetores_iniciais só valem no modo completo, não em {modo}")
+
+        variante = motores.variante_adaptativa(opcoes['strategy'])
+
+        def de(funcao_vet, bounds, args, **opcoes_de):
+            # Uma execução do DE: a do scipy ou, com strategy jade/shade/lshade, `motores.de_adaptativo`
+            if variante is None:
+                return differential_evolution(funcao_vet, bounds, args=args, vectorized=True, updating='deferred',
+                                              **opcoes_de)
+            for chave in ('strategy', 'mutation', 'recombination'):
+                opcoes_de.pop(chave, None)
+            orcamento = next((c for c in opcoes.get('callback', ()) if isinstance(c, parada.Orcamento)), None)
+            return motores.de_adaptativo(funcao_vet, bounds, args=args, variante=variante, orcamento=orcamento,
+                                         **opcoes_de)
+
+        def executar(funcao, funcao_vet, bounds, args):
+            if metodo == 'latinhypercube' and not vetores and not reinicios:
+                return de(funcao_vet, bounds, args, **opcoes)
+            rng = np.random.default_rng(opcoes['seed'])
+            tamanho = opcoes['popsize']*len(bounds)
+            if not reinicios:
+                init = inicializacao.populacao_inicial(bounds, tamanho, metodo, vetores, rng)
+                return de(funcao_vet, bounds, args, **dict(opcoes, init=init, seed=rng))
+            fixas = {chave: valor for chave, valor in opcoes.items()
+                     if chave not in ('popsize', 'maxiter', 'callback', 'polish', 'seed')}
+
+            def execucao(popsize, init, maxiter, callback):
+                return de(funcao_vet, bounds, args, popsize=popsize, init=init, maxiter=maxiter, callback=callback,
+                          polish=False, seed=rng, **fixas)
+            init = inicializacao.populacao_inicial(bounds, tamanho, metodo, vetores, rng) if vetores else metodo
+            return motores.de_reinicios(execucao, funcao_vet, bounds, args, popsize=opcoes['popsize'],
+                                        reinicios=reinicios, maxiter=opcoes['maxiter'],
+                                        callback=opcoes.get('callback'), polish=opcoes['polish'], seed=rng,
+                                        init=init)
+
+        if modo == 'duas_etapas':
+            resultado = decomposicao.sintetizar_duas_etapas(tipo, executar, bounds, args)
+        elif modo == 'normalizado':
+            resultado = normalizacao.sintetizar_normalizado(tipo, executar, bounds, args)
+        elif restricoes == 'graduadas':
+            resultado = executar(*OBJETIVOS_GRADUADOS[tipo], bounds, args)
+            # Energia na mesma escala das outras linhas (e do refinamento)
+            resultado.fun = OBJETIVOS[tipo][0](resultado.x, *args)
+        else:
+            resultado = executar(*OBJETIVOS[tipo], bounds, args)
+        if not opcoes['polish']:
+            resultado = refinamento.refinar(tipo, resultado, bounds, args)
+
+        thetaI, thetaOd, n, lb, rb = args
+        thetaO, erro_max, folga = resumo(tipo, resultado.x, thetaI, thetaOd, lb, rb)
+        mensagem = str(resultado.message)
+        for criterio in opcoes.get('callback', ()):
+            if isinstance(criterio, parada.AlvoAtingido) and criterio.atingido:
+                mensagem = f"alvo atingido na geração {criterio.nit}"
+            elif isinstance(criterio, parada.Orcamento):
+                linha['orcamento'] = criterio.relatorio()
+        if resultado.get('reinicios'):
+            mensagem += f" ({resultado.reinicios} reinícios, populações {' '.join(map(str, resultado.populacoes))})"
+        linha.update(tipo=tipo, n=n, erro=float(resultado.fun), erro_max=erro_max, folga_mi=folga,
+                     viavel=folga >= 0, thetaO=' '.join(f"{t:.3f}" for t in thetaO),
+                     nit=resultado.nit, nfev=resultado.nfev, mensagem=mensagem)
+        for i, (nome, valor) in enumerate(zip(PARAMETROS, resultado.x)):
+            linha[nome] = float(valor if i < 8 else math.degrees(valor))
+    except Exception as e:
+        linha['mensagem'] = f"erro: {e}"
+    linha['tempo'] = round(time.perf_counter() - inicio, 3)
+    return linha
+
+
+def executar_lote(tarefas, saida, processos=None):
+    """Executa `tarefas` em paralelo e grava cada resultado em `saida` assim que termina.
+
+    Retorna o número de tarefas concluídas sem erro.
+    """
+
+    jsonl = saida.lower().endswith('.jsonl')
+    concluidas = 0
+    with open(saida, 'w', newline='', encoding='utf-8') as arquivo:
+        if not jsonl:
+            escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS)
+            escritor.writeheader()
+        with ProcessPoolExecutor(processos) as pool:
+            for futuro in as_completed([pool.submit(executar_tarefa, tarefa) for tarefa in tarefas]):
+                linha = futuro.result()
+                if jsonl:
+                    arquivo.write(json.dumps(linha, ensure_ascii=False) + '\n')
+                else:
+                    escritor.writerow(linha)
+                arquivo.flush()
+                concluidas += not str(linha.get('mensagem', '')).startswith('erro')
+                print(f"[{linha['id']}] {linha['tipo']}: {linha.get('mensagem')} ({linha['tempo']} s)", file=sys.stderr)
+    return concluidas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sintese.lote', description="Síntese em lote de mecanismos de seis barras, sem interface gráfica.")
+    parser.add_argument('tarefas', help="arquivo de tarefas (.csv ou .json)")
+    parser.add_argument('-o', '--saida', default='resultados.csv', help="arquivo de resultados (.csv ou .jsonl)")
+    parser.add_argument('-p', '--processos', type=int, default=os.cpu_count(), help="tarefas simultâneas (padrão: núcleos)")
+    opcoes = parser.parse_args(argv)
+
+    tarefas = ler_tarefas(opcoes.tarefas)
+    concluidas = executar_lote(tarefas, opcoes.saida, opcoes.processos)
+    print(f"{concluidas}/{len(tarefas)} tarefas concluídas; resultados em {opcoes.saida}", file=sys.stderr)
+    return 0 if concluidas == len(tarefas) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
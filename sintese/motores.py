@@ -0,0 +1,693 @@
+"""Motores de evolução diferencial alternativos ao `scipy.optimize.differential_evolution`.
+
+- `de_assincrono`: DE em regime permanente (steady-state) e assíncrono.
+  Não há barreira entre gerações: cada vetor-teste é enviado a um
+  processo assim que um núcleo fica livre, e o resultado substitui o
+  alvo na população assim que chega. Útil quando o custo da função
+  objetivo varia muito entre candidatos (ex.: Stephenson 2).
+- `de_ilhas`: modelo de ilhas. Várias populações independentes, cada
+  uma com uma das estratégias do scipy, evoluem em processos separados
+  e trocam seus melhores indivíduos a cada `migracao` gerações.
+- `de_abandono`: DE vetorizado por gerações que passa a energia de cada
+  alvo como limite para a avaliação do seu vetor-teste, permitindo à
+  função objetivo abandonar cedo os testes que já perderam
+  (`objetivos.ObjetivoComLimite`).
+- `de_adaptativo`: DE autoadaptativo (JADE, SHADE e L-SHADE), com
+  mutação current-to-pbest/1, arquivo externo de pais substituídos, F e
+  CR aprendidos dos vetores-teste bem-sucedidos e, no L-SHADE, redução
+  linear do tamanho da população.
+- `de_reinicios`: reinícios no estilo IPOP sobre qualquer um dos
+  motores (ou o do scipy). Quando a busca estagna
+  (`parada.Estagnacao`), recomeça com a população maior, guardando os
+  melhores vetores de todas as execuções num arquivo de elite.
+
+As funções seguem a convenção do scipy (`funcao(x, *args)`, `bounds`,
+`popsize` multiplicado pelo número de variáveis, `init` aceitando uma
+população inicial, `callback(intermediate_result)` que interrompe a
+busca se retornar True) e retornam um `OptimizeResult`.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+from scipy.optimize import OptimizeResult, minimize
+from scipy.stats import qmc
+
+from .inicializacao import populacao_inicial
+from .parada import Estagnacao
+from .paralelo import PoolPersistente
+
+
+# Variantes de `de_adaptativo`: (memória H, fração p dos melhores, tamanho do arquivo / população)
+VARIANTES_ADAPTATIVAS = {
+    'jade': (1, 0.05, 1.0),
+    'shade': (6, 0.11, 1.0),
+    'lshade': (6, 0.11, 2.6),
+}
+POPULACAO_MINIMA = 4    # população final do L-SHADE
+
+# Estratégias das ilhas, na ordem de uso (todas disponíveis na caixa de estratégias da interface)
+ESTRATEGIAS_ILHAS = ('randtobest1bin', 'best1bin', 'currenttobest1bin', 'rand1bin', 'best2bin', 'rand2bin',
+                     'randtobest1exp', 'best1exp')
+
+
+def _vetor_teste(populacao, energias, alvo, F, CR, rng):
+    """Vetor-teste 'randtobest1bin' (mesma estratégia usada na interface), no cubo unitário."""
+
+    S, N = populacao.shape
+    r0, r1, r2 = rng.choice(np.delete(np.arange(S), alvo), 3, replace=False)
+    melhor = populacao[np.argmin(energias)]
+    mutante = populacao[r0] + F*(melhor - populacao[r0]) + F*(populacao[r1] - populacao[r2])
+
+    cruza = rng.random(N) < CR
+    cruza[rng.integers(N)] = True
+    teste = np.where(cruza, mutante, populacao[alvo])
+
+    # Como no scipy: coordenadas fora dos limites são sorteadas de novo
+    fora = (teste < 0) | (teste > 1)
+    teste[fora] = rng.random(np.count_nonzero(fora))
+    return teste
+
+
+# Diferenças usadas por cada mutação do scipy: (base, número de vetores sorteados)
+_MUTACOES = {'best1': 2, 'rand1': 3, 'randtobest1': 3, 'currenttobest1': 2, 'best2': 4, 'rand2': 5}
+
+
+def _vetores_teste(populacao, energias, F, CR, rng, estrategia='randtobest1bin'):
+    """Vetores-teste da população inteira de uma vez, no cubo unitário.
+
+    `estrategia` é qualquer uma das do scipy (mutação em `_MUTACOES` mais
+    cruzamento 'bin' ou 'exp'); o padrão é a 'randtobest1bin' usada na
+    interface. Os vetores sorteados são distintos entre si e do alvo.
+    """
+
+    S, N = populacao.shape
+    mutacao, cruzamento = estrategia[:-3], estrategia[-3:]
+    if mutacao not in _MUTACOES or cruzamento not in ('bin', 'exp'):
+        raise ValueError(f"estratégia desconhecida: {estrategia}")
+    k = _MUTACOES[mutacao]
+    sorteio = rng.random((S, S))
+    np.fill_diagonal(sorteio, np.inf)
+    r = populacao[np.argpartition(sorteio, k - 1, axis=1)[:, :k].T]     # k índices distintos, nenhum igual ao alvo
+    melhor = populacao[np.argmin(energias)]
+    if mutacao == 'best1':
+        mutante = melhor + F*(r[0] - r[1])
+    elif mutacao == 'rand1':
+        mutante = r[0] + F*(r[1] - r[2])
+    elif mutacao == 'randtobest1':
+        mutante = r[0] + F*(melhor - r[0]) + F*(r[1] - r[2])
+    elif mutacao == 'currenttobest1':
+        mutante = populacao + F*(melhor - populacao) + F*(r[0] - r[1])
+    elif mutacao == 'best2':
+        mutante = melhor + F*(r[0] + r[1] - r[2] - r[3])
+    else:
+        mutante = r[0] + F*(r[1] + r[2] - r[3] - r[4])
+
+    if cruzamento == 'bin':
+        cruza = rng.random((S, N)) < CR
+        cruza[np.arange(S), rng.integers(N, size=S)] = True
+    else:
+        # 'exp': um bloco circular de L coordenadas a partir de uma posição sorteada
+        sucessos = rng.random((S, N)) < CR
+        sucessos[:, 0] = True
+        L = np.cumprod(sucessos, axis=1).sum(axis=1)
+        cruza = np.zeros((S, N), dtype=bool)
+        colunas = (rng.integers(N, size=S)[:, None] + np.arange(N)) % N
+        np.put_along_axis(cruza, colunas, np.arange(N) < L[:, None], axis=1)
+    testes = np.where(cruza, mutante, populacao)
+
+    fora = (testes < 0) | (testes > 1)
+    testes[fora] = rng.random(np.count_nonzero(fora))
+    return testes
+
+
+def _escalar(funcao_vet):
+    """`funcao(x, *args)` de um único vetor a partir da função vetorizada (para o polimento)."""
+
+    return lambda x, *args: float(funcao_vet(x[:, None], *args)[0])
+
+
+def _finalizar(populacao, energias, nfev, nit, mensagem, funcao, bounds, args, polish, **extras):
+    """`OptimizeResult` final de um motor, com o melhor de `populacao` (unidades dos parâmetros).
+
+    `extras` entra no resultado por cima dos campos padrão. Com `polish`
+    (e se a busca não foi interrompida pelo callback), roda um L-BFGS-B
+    com `funcao(x, *args)` a partir do melhor vetor, como o scipy.
+    """
+
+    melhor = np.argmin(energias)
+    resultado = OptimizeResult(x=populacao[melhor], fun=energias[melhor], nfev=nfev, nit=nit,
+                               success=mensagem.startswith("Otimização"), message=mensagem,
+                               population=populacao, population_energies=energias)
+    resultado.update(extras)
+
+    if polish and mensagem != "Interrompido pelo callback.":
+        refinado = minimize(funcao, resultado.x, args=args, method='L-BFGS-B', bounds=np.asarray(bounds, dtype=float))
+        resultado.nfev += refinado.nfev
+        if refinado.fun < resultado.fun:
+            resultado.x, resultado.fun = refinado.x, float(refinado.fun)
+
+    return resultado
+
+
+def de_assincrono(funcao, bounds, args=(), popsize=15, mutation=(0.5, 1), recombination=0.7,
+                  tol=0.01, atol=0, maxiter=1000, workers=-1, callback=None, polish=True, seed=None,
+                  init='latinhypercube'):
+    """Evolução diferencial assíncrona em regime permanente.
+
+    Mantém sempre cerca de dois lotes por processo em andamento. Cada lote
+    tem poucos vetores-teste (de 1 a 4, conforme o tamanho da população),
+    o que amortiza a comunicação entre processos nas funções baratas sem
+    recriar a barreira de geração. O melhor indivíduo usado na mutação é
+    sempre o atual.
+
+    Uma "geração" equivale a S = `popsize * N` vetores-teste concluídos: é a
+    unidade de `maxiter`, do critério de parada do scipy
+    (std(energias) <= atol + tol*|média|) e da chamada de `callback`,
+    que recebe um `OptimizeResult` com o melhor vetor, a população e as
+    energias, como no scipy.
+
+    workers: número de processos (-1 = todos os núcleos) ou um
+    `paralelo.PoolPersistente` já criado, que é reaproveitado e não é
+    encerrado ao fim. init: 'latinhypercube' ou uma população (S, N) em
+    unidades dos parâmetros (ex.: de um checkpoint), que define S.
+    """
+
+    rng = np.random.default_rng(seed)
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    N = len(limites)
+
+    def escala(u):
+        return lo + u*(hi - lo)
+
+    if isinstance(init, str):
+        populacao = qmc.LatinHypercube(d=N, seed=rng).random(popsize*N)
+    else:
+        populacao = np.clip((np.asarray(init, dtype=float) - lo)/(hi - lo), 0, 1)
+    S = len(populacao)
+    nfev, nit, parou = 0, 0, False
+    mensagem = "Número máximo de gerações atingido."
+
+    pool = workers if isinstance(workers, PoolPersistente) else PoolPersistente(workers)
+    lote = max(1, min(4, S//(4*pool.processos)))
+
+    em_voo = {}                 # futuro -> (alvos, vetores-teste)
+    inicio = []
+    problema = pool.carregar(funcao, args)
+    try:
+        inicio = [problema.submeter(escala(populacao[k:k+lote])) for k in range(0, S, lote)]
+        energias = np.array([e for futuro in inicio for e in futuro.result()], dtype=float)
+        nfev += S
+
+        ocupados = set()
+        proximo = 0
+        concluidos = 0
+
+        def enviar():
+            nonlocal proximo
+            alvos, testes = [], []
+            while len(alvos) < lote and len(ocupados) < S:
+                while proximo in ocupados:
+                    proximo = (proximo + 1) % S
+                F = rng.uniform(*mutation) if np.size(mutation) == 2 else mutation
+                testes.append(_vetor_teste(populacao, energias, proximo, F, recombination, rng))
+                alvos.append(proximo)
+                ocupados.add(proximo)
+                proximo = (proximo + 1) % S
+            if alvos:
+                em_voo[problema.submeter(escala(np.array(testes)))] = (alvos, testes)
+
+        for _ in range(2*pool.processos):
+            enviar()
+
+        while em_voo and not parou:
+            prontos, _ = wait(em_voo, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                alvos, testes = em_voo.pop(futuro)
+                for alvo, teste, energia in zip(alvos, testes, futuro.result()):
+                    ocupados.discard(alvo)
+                    if energia <= energias[alvo]:
+                        populacao[alvo], energias[alvo] = teste, energia
+                nfev += len(alvos)
+                concluidos += len(alvos)
+
+                if concluidos >= S:
+                    concluidos -= S
+                    nit += 1
+                    media, desvio = np.mean(energias), np.std(energias)
+                    convergencia = tol/(desvio/abs(media)) if desvio > 0 and media != 0 else np.inf
+                    intermediario = OptimizeResult(x=escala(populacao[np.argmin(energias)]), fun=np.min(energias),
+                                                   nfev=nfev, nit=nit, convergence=convergencia,
+                                                   population=escala(populacao), population_energies=energias.copy())
+                    if callback is not None and callback(intermediate_result=intermediario):
+                        parou, mensagem = True, "Interrompido pelo callback."
+                    elif desvio <= atol + tol*abs(media):
+                        parou, mensagem = True, "Otimização concluída com sucesso."
+                    elif nit >= maxiter:
+                        parou = True
+                if not parou:
+                    enviar()
+    finally:
+        # Os lotes que já começaram ainda leem o problema da memória compartilhada: espera por eles antes de liberá-la
+        pendentes = list(em_voo) + inicio
+        for futuro in pendentes:
+            futuro.cancel()
+        wait(pendentes)
+        problema.liberar()
+        if pool is not workers:
+            pool.encerrar()
+
+    return _finalizar(escala(populacao), energias, nfev, nit, mensagem, funcao, bounds, args, polish)
+
+
+def _epoca_ilha(funcao_vet, bounds, args, populacao, energias, estrategia, geracoes, semente, opcoes):
+    """Evolui uma ilha por até `geracoes` gerações a partir de `populacao` (executa no processo de trabalho).
+
+    As energias vêm da época anterior; só são calculadas aqui quando
+    `energias` é None (primeira época). Para antes se a própria ilha
+    convergir pelo critério do scipy. Retorna população, energias,
+    gerações feitas e avaliações.
+    """
+
+    rng = np.random.default_rng(semente)
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    mutation, recombination, tol, atol = (opcoes[c] for c in ('mutation', 'recombination', 'tol', 'atol'))
+    populacao = np.clip((np.asarray(populacao, dtype=float) - lo)/(hi - lo), 0, 1)
+    S = len(populacao)
+
+    nfev = 0
+    if energias is None:
+        energias = np.asarray(funcao_vet((lo + populacao*(hi - lo)).T, *args), dtype=float)
+        nfev += S
+    energias = np.array(energias, dtype=float)
+    nit = 0
+    while nit < geracoes:
+        F = rng.uniform(*mutation) if np.size(mutation) == 2 else mutation
+        testes = _vetores_teste(populacao, energias, F, recombination, rng, estrategia)
+        energias_testes = np.asarray(funcao_vet((lo + testes*(hi - lo)).T, *args), dtype=float)
+        nfev += S
+        nit += 1
+        aceitos = energias_testes <= energias
+        populacao[aceitos], energias[aceitos] = testes[aceitos], energias_testes[aceitos]
+        if np.std(energias) <= atol + tol*abs(np.mean(energias)):
+            break
+    return lo + populacao*(hi - lo), energias, nit, nfev
+
+
+def de_ilhas(funcao_vet, bounds, args=(), estrategias=ESTRATEGIAS_ILHAS, ilhas=4, popsize=15, mutation=(0.5, 1),
+             recombination=0.7, tol=0.01, atol=0, maxiter=1000, migracao=20, migrantes=2, workers=-1,
+             callback=None, polish=True, seed=None, init='latinhypercube'):
+    """Evolução diferencial em ilhas com migração em anel.
+
+    Cada uma das `ilhas` populações (popsize * N indivíduos) usa a
+    estratégia `estrategias[i % len(estrategias)]` (qualquer uma do
+    scipy) e roda `migracao` gerações por época no seu processo, com a
+    função objetivo vetorizada e seleção ao fim de cada geração. As
+    energias passam de uma época para a outra junto com a população (e
+    com os migrantes), então cada indivíduo é avaliado uma única vez.
+    Entre épocas, os `migrantes` melhores de cada ilha substituem os
+    piores da ilha seguinte. Populações que estagnam numa ilha recebem
+    assim material novo sem perder a diversidade das demais.
+
+    maxiter conta gerações de cada ilha; `nit` soma, por época, as
+    gerações da ilha que mais andou (uma ilha que converge para antes do
+    fim da época). A parada segue o critério do scipy aplicado à união
+    das populações (std <= atol + tol*|média|);
+    `callback(intermediate_result)` é chamado ao fim de cada época, com a
+    união das populações, e interrompe a busca se retornar True. init:
+    'latinhypercube' ou uma população em unidades dos parâmetros (ex.: de
+    um checkpoint ou de `inicializacao.populacao_inicial`), completada com
+    hipercubo latino até ilhas * popsize * N indivíduos e dividida entre
+    as ilhas. O número de ilhas é reduzido, se preciso, para que cada uma
+    tenha os k + 1 indivíduos que a mutação da sua estratégia sorteia
+    (`_MUTACOES`); o usado vai em `ilhas` no resultado.
+
+    workers: número de processos (-1 = todos os núcleos) ou um
+    `paralelo.PoolPersistente` já criado.
+    """
+
+    rng = np.random.default_rng(seed)
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    N = len(limites)
+    if isinstance(init, str):
+        populacoes = [lo + qmc.LatinHypercube(d=N, seed=rng).random(popsize*N)*(hi - lo) for _ in range(ilhas)]
+    else:
+        populacao = np.asarray(init, dtype=float)
+        falta = ilhas*popsize*N - len(populacao)
+        if falta > 0:
+            populacao = np.concatenate([populacao, lo + qmc.LatinHypercube(d=N, seed=rng).random(falta)*(hi - lo)])
+        populacoes = [populacao]
+    populacao = np.concatenate(populacoes)
+    while ilhas > 1 and len(populacao)//ilhas < _minimo_ilhas(estrategias, ilhas):
+        ilhas -= 1
+    if len(populacao) < _minimo_ilhas(estrategias, ilhas):
+        raise ValueError(f"população de {len(populacao)} indivíduos pequena demais para {estrategias[0]}")
+    if len(populacoes) != ilhas:
+        populacoes = np.array_split(populacao, ilhas)
+    energias = [None]*ilhas
+    opcoes = dict(mutation=mutation, recombination=recombination, tol=tol, atol=atol)
+
+    pool = workers if isinstance(workers, PoolPersistente) else PoolPersistente(workers)
+    nfev, nit = 0, 0
+    mensagem = "Número máximo de gerações atingido."
+    try:
+        while nit < maxiter:
+            geracoes = min(migracao, maxiter - nit)
+            futuros = [pool.executor.submit(_epoca_ilha, funcao_vet, bounds, args, populacoes[i], energias[i],
+                                            estrategias[i % len(estrategias)], geracoes,
+                                            int(rng.integers(2**32)), opcoes)
+                       for i in range(ilhas)]
+            epocas = [futuro.result() for futuro in futuros]
+            populacoes = [np.array(p) for p, _, _, _ in epocas]
+            energias = [np.array(e) for _, e, _, _ in epocas]
+            nfev += sum(f for _, _, _, f in epocas)
+            nit += max(g for _, _, g, _ in epocas)
+
+            # Migração em anel: os melhores da ilha i entram no lugar dos piores da ilha i+1
+            elites = [(p[np.argsort(e)[:migrantes]], np.sort(e)[:migrantes]) for p, e in zip(populacoes, energias)]
+            for i, (elite, energia_elite) in enumerate(elites):
+                destino = (i + 1) % ilhas
+                piores = np.argsort(energias[destino])[-migrantes:]
+                populacoes[destino][piores] = elite
+                energias[destino][piores] = energia_elite
+
+            todas = np.concatenate(populacoes)
+            todas_energias = np.concatenate(energias)
+            media, desvio = np.mean(todas_energias), np.std(todas_energias)
+            convergencia = tol/(desvio/abs(media)) if desvio > 0 and media != 0 else np.inf
+            melhor = np.argmin(todas_energias)
+            intermediario = OptimizeResult(x=todas[melhor], fun=todas_energias[melhor], nfev=nfev, nit=nit,
+                                           convergence=convergencia, population=todas,
+                                           population_energies=todas_energias)
+            if callback is not None and callback(intermediate_result=intermediario):
+                mensagem = "Interrompido pelo callback."
+                break
+            if desvio <= atol + tol*abs(media):
+                mensagem = "Otimização concluída com sucesso."
+                break
+    finally:
+        if pool is not workers:
+            pool.encerrar()
+
+    return _finalizar(np.concatenate(populacoes), np.concatenate(energias), nfev, nit, mensagem,
+                      _escalar(funcao_vet), bounds, args, polish, ilhas=ilhas)
+
+
+def _minimo_ilhas(estrategias, ilhas):
+    """Menor população por ilha com que todas as `ilhas` sorteiam os vetores da sua mutação."""
+
+    return max(_MUTACOES[estrategias[i % len(estrategias)][:-3]] + 1 for i in range(ilhas))
+
+
+def de_abandono(funcao_vet, bounds, args=(), popsize=15, mutation=(0.5, 1), recombination=0.7, tol=0.01,
+                atol=0, maxiter=1000, callback=None, polish=True, seed=None, init='latinhypercube'):
+    """Evolução diferencial vetorizada com limite de energia por vetor-teste.
+
+    A cada geração, `funcao_vet(X, *args, limites=energias)` avalia todos
+    os vetores-teste (X é N x S, como com `vectorized=True` no scipy),
+    recebendo em `limites` a energia do alvo que cada um disputa. A função
+    pode parar a avaliação de um teste assim que a energia passa do
+    limite e retornar qualquer valor maior que ele: o teste perderia a
+    seleção de qualquer forma, então a busca é a mesma da avaliação
+    completa (ver `objetivos.ObjetivoComLimite`).
+
+    Estratégia 'randtobest1bin', F sorteado em `mutation` a cada geração,
+    seleção ao fim da geração (updating='deferred') e critério de parada
+    do scipy. `nfev` conta avaliações pedidas, completas ou não.
+    """
+
+    rng = np.random.default_rng(seed)
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    N = len(limites)
+
+    def escala(u):
+        return lo + u*(hi - lo)
+
+    if isinstance(init, str):
+        populacao = qmc.LatinHypercube(d=N, seed=rng).random(popsize*N)
+    else:
+        populacao = np.clip((np.asarray(init, dtype=float) - lo)/(hi - lo), 0, 1)
+    S = len(populacao)
+
+    energias = np.asarray(funcao_vet(escala(populacao).T, *args), dtype=float)
+    nfev, nit = S, 0
+    mensagem = "Número máximo de gerações atingido."
+    while nit < maxiter:
+        F = rng.uniform(*mutation) if np.size(mutation) == 2 else mutation
+        testes = _vetores_teste(populacao, energias, F, recombination, rng)
+        energias_testes = np.asarray(funcao_vet(escala(testes).T, *args, limites=energias), dtype=float)
+        nfev += S
+        nit += 1
+
+        aceitos = energias_testes <= energias
+        populacao[aceitos], energias[aceitos] = testes[aceitos], energias_testes[aceitos]
+
+        media, desvio = np.mean(energias), np.std(energias)
+        convergencia = tol/(desvio/abs(media)) if desvio > 0 and media != 0 else np.inf
+        intermediario = OptimizeResult(x=escala(populacao[np.argmin(energias)]), fun=np.min(energias), nfev=nfev,
+                                       nit=nit, convergence=convergencia, population=escala(populacao),
+                                       population_energies=energias.copy())
+        if callback is not None and callback(intermediate_result=intermediario):
+            mensagem = "Interrompido pelo callback."
+            break
+        if desvio <= atol + tol*abs(media):
+            mensagem = "Otimização concluída com sucesso."
+            break
+
+    return _finalizar(escala(populacao), energias, nfev, nit, mensagem, _escalar(funcao_vet), bounds, args, polish)
+
+
+def variante_adaptativa(nome):
+    """Variante de `de_adaptativo` para um nome de estratégia ('JADE', 'L-SHADE', 'lshade'...), ou None."""
+
+    variante = str(nome).strip().lower().replace('-', '')
+    return variante if variante in VARIANTES_ADAPTATIVAS else None
+
+
+def _lehmer(valores, pesos):
+    """Média de Lehmer ponderada (sum w*v^2 / sum w*v), usada para F (e CR no L-SHADE)."""
+
+    return np.sum(pesos*valores**2)/np.sum(pesos*valores)
+
+
+def de_adaptativo(funcao_vet, bounds, args=(), variante='lshade', popsize=15, tol=0.01, atol=0, maxiter=1000,
+                  callback=None, polish=True, seed=None, init='latinhypercube', orcamento=None):
+    """Evolução diferencial autoadaptativa (JADE, SHADE ou L-SHADE), vetorizada por gerações.
+
+    Todas usam a mutação current-to-pbest/1 (x + F*(pbest - x) + F*(x_r1 -
+    x_r2), com pbest sorteado entre os p*S melhores e x_r2 tirado da
+    população ou do arquivo de pais substituídos), cruzamento binomial e
+    seleção ao fim da geração. F (Cauchy) e CR (normal) de cada indivíduo
+    são sorteados em torno de médias aprendidas dos testes que melhoraram
+    o alvo:
+
+    - 'jade': uma média de F e uma de CR, suavizadas a cada geração
+      (c = 0.1; média de Lehmer para F, aritmética para CR);
+    - 'shade': memória de H pares (F, CR), atualizada em rodízio com as
+      médias ponderadas pela melhora de cada teste;
+    - 'lshade': SHADE com média de Lehmer também para CR, CR travado em 0
+      quando nenhum teste com CR > 0 funciona, e redução linear da
+      população de popsize*N até `POPULACAO_MINIMA` ao longo do
+      `maxiter` (os piores saem) ou, com `orcamento`, ao longo do que
+      resta dele.
+
+    orcamento: objeto com `fracao()` (a fração usada, ou None sem limite),
+    como `parada.Orcamento`, que governa a parada em vez de `maxiter`. A
+    redução do L-SHADE segue o avanço da fração desde o início desta
+    execução até 1 (ou nit/maxiter, se este for maior).
+
+    `funcao_vet` recebe a matriz N x S, como com `vectorized=True` no
+    scipy. Coordenadas que saem dos limites ficam no meio do caminho entre
+    o pai e o limite. Parada, `callback` e polimento como em `de_abandono`.
+    """
+
+    if variante not in VARIANTES_ADAPTATIVAS:
+        raise ValueError(f"variante adaptativa desconhecida: {variante}")
+    memoria, p, taxa_arquivo = VARIANTES_ADAPTATIVAS[variante]
+    rng = np.random.default_rng(seed)
+    limites = np.asarray(bounds, dtype=float)
+    lo, hi = limites[:, 0], limites[:, 1]
+    N = len(limites)
+
+    def escala(u):
+        return lo + u*(hi - lo)
+
+    if isinstance(init, str):
+        init = populacao_inicial(bounds, popsize*N, init, rng=rng)
+    populacao = np.clip((np.asarray(init, dtype=float) - lo)/(hi - lo), 0, 1)
+    S_inicial = len(populacao)
+    fracao_inicial = orcamento.fracao() if orcamento is not None else None
+
+    energias = np.asarray(funcao_vet(escala(populacao).T, *args), dtype=float)
+    nfev, nit = S_inicial, 0
+    medias_F, medias_CR = np.full(memoria, 0.5), np.full(memoria, 0.5)
+    posicao = 0                 # próxima posição da memória a atualizar (SHADE, L-SHADE)
+    arquivo = np.empty((0, N))
+    mensagem = "Número máximo de gerações atingido."
+    while nit < maxiter:
+        S = len(populacao)
+        sorteio = rng.integers(memoria, size=S)
+        CR = np.where(np.isnan(medias_CR[sorteio]), 0, np.clip(rng.normal(np.nan_to_num(medias_CR[sorteio]), 0.1), 0, 1))
+        F = np.zeros(S)
+        faltam = np.ones(S, dtype=bool)
+        while faltam.any():     # Cauchy truncado em (0, 1]: valores <= 0 são sorteados de novo
+            F[faltam] = medias_F[sorteio[faltam]] + 0.1*np.tan(np.pi*(rng.random(np.count_nonzero(faltam)) - 0.5))
+            faltam = F <= 0
+        F = np.minimum(F, 1)
+
+        # current-to-pbest/1, com x_r2 da união população + arquivo
+        melhores = np.argsort(energias)[:max(2, round(p*S))]
+        pbest = populacao[rng.choice(melhores, S)]
+        r1 = (np.arange(S) + rng.integers(1, S, S)) % S
+        uniao = np.concatenate([populacao, arquivo])
+        r2 = rng.integers(len(uniao), size=S)
+        repetidos = (r2 == np.arange(S)) | (r2 == r1)
+        while repetidos.any():
+            r2[repetidos] = rng.integers(len(uniao), size=np.count_nonzero(repetidos))
+            repetidos = (r2 == np.arange(S)) | (r2 == r1)
+        mutantes = populacao + F[:, None]*(pbest - populacao) + F[:, None]*(populacao[r1] - uniao[r2])
+
+        cruza = rng.random((S, N)) < CR[:, None]
+        cruza[np.arange(S), rng.integers(N, size=S)] = True
+        testes = np.where(cruza, mutantes, populacao)
+        testes = np.where(testes < 0, populacao/2, np.where(testes > 1, (populacao + 1)/2, testes))
+
+        energias_testes = np.asarray(funcao_vet(escala(testes).T, *args), dtype=float)
+        nfev += S
+        nit += 1
+
+        # Aprendizado de F e CR com os testes que melhoraram o alvo
+        sucesso = energias_testes < energias
+        if sucesso.any():
+            arquivo = np.concatenate([arquivo, populacao[sucesso]])
+            F_ok, CR_ok = F[sucesso], CR[sucesso]
+            if variante == 'jade':
+                medias_F[0] = 0.9*medias_F[0] + 0.1*_lehmer(F_ok, np.ones_like(F_ok))
+                medias_CR[0] = 0.9*medias_CR[0] + 0.1*np.mean(CR_ok)
+            else:
+                pesos = energias[sucesso] - energias_testes[sucesso]
+                pesos = pesos/pesos.sum() if np.all(np.isfinite(pesos)) and pesos.sum() > 0 else np.ones_like(pesos)
+                medias_F[posicao] = _lehmer(F_ok, pesos)
+                if variante == 'shade':
+                    medias_CR[posicao] = np.sum(pesos*CR_ok)
+                elif np.isnan(medias_CR[posicao]) or CR_ok.max() == 0:
+                    medias_CR[posicao] = np.nan     # CR terminal: 0 daqui em diante nessa posição
+                else:
+                    medias_CR[posicao] = _lehmer(CR_ok, pesos)
+                posicao = (posicao + 1) % memoria
+
+        aceitos = energias_testes <= energias
+        populacao[aceitos], energias[aceitos] = testes[aceitos], energias_testes[aceitos]
+
+        if variante == 'lshade':
+            progresso = nit/maxiter
+            if fracao_inicial is not None:
+                progresso = max(progresso, 1 if fracao_inicial >= 1 else
+                                (orcamento.fracao() - fracao_inicial)/(1 - fracao_inicial))
+            S_novo = max(POPULACAO_MINIMA, round(S_inicial + (POPULACAO_MINIMA - S_inicial)*progresso))
+            if S_novo < S:
+                ficam = np.argsort(energias)[:S_novo]
+                populacao, energias = populacao[ficam], energias[ficam]
+        limite_arquivo = round(taxa_arquivo*len(populacao))
+        if len(arquivo) > limite_arquivo:
+            arquivo = arquivo[rng.choice(len(arquivo), limite_arquivo, replace=False)]
+
+        media, desvio = np.mean(energias), np.std(energias)
+        convergencia = tol/(desvio/abs(media)) if desvio > 0 and media != 0 else np.inf
+        intermediario = OptimizeResult(x=escala(populacao[np.argmin(energias)]), fun=np.min(energias), nfev=nfev,
+                                       nit=nit, convergence=convergencia, population=escala(populacao),
+                                       population_energies=energias.copy())
+        if callback is not None and callback(intermediate_result=intermediario):
+            mensagem = "Interrompido pelo callback."
+            break
+        if desvio <= atol + tol*abs(media):
+            mensagem = "Otimização concluída com sucesso."
+            break
+
+    return _finalizar(escala(populacao), energias, nfev, nit, mensagem, _escalar(funcao_vet), bounds, args, polish)
+
+
+def de_reinicios(executar, funcao_vet, bounds, args=(), popsize=15, crescimento=2, reinicios=4, elite=5,
+                 injetar=False, estagnacao=None, maxiter=1000, callback=None, polish=True, seed=None,
+                 init='latinhypercube'):
+    """Evolução diferencial com reinícios e população crescente (IPOP).
+
+    `executar(popsize, init, maxiter, callback)` roda uma execução do DE
+    (scipy ou um dos motores acima, sem polimento) e retorna o
+    `OptimizeResult` com `population` e `population_energies`. Cada
+    execução é acompanhada por `estagnacao` (padrão:
+    `parada.Estagnacao(bounds)`). Quando uma execução termina antes do
+    `maxiter` (estagnação ou convergência, que com a penalidade fixa
+    pode acontecer logo na primeira geração com a população inteira
+    inviável) e ainda há reinícios, uma nova execução começa com
+    `crescimento` vezes mais indivíduos, com as gerações que sobraram.
+    init: 'latinhypercube', 'sobol' (para todas as execuções) ou uma
+    população só para a primeira.
+
+    O arquivo de elite guarda os `elite` melhores vetores vistos em todas
+    as execuções, e o resultado é o melhor dele. Com `injetar`, os membros
+    do arquivo também entram na população de cada reinício (o que puxa a
+    busca de volta à bacia antiga com estratégias '...tobest...').
+
+    maxiter conta as gerações de todas as execuções juntas, e
+    `callback(intermediate_result)` recebe a geração acumulada em `nit`;
+    se retornar True, a busca toda para. O resultado traz também
+    `reinicios` (quantos houve), `populacoes` (tamanho de cada execução)
+    e `arquivo`/`arquivo_energias`. O polimento, se pedido, é um L-BFGS-B
+    sobre o melhor vetor ao final.
+    """
+
+    rng = np.random.default_rng(seed)
+    N = len(bounds)
+    estagnacao = Estagnacao(bounds) if estagnacao is None else estagnacao
+
+    arquivo, arquivo_energias = np.empty((0, N)), np.empty(0)
+    nfev, nit = 0, 0
+    populacoes = []
+    mensagem = "Número máximo de gerações atingido."
+    for reinicio in range(reinicios + 1):
+        tamanho = int(round(popsize*crescimento**reinicio))
+        if reinicio == 0 and not isinstance(init, str):
+            populacao = np.asarray(init, dtype=float)
+        else:
+            populacao = populacao_inicial(bounds, tamanho*N, init if isinstance(init, str) else 'latinhypercube',
+                                          arquivo if injetar else (), rng)
+        populacoes.append(len(populacao))
+        estagnacao.reiniciar()
+        interrompido, anteriores = False, nit
+
+        def acompanhar(intermediate_result):
+            nonlocal interrompido
+            acumulado = OptimizeResult(intermediate_result, nit=anteriores + intermediate_result.nit)
+            if callback is not None and callback(intermediate_result=acumulado):
+                interrompido = True
+                return True
+            return estagnacao(intermediate_result)
+
+        resultado = executar(tamanho, populacao, maxiter - nit, acompanhar)
+        nfev += resultado.nfev
+        nit += resultado.nit
+
+        todos = np.concatenate([arquivo, resultado.population])
+        todas_energias = np.concatenate([arquivo_energias, resultado.population_energies])
+        ordem = np.argsort(todas_energias)[:elite]
+        arquivo, arquivo_energias = todos[ordem], todas_energias[ordem]
+
+        if interrompido:
+            mensagem = "Interrompido pelo callback."
+            break
+        if nit >= maxiter:
+            mensagem = "Número máximo de gerações atingido."
+            break
+        mensagem = "Estagnado após o último reinício." if estagnacao.estagnado else str(resultado.message)
+
+    # O resultado é o melhor do arquivo de elite; a população é a da última execução
+    return _finalizar(arquivo, arquivo_energias, nfev, nit, mensagem, _escalar(funcao_vet), bounds, args, polish,
+                      success=bool(resultado.success) and not estagnacao.estagnado,
+                      population=resultado.population, population_energies=resultado.population_energies,
+                      reinicios=len(populacoes) - 1, populacoes=populacoes, arquivo=arquivo,
+                      arquivo_energias=arquivo_energias)
@@ -0,0 +1,119 @@
+"""Síntese normalizada pelo elo de referência (invariância de escala).
+
+Na geração de funções só os ângulos importam: multiplicar todos os elos
+por uma constante não muda thetaO nem os ângulos de transmissão. O modo
+normalizado fixa o elo de referência (L1, o elo terra) em 1, busca as
+razões dos outros sete elos e os três ângulos (10 dimensões) e só no fim
+reescala o resultado para as unidades do usuário, dentro dos limites
+originais. As razões são buscadas em escala logarítmica, para que
+L_i/L1 = 1/4 e 4 fiquem igualmente representados na população.
+"""
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from .objetivos import OBJETIVOS
+
+
+REFERENCIA = 0                  # índice de L1 no vetor de 11 parâmetros
+ELOS = tuple(range(8))          # L1, L2, L3, L4, L5, L6, L8, L9
+_PENALIDADE = 999999999999
+
+
+def limites_normalizados(bounds):
+    """Limites das 10 variáveis do modo normalizado a partir dos 11 limites originais.
+
+    log(L_i/L1) vai de log(lo_i/hi_1) a log(hi_i/lo_1); os ângulos não mudam.
+    """
+
+    lo_ref, hi_ref = bounds[REFERENCIA]
+    limites = []
+    for i, (lo, hi) in enumerate(bounds):
+        if i == REFERENCIA:
+            continue
+        limites.append([np.log(lo/hi_ref), np.log(hi/lo_ref)] if i in ELOS else [lo, hi])
+    return limites
+
+
+def _intervalo_escala(p, bounds):
+    """Fatores de escala s (mínimo, máximo) que levam os elos de `p` (11, S) para dentro de `bounds`."""
+
+    elos = np.asarray(p)[list(ELOS)]
+    lo = np.array([bounds[i][0] for i in ELOS])[:, None]
+    hi = np.array([bounds[i][1] for i in ELOS])[:, None]
+    return np.max(lo/elos, axis=0), np.min(hi/elos, axis=0)
+
+
+def desnormalizar(q):
+    """Vetor (11, S) em unidades de razão (L1 = 1) a partir das 10 variáveis `q` (log das razões e ângulos)."""
+
+    p = np.insert(np.reshape(q, (10, -1)), REFERENCIA, 0.0, axis=0)
+    p[list(ELOS)] = np.exp(p[list(ELOS)])
+    return p
+
+
+def reescalar(p, bounds):
+    """Leva um vetor normalizado de 11 parâmetros às unidades do usuário.
+
+    Usa a média geométrica do intervalo de escalas admissíveis, o que
+    deixa os elos o mais afastados possível dos limites. Retorna o vetor
+    e se alguma escala cabe nos limites; quando nenhuma cabe, usa a média
+    geométrica das escalas extremas e corta os elos nos limites, e o
+    vetor devolvido já não tem as razões encontradas pelo DE.
+    """
+
+    p = np.array(p, dtype=float)
+    s_min, s_max = _intervalo_escala(p[:, None], bounds)
+    p[list(ELOS)] *= np.sqrt(s_min*s_max)[0]
+    limites = np.asarray(bounds, dtype=float)
+    return np.clip(p, limites[:, 0], limites[:, 1]), bool(s_min[0] <= s_max[0])
+
+
+def funcx_normalizado_vet(q, TipoDeMec, bounds, thetaI, thetaOd, n, lb, rb):
+    """Função objetivo (vetorizada) de `TipoDeMec` no espaço normalizado.
+
+    Candidatos cujas razões não cabem nos limites originais em nenhuma
+    escala recebem a penalidade de todos os pontos, crescente com o
+    excesso log(s_min/s_max), para que a população não fique num patamar
+    plano (o que encerraria o DE pelo critério de tolerância).
+    """
+
+    p = desnormalizar(q)
+    s_min, s_max = _intervalo_escala(p, bounds)
+    fobj = np.atleast_1d(OBJETIVOS[TipoDeMec][1](p, thetaI, thetaOd, n, lb, rb))
+    with np.errstate(divide='ignore'):
+        excesso = np.log(s_min/s_max)
+    return np.where(excesso <= 0, fobj, n*float(_PENALIDADE)**2*(1 + excesso))
+
+
+def funcx_normalizado(q, TipoDeMec, bounds, thetaI, thetaOd, n, lb, rb):
+    """Mesmo que `funcx_normalizado_vet` para um único candidato (modo com `workers`)."""
+
+    p = desnormalizar(q)[:, 0]
+    s_min, s_max = _intervalo_escala(p[:, None], bounds)
+    if s_min[0] > s_max[0]:
+        return n*float(_PENALIDADE)**2*(1 + np.log(s_min[0]/s_max[0]))
+    return OBJETIVOS[TipoDeMec][0](p, thetaI, thetaOd, n, lb, rb)
+
+
+def sintetizar_normalizado(TipoDeMec, executar, bounds, args):
+    """Otimiza `TipoDeMec` com L1 fixo e devolve o resultado em unidades do usuário.
+
+    executar(funcao, funcao_vet, bounds, args): roda a evolução
+    diferencial (ex.: `App.executar_DE`). O `OptimizeResult` retornado
+    tem o vetor reescalado em `x` e o vetor em razões em `x_normalizado`.
+    Se as razões encontradas não cabem nos limites em nenhuma escala, os
+    elos são cortados nos limites, `fun` é recalculado para o vetor
+    cortado e o resultado sai com `success` falso e o aviso na mensagem.
+    """
+
+    resultado = executar(funcx_normalizado, funcx_normalizado_vet, limites_normalizados(bounds), (TipoDeMec, bounds) + tuple(args))
+    p = desnormalizar(resultado.x)[:, 0]
+    x, cabe = reescalar(p, bounds)
+    fun, success, message = resultado.fun, resultado.success, resultado.message
+    if not cabe:
+        fun = OBJETIVOS[TipoDeMec][0](x, *args)
+        success = False
+        message = f"{message} As razões encontradas não cabem nos limites dos elos; elos cortados nos limites."
+    return OptimizeResult(x=x, x_normalizado=p, fun=fun, nfev=resultado.nfev,
+                          nit=resultado.nit, success=success, message=message)
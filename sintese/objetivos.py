@@ -0,0 +1,751 @@
+"""Funções objetivo da síntese por evolução diferencial, sem dependência da GUI.
+
+- funcx_W1, funcx (Watt 2), funcx_S1, funcx_S2, funcx_S3: avaliam um
+  candidato por chamada (modo com `workers`).
+- funcx_*_vet: avaliam a população inteira (11 x S) de uma vez, para
+  `differential_evolution(vectorized=True)`.
+
+Todas recebem os argumentos (thetaI, thetaOd, n, lb, rb) e retornam a
+soma dos erros quadráticos dos ângulos de saída, com penalidade
+999999999999 por ponto quando a configuração é inválida.
+
+- funcx_*_graduada(_vet) (`OBJETIVOS_GRADUADOS`): mesmas cinemáticas com
+  a violação das restrições graduada em vez da penalidade fixa (ver
+  `PENALIDADE_GRADUADA`).
+- `ObjetivoComLimite`: avaliação vetorizada que abandona cedo os
+  candidatos cuja energia parcial já passou de um limite.
+"""
+
+import math
+
+import numpy as np
+
+from .cinematica import Parametros, resolver_gamma_S2
+
+
+# Funções objetivo de otimização de cada mecanismo
+def funcx_W1(p_W1, thetaI_W1, thetaOd_W1, n_W1, lb_W1, rb_W1):
+    """Função objetivo para otimização do mecanismo Watt 1.
+
+    p_W1: vetor de parâmetros (elos e ângulos fixos)
+    thetaI_W1: vetor de ângulos de entrada desejados (radianos)
+    thetaOd_W1: vetor de ângulos de saída alvo (radianos)
+    n_W1: número de pares
+    lb_W1, rb_W1: limites (inferior/superior) de qualidade de transmissão
+
+    Retorna a soma dos erros quadráticos entre thetaO calculado e
+    thetaOd_W1. Penaliza configurações que violam restrições.
+    """
+
+    L1_W1, L2_W1, L3_W1, L4_W1, L5_W1, L6_W1, L8_W1, L9_W1, phi_W1, alpha_W1, lambda_W1 = p_W1
+    # Inicialização de variável
+    thetaO_W1 = []
+    for i in range(n_W1):
+        try:
+            # Define as variáveis que serão modificadas até alcançar o objetivo da otimização
+            
+            # Cinemática do mecanismo
+            B_W1 = [L1_W1*math.cos(phi_W1),L1_W1*math.sin(phi_W1)]
+            C_W1 = [L2_W1*math.cos(thetaI_W1[i]),L2_W1*math.sin(thetaI_W1[i])]
+            e1_W1 = math.sqrt((B_W1[0]-C_W1[0])**2 + (B_W1[1]-C_W1[1])**2)
+            omega_W1 = math.atan2(B_W1[1]-C_W1[1], B_W1[0]-C_W1[0])
+            delta_W1 = math.acos((L3_W1**2+e1_W1**2-L4_W1**2)/(2*e1_W1*L3_W1))
+            D_W1 = [C_W1[0] + L3_W1*math.cos(delta_W1+omega_W1),C_W1[1] + L3_W1*math.sin(delta_W1+omega_W1)]
+            E_W1 = [C_W1[0] + L5_W1*math.cos(delta_W1+omega_W1+alpha_W1),C_W1[1] + L5_W1*math.sin(delta_W1+omega_W1+alpha_W1)]
+
+            beta1_W1 = math.atan2(D_W1[1]-B_W1[1], D_W1[0]-B_W1[0])
+            thetaO = beta1_W1-lambda_W1
+            
+            G_W1  = [B_W1[0] + L6_W1*math.cos(thetaO),B_W1[1] + L6_W1*math.sin(thetaO)]
+            e2_W1 = math.sqrt((E_W1[0]-G_W1[0])**2 + (E_W1[1]-G_W1[1])**2)
+            
+            L7_W1 = math.sqrt((D_W1[0]-E_W1[0])**2 + (D_W1[1]-E_W1[1])**2)
+            # Cálculo dos ângulos de qualidade de transmissão
+
+            mi1_W1 = math.acos((L4_W1**2+L3_W1**2-e1_W1**2)/(2*L4_W1*L3_W1))               
+            mi2_W1 = math.acos((L8_W1**2+L9_W1**2-e2_W1**2)/(2*L8_W1*L9_W1))
+            
+            # Calcula a àrea dos dois elos ternários
+            #AreaTri1_W1 = abs(L3_W1*math.sin(alpha_W1)*L5_W1)/(2)
+            #AreaTri2_W1 = abs(L4_W1*math.sin(lambda_W1)*L6_W1)/(2)
+            
+            # Restrições da otimização. Caso os ângulos de qualidade de transmissão não estejam de acordo com o definido, ou se a 
+            # àrea dos triângulos forem muito desproporcionais entre si, penaliza a função objetivo. Caso contrário, guarda em um vetor
+            # o ângulo de saída calculado
+            
+            if (mi1_W1<lb_W1) or (mi1_W1>rb_W1) or (mi2_W1<lb_W1) or (mi2_W1>rb_W1):
+                thetaO_W1.append(999999999999)
+            else:
+                thetaO_W1.append(thetaO)
+
+        # Caso aconteça uma indeterminação matemática (Ex: divisão por zero no arco tangente), penaliza a função objetivo
+        except:              
+            thetaO_W1.append(999999999999)
+
+    # Calcula a função objetivo como o erro ao quadrado de cada um dos ângulos de saída
+    thetaO_W1 = np.array(thetaO_W1)
+    thetaOd_W1 = np.array(thetaOd_W1)
+    
+    Fobj_W1 = np.sum((thetaO_W1-thetaOd_W1)**2)
+    return Fobj_W1
+
+    # Para os outros mecanismos desta função, o funcionamento segue o mesmo modelo deste.
+
+
+def funcx(p, thetaI, thetaOd, n, lb, rb):
+    """Função objetivo genérica usada para Watt 2.
+
+    Mesma ideia da função de Watt1: calcula thetaO para cada thetaI
+    e retorna a soma dos erros quadráticos vs thetaOd. Aplica
+    penalizações quando restrições não são atendidas.
+    """
+
+    # Use the stored values to perform a calculation
+    thetaO = []
+    for i in range(n):
+        try:
+            L1, L2, L3, L4, L5, L6, L8, L9, phi, alpha1, lambda1 = p
+
+            B = [L1*math.cos(phi),L1*math.sin(phi)] 
+            C = [L2*math.cos(phi+alpha1),L2*math.sin(phi+alpha1)]
+            D = [L3*math.cos(thetaI[i]),L3*math.sin(thetaI[i])]
+            x1 = math.sqrt((D[0]-C[0])**2 + (D[1]-C[1])**2)
+            Beta1 = math.atan2(C[1]-D[1], C[0]-D[0])
+            Beta2 = math.acos((L4**2+x1**2-L5**2)/(2*L4*x1))
+            E = [D[0]+L4*math.cos(Beta1+Beta2),D[1]+L4*math.sin(Beta1+Beta2)]
+            lambda0 = math.atan2(E[1]-C[1], E[0]-C[0])
+            F = [C[0]+L6*math.cos(lambda0-lambda1),C[1]+L6*math.sin(lambda0-lambda1)]
+            x2 = math.sqrt((F[0]-B[0])**2 + (F[1]-B[1])**2)
+            psi = math.atan2(F[1]-B[1], F[0]-B[0])     
+            omega2 = math.acos((x2**2+L9**2-L8**2)/(2*L9*x2))
+            omega1 = psi-omega2-phi  
+            mi1 = math.acos((L4**2+L5**2-x1**2)/(2*L4*L5))
+            mi2 = math.acos((L8**2+L9**2-x2**2)/(2*L8*L9))
+
+            AreaTri1 = abs(L1*math.sin(alpha1)*L2)/(2)
+            AreaTri2 = abs(L5*math.sin(lambda1)*L6)/(2)
+
+            if ((mi1<lb) or (mi1>rb) or (mi2<lb) or (mi2>rb)):
+                thetaO.append(999999999999)
+            else:
+                thetaO.append(phi+omega1)
+
+        except:                
+            thetaO.append(999999999999)
+
+    thetaO = np.array(thetaO)
+    thetaOd = np.array(thetaOd)
+    
+    Fobj = np.sum((thetaO-thetaOd)**2)
+
+    return Fobj
+
+
+def funcx_S1(p_S1, thetaI_S1, thetaOd_S1, n_S1, lb_S1, rb_S1):
+    """Função objetivo para Stephenson 1.
+
+    Implementa a cinemática e restrições específicas para S1 e
+    retorna a soma dos erros quadrados entre thetaO_S1 e thetaOd_S1.
+    """
+
+    thetaO_S1 = []
+    for i in range(n_S1):
+        try:
+            L1_S1, L2_S1, L3_S1, L4_S1, L5_S1, L6_S1, L8_S1, L9_S1, phi_S1, alpha1_S1, lambda1_S1 = p_S1
+
+            B_S1 = [L1_S1*math.cos(phi_S1),L1_S1*math.sin(phi_S1)]
+            C_S1 = [L2_S1*math.cos(thetaI_S1[i]+alpha1_S1),L2_S1*math.sin(thetaI_S1[i]+alpha1_S1)]
+            D_S1 = [L3_S1*math.cos(thetaI_S1[i]),L3_S1*math.sin(thetaI_S1[i])]
+            e1_S1 = math.sqrt((D_S1[0]-B_S1[0])**2 + (D_S1[1]-B_S1[1])**2)
+            beta_S1 = math.atan2(B_S1[1]-D_S1[1], B_S1[0]-D_S1[0])
+            omega_S1 = math.acos((e1_S1**2+L5_S1**2-L4_S1**2)/(2*e1_S1*L5_S1))
+            E_S1 = [D_S1[0] + L5_S1*math.cos(beta_S1+omega_S1), D_S1[1] + L5_S1*math.sin(beta_S1+omega_S1)]
+            ksi_S1 = math.atan2(E_S1[1]-B_S1[1], E_S1[0]-B_S1[0])
+            thetaO = ksi_S1 - lambda1_S1
+            F_S1 = [B_S1[0] + L6_S1*math.cos(ksi_S1-lambda1_S1), B_S1[1] + L6_S1*math.sin(ksi_S1-lambda1_S1)]
+            e2_S1 = math.sqrt((C_S1[0]-F_S1[0])**2 + (C_S1[1]-F_S1[1])**2)
+
+            mi1_S1 = math.acos((L5_S1**2+L4_S1**2-e1_S1**2)/(2*L5_S1*L4_S1))
+            mi2_S1 = math.acos((L9_S1**2+L8_S1**2-e2_S1**2)/(2*L9_S1*L8_S1))
+
+            AreaTri1_S1 = abs(L3_S1*math.sin(alpha1_S1)*L2_S1)/(2)
+            AreaTri2_S1 = abs(L4_S1*math.sin(lambda1_S1)*L6_S1)/(2)
+            
+            if ((mi1_S1<lb_S1) or (mi1_S1>rb_S1) or (mi2_S1<lb_S1) or (mi2_S1>rb_S1)):
+                thetaO_S1.append(999999999999)
+            else:
+                thetaO_S1.append(ksi_S1-lambda1_S1)
+            
+        except:              
+            thetaO_S1.append(999999999999)
+
+    thetaO_S1 = np.array(thetaO_S1)
+    thetaOd_S1 = np.array(thetaOd_S1)
+    
+    Fobj_S1 = np.sum((thetaO_S1-thetaOd_S1)**2)
+    return Fobj_S1
+
+
+def funcx_S2(p_S2, thetaI_S2, thetaOd_S2, n_S2, lb_S2, rb_S2):
+    """Função objetivo para Stephenson 2.
+
+    Observação: este caso precisa de um ângulo intermediário
+    (`gamma_S2`) antes de calcular thetaO. Ele vem de
+    `cinematica.resolver_gamma_S2`: Newton em lote, com o primeiro ponto
+    partindo de 1 rad (o antigo chute inicial do `root`) e cada ponto
+    seguinte do gamma_S2 do anterior, e a solução direta do fechamento
+    onde o Newton não converge ou troca de modo de montagem.
+    """
+
+    thetaO_S2 = []
+    L1_S2, L2_S2, L3_S2, L4_S2, L5_S2, L6_S2, L8_S2, L9_S2, phi_S2, alpha1_S2, lambda1_S2 = p_S2
+
+    B_S2 = [L1_S2*math.cos(phi_S2),L1_S2*math.sin(phi_S2)]
+    # gamma_S2 de todos os pontos de uma vez (Newton em lote seguindo o ramo, com a solução direta como reserva)
+    gammas_S2 = resolver_gamma_S2(Parametros._make(p_S2), np.asarray(thetaI_S2)[:n_S2])
+
+    for i in range(n_S2):
+
+        try:
+            
+            C_S2 = [L3_S2*math.cos(thetaI_S2[i]+alpha1_S2),L3_S2*math.sin(thetaI_S2[i]+alpha1_S2)]
+            D_S2 = [L2_S2*math.cos(thetaI_S2[i]),L2_S2*math.sin(thetaI_S2[i])]
+
+            solution_gamma_S2 = gammas_S2[i]
+            if math.isnan(solution_gamma_S2):
+                raise ValueError("S2 não monta neste ponto")
+
+            if solution_gamma_S2 < 0 or solution_gamma_S2 > 2 * math.pi:
+                solution_gamma_S2 = (solution_gamma_S2 % (2 * math.pi))
+
+            E_S2 = [C_S2[0] + L4_S2*math.cos(solution_gamma_S2), C_S2[1] + L4_S2*math.sin(solution_gamma_S2)]
+            e1_S2 = math.sqrt((E_S2[0]-D_S2[0])**2 + (E_S2[1]-D_S2[1])**2)
+            omega_S2 = math.atan2(E_S2[1]-D_S2[1], E_S2[0]-D_S2[0])
+            omega2_S2 = math.acos((e1_S2**2 + L5_S2**2 - L6_S2**2) / (2 * e1_S2 * L5_S2))
+            F_S2 = [D_S2[0] + L5_S2*math.cos(omega_S2-omega2_S2), D_S2[1] + L5_S2*math.sin(omega_S2-omega2_S2)]
+            omega3_S2 = math.atan2(E_S2[1]-F_S2[1], E_S2[0]-F_S2[0])
+            G_S2 = [F_S2[0] + L8_S2*math.cos(omega3_S2-lambda1_S2), F_S2[1] + L8_S2*math.sin(omega3_S2-lambda1_S2)]
+
+            thetaO_S2compl = math.atan2(G_S2[1]-B_S2[1], G_S2[0]-B_S2[0])
+
+            e2_S2 = math.sqrt((F_S2[0]-B_S2[0])**2 + (F_S2[1]-B_S2[1])**2)
+            
+            e3_S2 = math.sqrt((F_S2[0]-C_S2[0])**2 + (F_S2[1]-C_S2[1])**2)
+
+            mi1_S2 = math.acos((L4_S2**2 + L6_S2**2 - e3_S2**2) / (2 * L4_S2 * L6_S2))
+            mi2_S2 = math.acos((L8_S2**2+L9_S2**2-e2_S2**2)/(2*L8_S2*L9_S2))
+
+            AreaTri1_S2 = abs(L2_S2*math.sin(alpha1_S2)*L3_S2)/(2)
+            AreaTri2_S2 = abs(L6_S2*math.sin(lambda1_S2)*L8_S2)/(2)
+
+            if ((mi1_S2<lb_S2) or (mi1_S2>rb_S2) or (mi2_S2<lb_S2) or (mi2_S2>rb_S2)):
+                thetaO_S2.append(999999999999)
+            else:
+                thetaO_S2.append(thetaO_S2compl)  
+
+        except:            
+            thetaO_S2.append(999999999999)
+    
+    thetaO_S2 = np.array(thetaO_S2)
+    thetaOd_S2 = np.array(thetaOd_S2)
+    
+    Fobj_S2 = np.sum((thetaO_S2-thetaOd_S2)**2)
+    return Fobj_S2
+
+
+def funcx_S3(p_S3, thetaI_S3, thetaOd_S3, n_S3, lb_S3, rb_S3):
+    """Função objetivo para Stephenson 3.
+
+    Implementa a cinemática de S3 e aplica as mesmas penalizações
+    por violação de restrições ou inconsistências geométricas.
+    """
+
+    thetaO_S3 = []
+    L1_S3, L2_S3, L3_S3, L4_S3, L5_S3, L6_S3, L8_S3, L9_S3, phi_S3, alpha1_S3, lambda1_S3 = p_S3
+
+    A_S3 = [0,0]
+    B_S3 = [L1_S3*math.cos(phi_S3),L1_S3*math.sin(phi_S3)]
+    C_S3 = [L2_S3*math.cos(phi_S3+alpha1_S3),L2_S3*math.sin(phi_S3+alpha1_S3)]
+
+    for i in range(n_S3):
+
+        try:
+            
+            D_S3 = [L3_S3*math.cos(thetaI_S3[i]),L3_S3*math.sin(thetaI_S3[i])]
+            e1_S3 = math.sqrt((D_S3[0]-C_S3[0])**2 + (D_S3[1]-C_S3[1])**2)
+            omega_S3 = math.acos((e1_S3**2+L5_S3**2-L4_S3**2)/(2*e1_S3*L5_S3))
+            beta_S3 = math.atan2(D_S3[1]-C_S3[1], D_S3[0]-C_S3[0])
+            F_S3 = [C_S3[0] + L5_S3*math.cos(beta_S3-omega_S3), C_S3[1] + L5_S3*math.sin(beta_S3-omega_S3)]
+            lambda0_S3 = math.atan2(D_S3[1]-F_S3[1], D_S3[0]-F_S3[0])
+            E_S3 = [F_S3[0] + L6_S3*math.cos(lambda0_S3-lambda1_S3), F_S3[1] + L6_S3*math.sin(lambda0_S3-lambda1_S3)]
+            e2_S3 = math.sqrt((E_S3[0]-B_S3[0])**2 + (E_S3[1]-B_S3[1])**2)
+            gamma_S3 = math.acos((e2_S3**2+L9_S3**2-L8_S3**2)/(2*e2_S3*L9_S3))
+            gamma1_S3 = math.atan2(E_S3[1]-B_S3[1], E_S3[0]-B_S3[0])
+            thetaO_S3compl = gamma1_S3-gamma_S3
+
+            mi1_S3 = math.acos((L5_S3**2+L4_S3**2-e1_S3**2)/(2*L5_S3*L4_S3))
+            mi2_S3 = math.acos((L8_S3**2+L9_S3**2-e2_S3**2)/(2*L8_S3*L9_S3))
+
+            AreaTri1_S3 = abs(L2_S3*math.sin(alpha1_S3)*L1_S3)/(2)
+            AreaTri2_S3 = abs(L4_S3*math.sin(lambda1_S3)*L6_S3)/(2)
+            
+            if ((mi1_S3<lb_S3) or (mi1_S3>rb_S3) or (mi2_S3<lb_S3) or (mi2_S3>rb_S3)):
+                thetaO_S3.append(999999999999)
+            else:
+                thetaO_S3.append(gamma1_S3-gamma_S3)  
+
+        except:            
+            thetaO_S3.append(999999999999)
+    
+    thetaO_S3 = np.array(thetaO_S3)
+    thetaOd_S3 = np.array(thetaOd_S3)
+    
+    Fobj_S3 = np.sum((thetaO_S3-thetaOd_S3)**2)
+    return Fobj_S3
+
+
+# Funções objetivo vetorizadas (população inteira x todos os pontos de precisão)
+def _acos(c, excesso=None):
+    """np.arccos que, se `excesso` for dado, acumula nele max(|c| - 1, 0).
+
+    Fora de [-1, 1] o arccos é NaN (triângulo que não fecha); o excesso
+    mede quanto falta para o elo montar e serve de violação graduada.
+    """
+    if excesso is not None:
+        excesso += np.nan_to_num(np.fmax(np.abs(c)-1, 0), nan=0, posinf=0)
+    return np.arccos(c)
+
+
+def _fobj_vet(thetaO, mi1, mi2, thetaOd, lb, rb):
+    """Aplica as restrições e soma os erros quadráticos por candidato.
+
+    thetaO, mi1, mi2: matrizes (S, n) - um candidato por linha e um
+    ponto de precisão por coluna. Onde há indeterminação matemática
+    (NaN) ou mi1/mi2 fora de [lb, rb], thetaO recebe a mesma penalidade
+    das funções escalares. Retorna vetor (S,).
+    """
+    valido = (np.isfinite(thetaO) & (mi1 >= lb) & (mi1 <= rb) & (mi2 >= lb) & (mi2 <= rb))
+    thetaO = np.where(valido, thetaO, 999999999999)
+    return np.sum((thetaO-np.asarray(thetaOd))**2, axis=1)
+
+
+def funcx_W1_vet(p_W1, thetaI_W1, thetaOd_W1, n_W1, lb_W1, rb_W1):
+    """Versão vetorizada de `funcx_W1` para `vectorized=True` do DE.
+
+    p_W1: matriz (11, S) com um candidato por coluna (ou vetor de 11)
+    Demais argumentos iguais aos de `funcx_W1`. Retorna vetor (S,) com
+    a função objetivo de cada candidato.
+    """
+
+    thetaO, mi1_W1, mi2_W1 = _cinematica_W1_vet(p_W1, thetaI_W1, n_W1)
+    return _fobj_vet(thetaO, mi1_W1, mi2_W1, thetaOd_W1, lb_W1, rb_W1)
+
+
+def _cinematica_W1_vet(p_W1, thetaI_W1, n_W1, excesso=None):
+    """thetaO, mi1 e mi2 do Watt 1 como matrizes (S, n).
+
+    excesso: matriz (S, n) opcional onde se acumula quanto cada argumento
+    de arccos passa de [-1, 1] (ver `_acos`).
+    """
+
+    L1_W1, L2_W1, L3_W1, L4_W1, L5_W1, L6_W1, L8_W1, L9_W1, phi_W1, alpha_W1, lambda_W1 = np.reshape(p_W1, (11, -1))[:, :, None]
+    thetaI_W1 = np.asarray(thetaI_W1)[:n_W1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Bx_W1, By_W1 = L1_W1*np.cos(phi_W1), L1_W1*np.sin(phi_W1)
+        Cx_W1, Cy_W1 = L2_W1*np.cos(thetaI_W1), L2_W1*np.sin(thetaI_W1)
+        e1_W1 = np.hypot(Bx_W1-Cx_W1, By_W1-Cy_W1)
+        omega_W1 = np.arctan2(By_W1-Cy_W1, Bx_W1-Cx_W1)
+        delta_W1 = _acos((L3_W1**2+e1_W1**2-L4_W1**2)/(2*e1_W1*L3_W1), excesso)
+        Dx_W1, Dy_W1 = Cx_W1 + L3_W1*np.cos(delta_W1+omega_W1), Cy_W1 + L3_W1*np.sin(delta_W1+omega_W1)
+        Ex_W1, Ey_W1 = Cx_W1 + L5_W1*np.cos(delta_W1+omega_W1+alpha_W1), Cy_W1 + L5_W1*np.sin(delta_W1+omega_W1+alpha_W1)
+
+        thetaO = np.arctan2(Dy_W1-By_W1, Dx_W1-Bx_W1) - lambda_W1
+        Gx_W1, Gy_W1 = Bx_W1 + L6_W1*np.cos(thetaO), By_W1 + L6_W1*np.sin(thetaO)
+        e2_W1 = np.hypot(Ex_W1-Gx_W1, Ey_W1-Gy_W1)
+
+        mi1_W1 = _acos((L4_W1**2+L3_W1**2-e1_W1**2)/(2*L4_W1*L3_W1), excesso)
+        mi2_W1 = _acos((L8_W1**2+L9_W1**2-e2_W1**2)/(2*L8_W1*L9_W1), excesso)
+
+    return thetaO, mi1_W1, mi2_W1
+
+
+def funcx_vet(p, thetaI, thetaOd, n, lb, rb):
+    """Versão vetorizada de `funcx` (Watt 2). Ver `funcx_W1_vet`."""
+
+    thetaO, mi1, mi2 = _cinematica_W2_vet(p, thetaI, n)
+    return _fobj_vet(thetaO, mi1, mi2, thetaOd, lb, rb)
+
+
+def _cinematica_W2_vet(p, thetaI, n, excesso=None):
+    """thetaO, mi1 e mi2 do Watt 2 como matrizes (S, n). Ver `_cinematica_W1_vet`."""
+
+    L1, L2, L3, L4, L5, L6, L8, L9, phi, alpha1, lambda1 = np.reshape(p, (11, -1))[:, :, None]
+    thetaI = np.asarray(thetaI)[:n]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Bx, By = L1*np.cos(phi), L1*np.sin(phi)
+        Cx, Cy = L2*np.cos(phi+alpha1), L2*np.sin(phi+alpha1)
+        Dx, Dy = L3*np.cos(thetaI), L3*np.sin(thetaI)
+        x1 = np.hypot(Dx-Cx, Dy-Cy)
+        Beta1 = np.arctan2(Cy-Dy, Cx-Dx)
+        Beta2 = _acos((L4**2+x1**2-L5**2)/(2*L4*x1), excesso)
+        Ex, Ey = Dx+L4*np.cos(Beta1+Beta2), Dy+L4*np.sin(Beta1+Beta2)
+        lambda0 = np.arctan2(Ey-Cy, Ex-Cx)
+        Fx, Fy = Cx+L6*np.cos(lambda0-lambda1), Cy+L6*np.sin(lambda0-lambda1)
+        x2 = np.hypot(Fx-Bx, Fy-By)
+        psi = np.arctan2(Fy-By, Fx-Bx)
+        omega2 = _acos((x2**2+L9**2-L8**2)/(2*L9*x2), excesso)
+        mi1 = _acos((L4**2+L5**2-x1**2)/(2*L4*L5), excesso)
+        mi2 = _acos((L8**2+L9**2-x2**2)/(2*L8*L9), excesso)
+
+        thetaO = psi-omega2
+
+    return thetaO, mi1, mi2
+
+
+def funcx_S1_vet(p_S1, thetaI_S1, thetaOd_S1, n_S1, lb_S1, rb_S1):
+    """Versão vetorizada de `funcx_S1`. Ver `funcx_W1_vet`."""
+
+    thetaO, mi1_S1, mi2_S1 = _cinematica_S1_vet(p_S1, thetaI_S1, n_S1)
+    return _fobj_vet(thetaO, mi1_S1, mi2_S1, thetaOd_S1, lb_S1, rb_S1)
+
+
+def _cinematica_S1_vet(p_S1, thetaI_S1, n_S1, excesso=None):
+    """thetaO, mi1 e mi2 do Stephenson 1 como matrizes (S, n). Ver `_cinematica_W1_vet`."""
+
+    L1_S1, L2_S1, L3_S1, L4_S1, L5_S1, L6_S1, L8_S1, L9_S1, phi_S1, alpha1_S1, lambda1_S1 = np.reshape(p_S1, (11, -1))[:, :, None]
+    thetaI_S1 = np.asarray(thetaI_S1)[:n_S1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Bx_S1, By_S1 = L1_S1*np.cos(phi_S1), L1_S1*np.sin(phi_S1)
+        Cx_S1, Cy_S1 = L2_S1*np.cos(thetaI_S1+alpha1_S1), L2_S1*np.sin(thetaI_S1+alpha1_S1)
+        Dx_S1, Dy_S1 = L3_S1*np.cos(thetaI_S1), L3_S1*np.sin(thetaI_S1)
+        e1_S1 = np.hypot(Dx_S1-Bx_S1, Dy_S1-By_S1)
+        beta_S1 = np.arctan2(By_S1-Dy_S1, Bx_S1-Dx_S1)
+        omega_S1 = _acos((e1_S1**2+L5_S1**2-L4_S1**2)/(2*e1_S1*L5_S1), excesso)
+        Ex_S1, Ey_S1 = Dx_S1 + L5_S1*np.cos(beta_S1+omega_S1), Dy_S1 + L5_S1*np.sin(beta_S1+omega_S1)
+        ksi_S1 = np.arctan2(Ey_S1-By_S1, Ex_S1-Bx_S1)
+        Fx_S1, Fy_S1 = Bx_S1 + L6_S1*np.cos(ksi_S1-lambda1_S1), By_S1 + L6_S1*np.sin(ksi_S1-lambda1_S1)
+        e2_S1 = np.hypot(Cx_S1-Fx_S1, Cy_S1-Fy_S1)
+
+        mi1_S1 = _acos((L5_S1**2+L4_S1**2-e1_S1**2)/(2*L5_S1*L4_S1), excesso)
+        mi2_S1 = _acos((L9_S1**2+L8_S1**2-e2_S1**2)/(2*L9_S1*L8_S1), excesso)
+
+        thetaO = ksi_S1-lambda1_S1
+
+    return thetaO, mi1_S1, mi2_S1
+
+
+def funcx_S2_vet(p_S2, thetaI_S2, thetaOd_S2, n_S2, lb_S2, rb_S2):
+    """Versão vetorizada de `funcx_S2`. Ver `funcx_W1_vet`.
+
+    Observação: `gamma_S2` de toda a população e de todos os pontos sai
+    de uma única chamada a `cinematica.resolver_gamma_S2`.
+    """
+
+    thetaO, mi1_S2, mi2_S2 = _cinematica_S2_vet(p_S2, thetaI_S2, n_S2)
+    return _fobj_vet(thetaO, mi1_S2, mi2_S2, thetaOd_S2, lb_S2, rb_S2)
+
+
+def _cinematica_S2_vet(p_S2, thetaI_S2, n_S2, excesso=None, gamma_S2=None):
+    """thetaO, mi1 e mi2 do Stephenson 2 como matrizes (S, n). Ver `_cinematica_W1_vet`.
+
+    Onde o mecanismo não monta (gamma_S2 NaN), o excesso não é medido
+    pelos arccos e fica a cargo de quem chama (thetaO NaN).
+
+    gamma_S2: matriz (S, n) já resolvida para estes candidatos e pontos.
+    Sem ela, `resolver_gamma_S2` segue o ramo pelos pontos na ordem em
+    que vêm, a partir da referência.
+    """
+
+    L1_S2, L2_S2, L3_S2, L4_S2, L5_S2, L6_S2, L8_S2, L9_S2, phi_S2, alpha1_S2, lambda1_S2 = np.reshape(p_S2, (11, -1))[:, :, None]
+    thetaI_S2 = np.asarray(thetaI_S2)[:n_S2]
+
+    Bx_S2, By_S2 = L1_S2*np.cos(phi_S2), L1_S2*np.sin(phi_S2)
+    Cx_S2, Cy_S2 = L3_S2*np.cos(thetaI_S2+alpha1_S2), L3_S2*np.sin(thetaI_S2+alpha1_S2)
+    Dx_S2, Dy_S2 = L2_S2*np.cos(thetaI_S2), L2_S2*np.sin(thetaI_S2)
+    Cx_S2, Cy_S2, Dx_S2, Dy_S2 = np.broadcast_arrays(Cx_S2, Cy_S2, Dx_S2, Dy_S2)
+
+    if gamma_S2 is None:
+        gamma_S2 = resolver_gamma_S2(Parametros._make(np.reshape(p_S2, (11, -1))[:, :, None]), thetaI_S2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Ex_S2, Ey_S2 = Cx_S2 + L4_S2*np.cos(gamma_S2), Cy_S2 + L4_S2*np.sin(gamma_S2)
+        e1_S2 = np.hypot(Ex_S2-Dx_S2, Ey_S2-Dy_S2)
+        omega_S2 = np.arctan2(Ey_S2-Dy_S2, Ex_S2-Dx_S2)
+        omega2_S2 = _acos((e1_S2**2 + L5_S2**2 - L6_S2**2) / (2 * e1_S2 * L5_S2), excesso)
+        Fx_S2, Fy_S2 = Dx_S2 + L5_S2*np.cos(omega_S2-omega2_S2), Dy_S2 + L5_S2*np.sin(omega_S2-omega2_S2)
+        omega3_S2 = np.arctan2(Ey_S2-Fy_S2, Ex_S2-Fx_S2)
+        Gx_S2, Gy_S2 = Fx_S2 + L8_S2*np.cos(omega3_S2-lambda1_S2), Fy_S2 + L8_S2*np.sin(omega3_S2-lambda1_S2)
+
+        thetaO = np.arctan2(Gy_S2-By_S2, Gx_S2-Bx_S2)
+
+        e2_S2 = np.hypot(Fx_S2-Bx_S2, Fy_S2-By_S2)
+        e3_S2 = np.hypot(Fx_S2-Cx_S2, Fy_S2-Cy_S2)
+
+        mi1_S2 = _acos((L4_S2**2 + L6_S2**2 - e3_S2**2) / (2 * L4_S2 * L6_S2), excesso)
+        mi2_S2 = _acos((L8_S2**2+L9_S2**2-e2_S2**2)/(2*L8_S2*L9_S2), excesso)
+
+    return thetaO, mi1_S2, mi2_S2
+
+
+def funcx_S3_vet(p_S3, thetaI_S3, thetaOd_S3, n_S3, lb_S3, rb_S3):
+    """Versão vetorizada de `funcx_S3`. Ver `funcx_W1_vet`."""
+
+    thetaO, mi1_S3, mi2_S3 = _cinematica_S3_vet(p_S3, thetaI_S3, n_S3)
+    return _fobj_vet(thetaO, mi1_S3, mi2_S3, thetaOd_S3, lb_S3, rb_S3)
+
+
+def _cinematica_S3_vet(p_S3, thetaI_S3, n_S3, excesso=None):
+    """thetaO, mi1 e mi2 do Stephenson 3 como matrizes (S, n). Ver `_cinematica_W1_vet`."""
+
+    L1_S3, L2_S3, L3_S3, L4_S3, L5_S3, L6_S3, L8_S3, L9_S3, phi_S3, alpha1_S3, lambda1_S3 = np.reshape(p_S3, (11, -1))[:, :, None]
+    thetaI_S3 = np.asarray(thetaI_S3)[:n_S3]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Bx_S3, By_S3 = L1_S3*np.cos(phi_S3), L1_S3*np.sin(phi_S3)
+        Cx_S3, Cy_S3 = L2_S3*np.cos(phi_S3+alpha1_S3), L2_S3*np.sin(phi_S3+alpha1_S3)
+        Dx_S3, Dy_S3 = L3_S3*np.cos(thetaI_S3), L3_S3*np.sin(thetaI_S3)
+        e1_S3 = np.hypot(Dx_S3-Cx_S3, Dy_S3-Cy_S3)
+        omega_S3 = _acos((e1_S3**2+L5_S3**2-L4_S3**2)/(2*e1_S3*L5_S3), excesso)
+        beta_S3 = np.arctan2(Dy_S3-Cy_S3, Dx_S3-Cx_S3)
+        Fx_S3, Fy_S3 = Cx_S3 + L5_S3*np.cos(beta_S3-omega_S3), Cy_S3 + L5_S3*np.sin(beta_S3-omega_S3)
+        lambda0_S3 = np.arctan2(Dy_S3-Fy_S3, Dx_S3-Fx_S3)
+        Ex_S3, Ey_S3 = Fx_S3 + L6_S3*np.cos(lambda0_S3-lambda1_S3), Fy_S3 + L6_S3*np.sin(lambda0_S3-lambda1_S3)
+        e2_S3 = np.hypot(Ex_S3-Bx_S3, Ey_S3-By_S3)
+        gamma_S3 = _acos((e2_S3**2+L9_S3**2-L8_S3**2)/(2*e2_S3*L9_S3), excesso)
+        gamma1_S3 = np.arctan2(Ey_S3-By_S3, Ex_S3-Bx_S3)
+
+        mi1_S3 = _acos((L5_S3**2+L4_S3**2-e1_S3**2)/(2*L5_S3*L4_S3), excesso)
+        mi2_S3 = _acos((L8_S3**2+L9_S3**2-e2_S3**2)/(2*L8_S3*L9_S3), excesso)
+
+        thetaO = gamma1_S3-gamma_S3
+
+    return thetaO, mi1_S3, mi2_S3
+
+
+# Pares (escalar, vetorizada) por tipo de mecanismo
+OBJETIVOS = {
+    'W1': (funcx_W1, funcx_W1_vet),
+    'W2': (funcx, funcx_vet),
+    'S1': (funcx_S1, funcx_S1_vet),
+    'S2': (funcx_S2, funcx_S2_vet),
+    'S3': (funcx_S3, funcx_S3_vet),
+}
+
+
+# Cinemáticas vetorizadas por tipo: (p, thetaI, n, excesso=None) -> (thetaO, mi1, mi2)
+CINEMATICAS_VET = {
+    'W1': _cinematica_W1_vet,
+    'W2': _cinematica_W2_vet,
+    'S1': _cinematica_S1_vet,
+    'S2': _cinematica_S2_vet,
+    'S3': _cinematica_S3_vet,
+}
+
+
+# Restrições graduadas (regras de viabilidade de Deb)
+#
+# Com a penalidade fixa acima, todo candidato inválido recebe a mesma
+# energia: enquanto a população não tem nenhum mecanismo que monte em
+# todos os pontos com mi1/mi2 dentro de [lb, rb], a seleção do DE não
+# distingue "quase viável" de "muito longe" e a busca é cega. As versões
+# graduadas medem o quanto cada candidato viola as restrições:
+#
+# - distância (rad) de mi1 e mi2 até [lb, rb], em cada ponto;
+# - excesso dos argumentos de arccos fora de [-1, 1] (elos que não fecham);
+# - pi por ponto onde thetaO não existe por outro motivo (S2 sem solução
+#   para gamma_S2, divisão por zero).
+#
+# Candidatos viáveis valem o erro quadrático; inviáveis valem
+# PENALIDADE_GRADUADA*(1 + violação), acima de qualquer erro possível.
+# Como a seleção do DE (scipy) troca o alvo pelo teste quando
+# energia_teste <= energia_alvo, isso reproduz as regras de Deb: viável
+# vence inviável, entre viáveis o menor erro, entre inviáveis a menor
+# violação. O fator (em vez de uma soma) mantém o critério de parada
+# relativo do DE (desvio <= tol*|média|) sensível à violação enquanto a
+# população inteira é inviável.
+PENALIDADE_GRADUADA = 1e6
+
+
+def _violacao_vet(thetaO, mi1, mi2, lb, rb, excesso):
+    """Violação graduada por candidato e ponto, matriz (S, n). Zero onde é viável."""
+
+    with np.errstate(invalid='ignore'):
+        fora = (np.fmax(lb-mi1, 0) + np.fmax(mi1-rb, 0) + np.fmax(lb-mi2, 0) + np.fmax(mi2-rb, 0))
+    fora = np.nan_to_num(fora, nan=0)
+    sem_solucao = ~np.isfinite(thetaO) & (excesso == 0)
+    return fora + excesso + np.pi*sem_solucao
+
+
+def _fobj_graduada_vet(cinematica_vet, p, thetaI, thetaOd, n, lb, rb):
+    """Energia com restrições graduadas (ver PENALIDADE_GRADUADA)."""
+
+    excesso = np.zeros((np.reshape(p, (11, -1)).shape[1], n))
+    thetaO, mi1, mi2 = cinematica_vet(p, thetaI, n, excesso)
+    violacao = np.sum(_violacao_vet(thetaO, mi1, mi2, lb, rb, excesso), axis=1)
+    with np.errstate(invalid='ignore'):
+        erro = np.sum((thetaO-np.asarray(thetaOd)[:n])**2, axis=1)
+    return np.where(violacao > 0, PENALIDADE_GRADUADA*(1 + violacao), erro)
+
+
+def funcx_W1_graduada_vet(p, thetaI, thetaOd, n, lb, rb):
+    return _fobj_graduada_vet(_cinematica_W1_vet, p, thetaI, thetaOd, n, lb, rb)
+
+
+def funcx_graduada_vet(p, thetaI, thetaOd, n, lb, rb):
+    return _fobj_graduada_vet(_cinematica_W2_vet, p, thetaI, thetaOd, n, lb, rb)
+
+
+def funcx_S1_graduada_vet(p, thetaI, thetaOd, n, lb, rb):
+    return _fobj_graduada_vet(_cinematica_S1_vet, p, thetaI, thetaOd, n, lb, rb)
+
+
+def funcx_S2_graduada_vet(p, thetaI, thetaOd, n, lb, rb):
+    return _fobj_graduada_vet(_cinematica_S2_vet, p, thetaI, thetaOd, n, lb, rb)
+
+
+def funcx_S3_graduada_vet(p, thetaI, thetaOd, n, lb, rb):
+    return _fobj_graduada_vet(_cinematica_S3_vet, p, thetaI, thetaOd, n, lb, rb)
+
+
+def _escalar(funcao_vet):
+    """Versão de um candidato por chamada (modo com `workers`) de uma função vetorizada."""
+
+    def funcao(p, thetaI, thetaOd, n, lb, rb):
+        return float(funcao_vet(np.asarray(p, dtype=float)[:, None], thetaI, thetaOd, n, lb, rb)[0])
+
+    funcao.__name__ = funcao.__qualname__ = funcao_vet.__name__.removesuffix('_vet')
+    return funcao
+
+
+funcx_W1_graduada = _escalar(funcx_W1_graduada_vet)
+funcx_graduada = _escalar(funcx_graduada_vet)
+funcx_S1_graduada = _escalar(funcx_S1_graduada_vet)
+funcx_S2_graduada = _escalar(funcx_S2_graduada_vet)
+funcx_S3_graduada = _escalar(funcx_S3_graduada_vet)
+
+OBJETIVOS_GRADUADOS = {
+    'W1': (funcx_W1_graduada, funcx_W1_graduada_vet),
+    'W2': (funcx_graduada, funcx_graduada_vet),
+    'S1': (funcx_S1_graduada, funcx_S1_graduada_vet),
+    'S2': (funcx_S2_graduada, funcx_S2_graduada_vet),
+    'S3': (funcx_S3_graduada, funcx_S3_graduada_vet),
+}
+
+
+# Avaliação com abandono antecipado
+#
+# Na seleção do DE, o vetor-teste só substitui o alvo se sua energia for
+# <= a do alvo. Como a energia é uma soma por ponto de precisão, assim
+# que a soma parcial passa da energia do alvo o teste já perdeu e os
+# pontos restantes não precisam ser calculados. O motor passa a energia
+# de cada alvo como limite (`motores.de_abandono`); os pontos são
+# avaliados em blocos (o primeiro com BLOCO_PONTOS pontos, cada um com o
+# dobro do anterior, para poucas chamadas vetorizadas), e os candidatos
+# que passaram do limite saem dos blocos seguintes.
+BLOCO_PONTOS = 2
+
+
+class ObjetivoComLimite:
+    """Função objetivo vetorizada de `TipoDeMec` com abandono antecipado.
+
+    Chamada como as funções `funcx_*_vet`, com o argumento extra
+    `limites` (vetor (S,), energia que cada candidato precisa igualar ou
+    bater; None = avaliação completa). Candidatos abandonados retornam a
+    energia parcial, que já é maior que o limite e só serve para perder a
+    seleção; os demais retornam a energia de `OBJETIVOS` (ou de
+    `OBJETIVOS_GRADUADOS`, com `graduadas`), a menos do arredondamento
+    da soma feita por blocos.
+
+    Os pontos vão na ordem em que mais pesaram nos candidatos avaliados
+    por inteiro (contribuição média, com violação contando como
+    `PESO_ORDEM`), refeita a cada chamada, de modo que os pontos que mais
+    derrubam candidatos são vistos primeiro. `custo_medio` é a fração dos
+    pontos de fato calculados desde a criação.
+
+    No Stephenson 2, o ramo de gamma_S2 depende da sequência dos pontos
+    (cada um parte do anterior): gamma_S2 é resolvido antes dos blocos,
+    para todos os candidatos e pontos na ordem natural, como na função
+    completa, e só o restante da cinemática é abandonado.
+    """
+
+    PESO_ORDEM = (2*np.pi)**2
+
+    def __init__(self, TipoDeMec, graduadas=False, bloco=BLOCO_PONTOS):
+        self.cinematica_vet = CINEMATICAS_VET[TipoDeMec]
+        self.graduadas = graduadas
+        self.bloco = bloco
+        self.soma_pontos = None         # contribuição acumulada por ponto (candidatos completos)
+        self.pontos_calculados = 0
+        self.pontos_pedidos = 0
+
+    @property
+    def custo_medio(self):
+        return self.pontos_calculados/self.pontos_pedidos if self.pontos_pedidos else 1.0
+
+    def ordem(self, n):
+        if self.soma_pontos is None or len(self.soma_pontos) != n:
+            return np.arange(n)
+        return np.argsort(-self.soma_pontos, kind='stable')
+
+    def __call__(self, p, thetaI, thetaOd, n, lb, rb, limites=None):
+        P = np.reshape(p, (11, -1))
+        S = P.shape[1]
+        thetaI, thetaOd = np.asarray(thetaI)[:n], np.asarray(thetaOd)[:n]
+        limites = np.full(S, np.inf) if limites is None else np.asarray(limites, dtype=float)
+
+        erro, violacao = np.zeros(S), np.zeros(S)
+        contribuicao = np.zeros((S, n))
+        ativos = np.arange(S)
+        ordem = self.ordem(n)
+        gammas = None
+        if self.cinematica_vet is _cinematica_S2_vet:
+            gammas = resolver_gamma_S2(Parametros._make(P[:, :, None]), thetaI)
+        inicio, bloco = 0, self.bloco
+        while inicio < n and len(ativos):
+            pontos = ordem[inicio:inicio+bloco]
+            inicio, bloco = inicio + bloco, 2*bloco
+            excesso = np.zeros((len(ativos), len(pontos))) if self.graduadas else None
+            ramo = {} if gammas is None else {'gamma_S2': gammas[np.ix_(ativos, pontos)]}
+            thetaO, mi1, mi2 = self.cinematica_vet(P[:, ativos], thetaI[pontos], len(pontos), excesso, **ramo)
+            self.pontos_calculados += len(ativos)*len(pontos)
+
+            with np.errstate(invalid='ignore'):
+                if self.graduadas:
+                    violacao_pontos = _violacao_vet(thetaO, mi1, mi2, lb, rb, excesso)
+                    erro_pontos = (thetaO-thetaOd[pontos])**2
+                    invalido = violacao_pontos > 0
+                    violacao[ativos] += np.sum(violacao_pontos, axis=1)
+                else:
+                    # Mesma penalidade de `_fobj_vet`
+                    invalido = ~(np.isfinite(thetaO) & (mi1 >= lb) & (mi1 <= rb) & (mi2 >= lb) & (mi2 <= rb))
+                    erro_pontos = (np.where(invalido, 999999999999, thetaO)-thetaOd[pontos])**2
+                erro[ativos] += np.sum(erro_pontos, axis=1)
+            contribuicao[np.ix_(ativos, pontos)] = np.where(invalido, self.PESO_ORDEM, erro_pontos)
+
+            energia = self._energia(erro[ativos], violacao[ativos])
+            ativos = ativos[energia <= limites[ativos]]
+
+        self.pontos_pedidos += S*n
+        if len(ativos):
+            if self.soma_pontos is None or len(self.soma_pontos) != n:
+                self.soma_pontos = np.zeros(n)
+            self.soma_pontos += np.sum(contribuicao[ativos], axis=0)
+        return self._energia(erro, violacao)
+
+    def _energia(self, erro, violacao):
+        if self.graduadas:
+            return np.where(violacao > 0, PENALIDADE_GRADUADA*(1 + violacao), erro)
+        return erro
+
+
+def com_limite(funcao_vet, bloco=BLOCO_PONTOS):
+    """`ObjetivoComLimite` equivalente a `funcao_vet` (de `OBJETIVOS` ou `OBJETIVOS_GRADUADOS`), ou None."""
+
+    for tabela, graduadas in ((OBJETIVOS, False), (OBJETIVOS_GRADUADOS, True)):
+        for TipoDeMec, (_, vet) in tabela.items():
+            if vet is funcao_vet:
+                return ObjetivoComLimite(TipoDeMec, graduadas, bloco)
+    return None
@@ -0,0 +1,205 @@
+"""Critérios de parada da síntese, chamados a cada geração do DE.
+
+Cada critério recebe o `intermediate_result` da geração (como os
+callbacks do scipy e dos motores de `motores`) e retorna True para
+interromper a busca. A interface e o executor em lote os consultam
+junto com o cancelamento.
+
+- `AlvoAtingido`: para assim que o melhor membro passa na mesma
+  conferência feita depois da otimização (erro de cada ponto dentro de
+  uma tolerância angular e mi1/mi2 dentro dos limites, com margem).
+- `Orcamento`: para quando o tempo de relógio ou o número de avaliações
+  da função objetivo passa do orçamento, e informa quanto foi usado.
+- `Estagnacao`: acompanha a diversidade da população e a melhora da
+  melhor energia a cada geração e acusa a estagnação (usado pelos
+  reinícios de `motores.de_reinicios`).
+- `Criterios`: lista de critérios usada como um único callback.
+"""
+
+import math
+import time
+
+import numpy as np
+
+from .cinematica import Parametros, posicao
+
+
+TOLERANCIA_PADRAO = 5       # graus, como na conferência da interface
+MARGEM_PADRAO = 0           # graus de folga de mi1/mi2 até [lb, rb]
+MAXITER_ORCAMENTO = 10**6   # maxiter quando um orçamento governa a parada
+GERACOES_ESTAGNACAO = 300   # gerações sem melhora relevante da melhor energia
+MELHORA_MINIMA = 1e-3       # melhora relativa que conta como progresso
+DIVERSIDADE_MINIMA = 1e-3   # desvio padrão médio da população no cubo unitário
+
+
+class AlvoAtingido:
+    """Para o DE quando o melhor membro atende ao alvo de precisão.
+
+    args: (thetaI, thetaOd, n, lb, rb), como nas funções objetivo.
+    tolerancia: erro máximo de thetaO em cada ponto (graus).
+    margem: distância mínima de mi1 e mi2 aos limites [lb, rb] (graus).
+
+    A conferência ponto a ponto (`confere`) só roda quando a energia do
+    melhor mudou e é compatível com o alvo (erro <= tolerância em todos
+    os pontos implica energia <= n*tolerância²), o que a deixa fora da
+    maioria das gerações. `nit` guarda a geração em que o alvo foi
+    atingido (None enquanto não foi).
+    """
+
+    def __init__(self, TipoDeMec, args, tolerancia=TOLERANCIA_PADRAO, margem=MARGEM_PADRAO):
+        self.TipoDeMec = TipoDeMec
+        self.thetaI, self.thetaOd, self.n, self.lb, self.rb = args
+        self.tolerancia = math.radians(tolerancia)
+        self.margem = math.radians(margem)
+        self.nit = None
+        self._ultima_energia = None
+
+    @property
+    def atingido(self):
+        return self.nit is not None
+
+    def confere(self, x):
+        """True se o vetor `x` atende ao alvo em todos os pontos de precisão."""
+
+        par = Parametros._make(np.asarray(x, dtype=float))
+        for AngE, AngS in zip(self.thetaI[:self.n], self.thetaOd[:self.n]):
+            try:
+                *_, mi1, mi2, thetaO = posicao(self.TipoDeMec, par, AngE)
+            except (ValueError, ZeroDivisionError):
+                return False
+            folga = min(mi1 - self.lb, self.rb - mi1, mi2 - self.lb, self.rb - mi2)
+            if not abs(thetaO - AngS) <= self.tolerancia or not folga >= self.margem:
+                return False
+        return True
+
+    def __call__(self, intermediate_result):
+        energia = intermediate_result.fun
+        if energia > self.n*self.tolerancia**2 or energia == self._ultima_energia:
+            return False
+        self._ultima_energia = energia
+        if self.confere(intermediate_result.x):
+            self.nit = intermediate_result.nit
+            return True
+        return False
+
+
+class Orcamento:
+    """Para o DE quando o orçamento de tempo ou de avaliações acaba.
+
+    segundos: tempo de relógio desde a criação do orçamento.
+    avaliacoes: avaliações da função objetivo, contadas como tamanho da
+    população x (gerações + 1). A conta vale igual para todos os motores
+    (no modo vetorizado o scipy conta chamadas em `nfev`, não
+    candidatos; no DE em ilhas a população é a união das ilhas) e soma
+    as execuções seguidas do DE de uma mesma síntese (duas etapas,
+    reinícios), reconhecidas pela volta da contagem de gerações ou pelo
+    aumento do tamanho da população. Uma população que encolhe (L-SHADE)
+    continua a mesma execução.
+    None em ambos = sem limite (só registra o uso).
+
+    O orçamento é conferido ao fim de cada geração (de cada época, no DE
+    em ilhas), então pode passar em até uma geração. O polimento final
+    fica fora dele, mas entra no tempo de `relatorio`.
+    """
+
+    def __init__(self, segundos=None, avaliacoes=None):
+        self.segundos = segundos
+        self.avaliacoes = avaliacoes
+        self.inicio = time.monotonic()
+        self.avaliacoes_usadas = 0
+        self.esgotado = False
+        self._nit = None
+        self._tamanho = None
+
+    def decorrido(self):
+        return time.monotonic() - self.inicio
+
+    def fracao(self):
+        """Fração usada do orçamento (a maior entre tempo e avaliações, até 1), ou None sem limite."""
+
+        fracoes = []
+        if self.segundos:
+            fracoes.append(self.decorrido()/self.segundos)
+        if self.avaliacoes:
+            fracoes.append(self.avaliacoes_usadas/self.avaliacoes)
+        return min(1.0, max(fracoes)) if fracoes else None
+
+    def __call__(self, intermediate_result):
+        nit, tamanho = intermediate_result.nit, len(intermediate_result.population)
+        if self._nit is None or nit < self._nit:
+            # Nova execução do DE: população inicial + gerações feitas
+            self.avaliacoes_usadas += tamanho*(nit + 1)
+        elif tamanho > self._tamanho:
+            # Reinício com população maior (a contagem de gerações segue acumulada)
+            self.avaliacoes_usadas += tamanho*(nit - self._nit + 1)
+        else:
+            self.avaliacoes_usadas += tamanho*(nit - self._nit)
+        self._nit, self._tamanho = nit, tamanho
+        self.esgotado = ((self.segundos is not None and self.decorrido() >= self.segundos)
+                         or (self.avaliacoes is not None and self.avaliacoes_usadas >= self.avaliacoes))
+        return self.esgotado
+
+    def relatorio(self):
+        """Texto com o uso do orçamento, para o resumo da otimização."""
+
+        decorrido = self.decorrido()
+        partes = [f"{decorrido:.1f} de {self.segundos:g} s ({decorrido/self.segundos:.0%})" if self.segundos
+                  else f"{decorrido:.1f} s",
+                  f"{self.avaliacoes_usadas} de {self.avaliacoes} avaliações ({self.avaliacoes_usadas/self.avaliacoes:.0%})"
+                  if self.avaliacoes else f"{self.avaliacoes_usadas} avaliações"]
+        return f"orçamento {'esgotado' if self.esgotado else 'usado'}: {', '.join(partes)}"
+
+
+class Estagnacao:
+    """Acusa a estagnação do DE, para reiniciar a busca em outra região.
+
+    A cada geração registra em `historico` (geração, melhor energia,
+    diversidade), onde a diversidade é o desvio padrão médio dos
+    parâmetros da população normalizada pelos limites `bounds` (0 para
+    uma população colapsada num ponto, cerca de 0.29 para uma uniforme).
+
+    A busca está estagnada quando a melhor energia não melhora mais que
+    `melhora` (relativa) em `geracoes` gerações seguidas, ou quando a
+    diversidade cai abaixo de `diversidade`: a população caiu numa bacia
+    (muitas vezes inviável, com a penalidade fixa) de onde não sai, mas
+    o critério do scipy não para porque a energia dos membros inviáveis
+    mantém o desvio alto. `reiniciar` zera o acompanhamento.
+    """
+
+    def __init__(self, bounds, geracoes=GERACOES_ESTAGNACAO, melhora=MELHORA_MINIMA, diversidade=DIVERSIDADE_MINIMA):
+        limites = np.asarray(bounds, dtype=float)
+        self.inferior, self.amplitude = limites[:, 0], limites[:, 1] - limites[:, 0]
+        self.geracoes = geracoes
+        self.melhora = melhora
+        self.diversidade = diversidade
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.historico = []
+        self.estagnado = False
+        self._referencia = None     # melhor energia da última melhora relevante
+        self._nit_referencia = 0
+
+    def diversidade_de(self, populacao):
+        return float(np.mean(np.std((np.asarray(populacao) - self.inferior)/self.amplitude, axis=0)))
+
+    def __call__(self, intermediate_result):
+        nit, energia = intermediate_result.nit, float(intermediate_result.fun)
+        diversidade = self.diversidade_de(intermediate_result.population)
+        self.historico.append((nit, energia, diversidade))
+        if self._referencia is None or energia < self._referencia - self.melhora*abs(self._referencia):
+            self._referencia, self._nit_referencia = energia, nit
+        self.estagnado = nit - self._nit_referencia >= self.geracoes or diversidade < self.diversidade
+        return self.estagnado
+
+
+class Criterios(list):
+    """Lista de critérios usada como callback: interrompe se algum deles pedir.
+
+    Todos são consultados a cada geração, mesmo depois de um pedir a
+    parada: `Orcamento` e `Estagnacao` registram o uso e o histórico da
+    geração em que são chamados.
+    """
+
+    def __call__(self, intermediate_result):
+        return any([criterio(intermediate_result) for criterio in self])
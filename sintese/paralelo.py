@@ -0,0 +1,225 @@
+"""Pool de processos persistente para avaliar a função objetivo.
+
+`differential_evolution(..., workers=-1)` cria um `multiprocessing.Pool`
+novo a cada chamada e serializa a função e os argumentos
+(thetaI, thetaOd, n, lb, rb) em todo `map`. `PoolPersistente` é criado
+uma vez pela aplicação e reaproveitado entre execuções e abas:
+
+- `carregar(funcao, args)` grava a definição do problema (função e
+  argumentos serializados) uma única vez em memória compartilhada;
+- cada processo lê essa definição na primeira tarefa do problema e a
+  guarda em cache; depois disso só recebe vetores candidatos.
+
+O `Problema` retornado serve de função objetivo e de `workers` (map)
+para o scipy, e de avaliador para `motores.de_assincrono`.
+
+`PoolPersistente.calibrar` mede, numa população de teste, o custo de
+cada forma de avaliação (vetorizada no próprio processo, threads ou
+processos com lotes de tamanhos diferentes) e escolhe a mais rápida
+para aquele mecanismo e tamanho de problema.
+"""
+
+import math
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+
+BACKENDS = ('vetorizado', 'threads', 'processos')
+
+_FOLGA = 4              # calibração: formas mais lentas que isso vezes a melhor são descartadas
+_CACHE_MAX = 4          # problemas guardados por processo (ex.: as duas etapas de `decomposicao`)
+_problemas = {}         # cache do processo de trabalho: nome da memória compartilhada -> (funcao, args)
+
+
+def _problema_do_processo(nome, tamanho):
+    """(funcao, args) do problema `nome`, lidos da memória compartilhada só na primeira vez."""
+
+    problema = _problemas.get(nome)
+    if problema is None:
+        memoria = shared_memory.SharedMemory(nome)
+        try:
+            problema = pickle.loads(bytes(memoria.buf[:tamanho]))
+        finally:
+            memoria.close()
+        if len(_problemas) >= _CACHE_MAX:
+            del _problemas[next(iter(_problemas))]
+        _problemas[nome] = problema
+    return problema
+
+
+def _avaliar(nome, tamanho, X):
+    """Avalia o problema `nome` em cada linha de `X` (executa no processo de trabalho)."""
+
+    funcao, args = _problema_do_processo(nome, tamanho)
+    return [funcao(x, *args) for x in X]
+
+
+class Problema:
+    """Problema carregado em um `PoolPersistente` (função objetivo + argumentos fixos).
+
+    - `problema(x)`: avaliação no próprio processo (usada no polimento do scipy);
+    - `problema.mapa(func, populacao)`: map compatível com `workers` do scipy
+      (ignora `func`, que é o próprio problema, e envia só os vetores em
+      lotes de `lote` candidatos);
+    - `problema.mapa_threads(func, populacao)`: o mesmo, em threads do
+      próprio processo;
+    - `problema.submeter(X)`: `Future` com as energias das linhas de `X`.
+
+    Use como gerenciador de contexto (ou chame `liberar`) para apagar a
+    memória compartilhada ao fim da otimização.
+    """
+
+    def __init__(self, pool, funcao, args, lote=None):
+        dados = pickle.dumps((funcao, tuple(args)), protocol=pickle.HIGHEST_PROTOCOL)
+        self.pool = pool
+        self.funcao = funcao
+        self.args = tuple(args)
+        self.lote = lote
+        self.tamanho = len(dados)
+        self.memoria = shared_memory.SharedMemory(create=True, size=self.tamanho)
+        self.memoria.buf[:self.tamanho] = dados
+
+    def __call__(self, x):
+        return self.funcao(x, *self.args)
+
+    def submeter(self, X):
+        return self.pool.executor.submit(_avaliar, self.memoria.name, self.tamanho, np.asarray(X))
+
+    def _lotes(self, populacao):
+        X = np.asarray(list(populacao))
+        lote = self.lote or math.ceil(len(X)/self.pool.processos)
+        return [X[k:k+lote] for k in range(0, len(X), lote)]
+
+    def _avaliar_local(self, X):
+        return [self.funcao(x, *self.args) for x in X]
+
+    def mapa(self, func, populacao):
+        futuros = [self.submeter(X) for X in self._lotes(populacao)]
+        return [energia for futuro in futuros for energia in futuro.result()]
+
+    def mapa_threads(self, func, populacao):
+        lotes = self.pool.threads().map(self._avaliar_local, self._lotes(populacao))
+        return [energia for energias in lotes for energia in energias]
+
+    def liberar(self):
+        if self.memoria is not None:
+            self.memoria.close()
+            self.memoria.unlink()
+            self.memoria = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.liberar()
+
+
+class Escolha(NamedTuple):
+    """Resultado de `PoolPersistente.calibrar`."""
+
+    backend: str                # um de BACKENDS
+    lote: int                   # candidatos por tarefa (threads e processos)
+    tempos: dict                # (backend, lote) -> segundos por população
+
+    @property
+    def descricao(self):
+        if self.backend == 'vetorizado':
+            return 'vetorizado'
+        return f"{self.backend} (lote {self.lote})"
+
+
+def _cronometrar(avaliar, limite=np.inf, repeticoes=2):
+    """Menor tempo de `avaliar()` em algumas repetições, após uma chamada de aquecimento.
+
+    Se já o aquecimento passa de `limite`, retorna esse tempo sem repetir
+    (a forma de avaliação está claramente descartada).
+    """
+
+    inicio = time.perf_counter()
+    avaliar()
+    aquecimento = time.perf_counter() - inicio
+    if aquecimento > limite:
+        return aquecimento
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        avaliar()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+class PoolPersistente:
+    """Processos de trabalho criados uma vez e reaproveitados entre otimizações."""
+
+    def __init__(self, processos=-1):
+        self.processos = os.cpu_count() if processos == -1 else processos
+        self.executor = ProcessPoolExecutor(self.processos)
+        self.executor_threads = None
+        self.calibracoes = {}
+
+    def threads(self):
+        """Pool de threads do próprio processo (criado na primeira chamada)."""
+
+        if self.executor_threads is None:
+            self.executor_threads = ThreadPoolExecutor(self.processos)
+        return self.executor_threads
+
+    def carregar(self, funcao, args=(), lote=None):
+        """Grava `funcao` e `args` em memória compartilhada e retorna o `Problema`."""
+
+        return Problema(self, funcao, args, lote)
+
+    def calibrar(self, funcao, funcao_vet, bounds, args, popsize=15, seed=None):
+        """Escolhe a forma de avaliação mais rápida para este problema.
+
+        Avalia uma população aleatória de `popsize * N` candidatos com
+        `funcao_vet` no próprio processo, com `funcao` em threads e com
+        `funcao` nos processos (lotes de S/p, S/2p e S/4p candidatos) e
+        fica com a de menor tempo. Formas muito mais lentas que a melhor
+        até o momento (mais de `_FOLGA` vezes) são descartadas sem
+        repetir nem testar os outros lotes. A escolha é guardada por mecanismo
+        (função objetivo), tamanho do problema e tamanho da população (o
+        lote ótimo depende de S), então só a primeira otimização de cada
+        combinação paga a calibração.
+        """
+
+        # Argumentos texto (ex.: o tipo de mecanismo em `normalizacao`) entram pelo valor, os demais pela forma
+        chave = (funcao.__module__, funcao.__qualname__, len(bounds), popsize,
+                 tuple(a if isinstance(a, str) else np.shape(a) for a in args))
+        if chave in self.calibracoes:
+            return self.calibracoes[chave]
+
+        limites = np.asarray(bounds, dtype=float)
+        S = popsize*len(limites)
+        X = np.random.default_rng(seed).uniform(limites[:, 0], limites[:, 1], (S, len(limites)))
+        lotes = sorted({math.ceil(S/(k*self.processos)) for k in (1, 2, 4)}, reverse=True)
+
+        tempos = {}
+        if funcao_vet is not None:
+            tempos['vetorizado', S] = _cronometrar(lambda: funcao_vet(X.T, *args))
+        with self.carregar(funcao, args) as problema:
+            formas = {'processos': problema.mapa}
+            if self.processos > 1:
+                formas['threads'] = problema.mapa_threads
+            for backend, mapa in formas.items():
+                for lote in lotes:
+                    problema.lote = lote
+                    limite = _FOLGA*min(tempos.values(), default=np.inf)
+                    tempos[backend, lote] = _cronometrar(lambda: mapa(None, X), limite)
+                    if tempos[backend, lote] > limite:
+                        break
+
+        backend, lote = min(tempos, key=tempos.get)
+        escolha = self.calibracoes[chave] = Escolha(backend, lote, tempos)
+        return escolha
+
+    def encerrar(self):
+        self.executor.shutdown(cancel_futures=True)
+        if self.executor_threads is not None:
+            self.executor_threads.shutdown(cancel_futures=True)
@@ -0,0 +1,278 @@
+"""Refinamento local da solução do DE por mínimos quadrados.
+
+O DE para com `tol=1e-2`, longe da precisão que a geometria permite. O
+polimento padrão do scipy (L-BFGS-B sobre a função objetivo escalar,
+com gradiente por diferenças finitas e a penalidade 999999999999) gasta
+muitas avaliações e para no primeiro passo que toca a penalidade.
+
+Aqui o refinamento usa `scipy.optimize.least_squares` sobre os resíduos
+de cada ponto de precisão (thetaO - thetaOd), com o jacobiano exato: as
+derivadas são propagadas pela mesma cadeia de díades do fechamento de
+cada mecanismo (regra da cadeia em modo direto, ver `_Jato`). No
+Stephenson 2, gamma_S2 é implícito e sua derivada sai do teorema da
+função implícita aplicado à equação de fechamento L9 - |G - B| = 0.
+
+Os limites do ângulo de transmissão entram como restrições: cada
+violação de mi1 ou mi2 em relação a [lb, rb] (com uma folga de
+`FOLGA_MI`) vira um resíduo extra, com peso crescente até a solução ficar
+viável. O resultado só é aceito se a função objetivo original (com as
+mesmas restrições do DE) melhorar.
+"""
+
+import math
+
+import numpy as np
+from scipy.optimize import least_squares
+
+from .cinematica import Parametros, resolver_gamma_S2
+from .objetivos import OBJETIVOS
+
+
+FOLGA_MI = math.radians(0.05)           # distância mínima de mi1/mi2 aos limites na solução refinada
+PESOS = (1e2, 1e4, 1e6)                 # pesos das violações de mi, tentados em ordem até a solução ficar viável
+AVALIACOES_MAX = 200                    # avaliações de resíduos por peso
+
+
+class _Jato:
+    """Valor (m,) e derivadas (k, m) em relação aos k parâmetros."""
+
+    __array_ufunc__ = None      # arrays do numpy delegam as operações aritméticas ao _Jato
+
+    def __init__(self, v, d):
+        self.v = v
+        self.d = d
+
+    @staticmethod
+    def de(valor):
+        return valor if isinstance(valor, _Jato) else _Jato(np.asarray(valor, dtype=float), 0.0)
+
+    def __add__(self, outro):
+        outro = _Jato.de(outro)
+        return _Jato(self.v + outro.v, self.d + outro.d)
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        outro = _Jato.de(outro)
+        return _Jato(self.v - outro.v, self.d - outro.d)
+
+    def __rsub__(self, outro):
+        return _Jato.de(outro) - self
+
+    def __mul__(self, outro):
+        outro = _Jato.de(outro)
+        return _Jato(self.v*outro.v, self.d*outro.v + self.v*outro.d)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        outro = _Jato.de(outro)
+        return _Jato(self.v/outro.v, (self.d*outro.v - self.v*outro.d)/outro.v**2)
+
+    def __rtruediv__(self, outro):
+        return _Jato.de(outro)/self
+
+    def __pow__(self, k):
+        return _Jato(self.v**k, k*self.v**(k - 1)*self.d)
+
+    def __neg__(self):
+        return _Jato(-self.v, -self.d)
+
+
+def _cos(a):
+    a = _Jato.de(a)
+    return _Jato(np.cos(a.v), -np.sin(a.v)*a.d)
+
+
+def _sin(a):
+    a = _Jato.de(a)
+    return _Jato(np.sin(a.v), np.cos(a.v)*a.d)
+
+
+def _hipot(x, y):
+    x, y = _Jato.de(x), _Jato.de(y)
+    r = np.hypot(x.v, y.v)
+    return _Jato(r, (x.v*x.d + y.v*y.d)/r)
+
+
+def _atan2(y, x):
+    y, x = _Jato.de(y), _Jato.de(x)
+    return _Jato(np.arctan2(y.v, x.v), (x.v*y.d - y.v*x.d)/(x.v**2 + y.v**2))
+
+
+def _acos(a):
+    a = _Jato.de(a)
+    return _Jato(np.arccos(a.v), -a.d/np.sqrt(1 - a.v**2))
+
+
+def _variaveis(x, k=11):
+    """Os 11 parâmetros como `_Jato`s com derivadas unitárias (k >= 11 linhas de derivadas)."""
+
+    identidade = np.eye(k)
+    return Parametros._make(_Jato(np.array([x[j]], dtype=float), identidade[:, j:j+1]) for j in range(11))
+
+
+# Cadeias de fechamento (mesmas equações de `objetivos`), retornando thetaO, mi1 e mi2
+def _cadeia_W1(par, thetaI):
+    Bx, By = par.L1*_cos(par.phi), par.L1*_sin(par.phi)
+    Cx, Cy = par.L2*np.cos(thetaI), par.L2*np.sin(thetaI)
+    e1 = _hipot(Bx - Cx, By - Cy)
+    omega = _atan2(By - Cy, Bx - Cx)
+    delta = _acos((par.L3**2 + e1**2 - par.L4**2)/(2*e1*par.L3))
+    Dx, Dy = Cx + par.L3*_cos(delta + omega), Cy + par.L3*_sin(delta + omega)
+    Ex, Ey = Cx + par.L5*_cos(delta + omega + par.alpha1), Cy + par.L5*_sin(delta + omega + par.alpha1)
+    thetaO = _atan2(Dy - By, Dx - Bx) - par.lambda1
+    Gx, Gy = Bx + par.L6*_cos(thetaO), By + par.L6*_sin(thetaO)
+    e2 = _hipot(Ex - Gx, Ey - Gy)
+    mi1 = _acos((par.L4**2 + par.L3**2 - e1**2)/(2*par.L4*par.L3))
+    mi2 = _acos((par.L8**2 + par.L9**2 - e2**2)/(2*par.L8*par.L9))
+    return thetaO, mi1, mi2
+
+
+def _cadeia_W2(par, thetaI):
+    Bx, By = par.L1*_cos(par.phi), par.L1*_sin(par.phi)
+    Cx, Cy = par.L2*_cos(par.phi + par.alpha1), par.L2*_sin(par.phi + par.alpha1)
+    Dx, Dy = par.L3*np.cos(thetaI), par.L3*np.sin(thetaI)
+    x1 = _hipot(Dx - Cx, Dy - Cy)
+    Beta1 = _atan2(Cy - Dy, Cx - Dx)
+    Beta2 = _acos((par.L4**2 + x1**2 - par.L5**2)/(2*par.L4*x1))
+    Ex, Ey = Dx + par.L4*_cos(Beta1 + Beta2), Dy + par.L4*_sin(Beta1 + Beta2)
+    lambda0 = _atan2(Ey - Cy, Ex - Cx)
+    Fx, Fy = Cx + par.L6*_cos(lambda0 - par.lambda1), Cy + par.L6*_sin(lambda0 - par.lambda1)
+    x2 = _hipot(Fx - Bx, Fy - By)
+    psi = _atan2(Fy - By, Fx - Bx)
+    omega2 = _acos((x2**2 + par.L9**2 - par.L8**2)/(2*par.L9*x2))
+    mi1 = _acos((par.L4**2 + par.L5**2 - x1**2)/(2*par.L4*par.L5))
+    mi2 = _acos((par.L8**2 + par.L9**2 - x2**2)/(2*par.L8*par.L9))
+    return psi - omega2, mi1, mi2
+
+
+def _cadeia_S1(par, thetaI):
+    Bx, By = par.L1*_cos(par.phi), par.L1*_sin(par.phi)
+    Cx, Cy = par.L2*_cos(thetaI + par.alpha1), par.L2*_sin(thetaI + par.alpha1)
+    Dx, Dy = par.L3*np.cos(thetaI), par.L3*np.sin(thetaI)
+    e1 = _hipot(Dx - Bx, Dy - By)
+    beta = _atan2(By - Dy, Bx - Dx)
+    omega = _acos((e1**2 + par.L5**2 - par.L4**2)/(2*e1*par.L5))
+    Ex, Ey = Dx + par.L5*_cos(beta + omega), Dy + par.L5*_sin(beta + omega)
+    thetaO = _atan2(Ey - By, Ex - Bx) - par.lambda1
+    Fx, Fy = Bx + par.L6*_cos(thetaO), By + par.L6*_sin(thetaO)
+    e2 = _hipot(Cx - Fx, Cy - Fy)
+    mi1 = _acos((par.L5**2 + par.L4**2 - e1**2)/(2*par.L5*par.L4))
+    mi2 = _acos((par.L9**2 + par.L8**2 - e2**2)/(2*par.L9*par.L8))
+    return thetaO, mi1, mi2
+
+
+def _cadeia_S2(par, thetaI, gamma):
+    """thetaO, mi1, mi2 e o resíduo de fechamento L9 - |G - B| do Stephenson 2 para um gamma_S2 dado."""
+
+    Bx, By = par.L1*_cos(par.phi), par.L1*_sin(par.phi)
+    Cx, Cy = par.L3*_cos(thetaI + par.alpha1), par.L3*_sin(thetaI + par.alpha1)
+    Dx, Dy = par.L2*np.cos(thetaI), par.L2*np.sin(thetaI)
+    Ex, Ey = Cx + par.L4*_cos(gamma), Cy + par.L4*_sin(gamma)
+    e1 = _hipot(Ex - Dx, Ey - Dy)
+    omega = _atan2(Ey - Dy, Ex - Dx)
+    omega2 = _acos((e1**2 + par.L5**2 - par.L6**2)/(2*e1*par.L5))
+    Fx, Fy = Dx + par.L5*_cos(omega - omega2), Dy + par.L5*_sin(omega - omega2)
+    omega3 = _atan2(Ey - Fy, Ex - Fx)
+    Gx, Gy = Fx + par.L8*_cos(omega3 - par.lambda1), Fy + par.L8*_sin(omega3 - par.lambda1)
+    thetaO = _atan2(Gy - By, Gx - Bx)
+    e2 = _hipot(Fx - Bx, Fy - By)
+    e3 = _hipot(Fx - Cx, Fy - Cy)
+    mi1 = _acos((par.L4**2 + par.L6**2 - e3**2)/(2*par.L4*par.L6))
+    mi2 = _acos((par.L8**2 + par.L9**2 - e2**2)/(2*par.L8*par.L9))
+    return thetaO, mi1, mi2, par.L9 - _hipot(Gx - Bx, Gy - By)
+
+
+def _cadeia_S3(par, thetaI):
+    Bx, By = par.L1*_cos(par.phi), par.L1*_sin(par.phi)
+    Cx, Cy = par.L2*_cos(par.phi + par.alpha1), par.L2*_sin(par.phi + par.alpha1)
+    Dx, Dy = par.L3*np.cos(thetaI), par.L3*np.sin(thetaI)
+    e1 = _hipot(Dx - Cx, Dy - Cy)
+    omega = _acos((e1**2 + par.L5**2 - par.L4**2)/(2*e1*par.L5))
+    beta = _atan2(Dy - Cy, Dx - Cx)
+    Fx, Fy = Cx + par.L5*_cos(beta - omega), Cy + par.L5*_sin(beta - omega)
+    lambda0 = _atan2(Dy - Fy, Dx - Fx)
+    Ex, Ey = Fx + par.L6*_cos(lambda0 - par.lambda1), Fy + par.L6*_sin(lambda0 - par.lambda1)
+    e2 = _hipot(Ex - Bx, Ey - By)
+    gamma = _acos((e2**2 + par.L9**2 - par.L8**2)/(2*e2*par.L9))
+    mi1 = _acos((par.L5**2 + par.L4**2 - e1**2)/(2*par.L5*par.L4))
+    mi2 = _acos((par.L8**2 + par.L9**2 - e2**2)/(2*par.L8*par.L9))
+    return _atan2(Ey - By, Ex - Bx) - gamma, mi1, mi2
+
+
+def _implicito_S2(x, thetaI):
+    """Cadeia do Stephenson 2 com gamma_S2 do fechamento e dgamma/dx pela função implícita."""
+
+    gamma = np.asarray(resolver_gamma_S2(Parametros._make(x), thetaI), dtype=float)
+    # Derivadas parciais do fechamento em relação aos 11 parâmetros e a gamma (12ª linha)
+    *_, fechamento = _cadeia_S2(_variaveis(x, 12), thetaI, _Jato(gamma, np.eye(12)[:, 11:12]))
+    dgamma = -fechamento.d[:11]/fechamento.d[11]
+    thetaO, mi1, mi2, _ = _cadeia_S2(_variaveis(x), thetaI, _Jato(gamma, dgamma))
+    return thetaO, mi1, mi2
+
+
+_CADEIAS = {
+    'W1': lambda x, thetaI: _cadeia_W1(_variaveis(x), thetaI),
+    'W2': lambda x, thetaI: _cadeia_W2(_variaveis(x), thetaI),
+    'S1': lambda x, thetaI: _cadeia_S1(_variaveis(x), thetaI),
+    'S2': _implicito_S2,
+    'S3': lambda x, thetaI: _cadeia_S3(_variaveis(x), thetaI),
+}
+
+
+def residuos(TipoDeMec, x, thetaI, thetaOd, lb, rb, peso=PESOS[0]):
+    """Resíduos (erros de thetaO e violações ponderadas de mi1/mi2) e seu jacobiano (m x 11)."""
+
+    thetaO, mi1, mi2 = _CADEIAS[TipoDeMec](np.asarray(x, dtype=float), thetaI)
+    partes = [thetaO - thetaOd]
+    for mi in (mi1, mi2):
+        for violacao in (lb + FOLGA_MI - mi, mi - (rb - FOLGA_MI)):
+            ativa = violacao.v > 0
+            partes.append(_Jato(np.where(ativa, violacao.v, 0.0), np.where(ativa, violacao.d, 0.0))*math.sqrt(peso))
+    r = np.concatenate([np.broadcast_to(parte.v, np.shape(thetaI)) for parte in partes])
+    J = np.concatenate([np.broadcast_to(parte.d, (11,) + np.shape(thetaI)).T for parte in partes])
+    return r, J
+
+
+def refinar(TipoDeMec, resultado, bounds, args):
+    """Refina `resultado.x` por mínimos quadrados e retorna o resultado atualizado.
+
+    args: (thetaI, thetaOd, n, lb, rb), como nas funções objetivo. O
+    vetor refinado só substitui o do DE se a função objetivo original
+    diminuir; `nfev` soma as avaliações de resíduos e de jacobianos.
+    """
+
+    thetaI, thetaOd, n, lb, rb = args
+    thetaI, thetaOd = np.asarray(thetaI, dtype=float)[:n], np.asarray(thetaOd, dtype=float)[:n]
+    funcao = OBJETIVOS[TipoDeMec][0]
+    limites = np.asarray(bounds, dtype=float)
+    # least_squares exige partida dentro dos limites
+    x = np.clip(np.asarray(resultado.x, dtype=float), limites[:, 0], limites[:, 1])
+
+    melhor = resultado.fun
+    refinado = type(resultado)(resultado)
+    for peso in PESOS:
+        ultimo = {}
+
+        def avaliar(x):
+            if ultimo.get('x') is None or not np.array_equal(ultimo['x'], x):
+                ultimo['x'] = x.copy()
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    ultimo['r'], ultimo['J'] = residuos(TipoDeMec, x, thetaI, thetaOd, lb, rb, peso)
+            return ultimo
+
+        if not np.all(np.isfinite(avaliar(x)['r'])):
+            break       # a partida não monta em algum ponto: não há o que refinar
+        ajuste = least_squares(lambda x: avaliar(x)['r'], x, jac=lambda x: avaliar(x)['J'],
+                               bounds=(limites[:, 0], limites[:, 1]), method='trf', x_scale='jac',
+                               max_nfev=AVALIACOES_MAX)
+        refinado.nfev += ajuste.nfev + (ajuste.njev or 0)
+        energia = funcao(ajuste.x, *args)
+        if energia < melhor:
+            melhor = energia
+            refinado.x, refinado.fun = ajuste.x, float(energia)
+        if np.all(ajuste.fun[len(thetaI):] == 0):
+            break       # nenhuma violação de mi ativa: pesos maiores não mudariam nada
+        x = ajuste.x
+    return refinado
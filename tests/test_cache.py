@@ -0,0 +1,71 @@
+"""Cache em disco de resultados de síntese (`sintese.cache`)."""
+
+import os
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from sintese import cache
+from sintese.cinematica import CurvaS2
+
+
+def _resultado(valor=1.0):
+    return OptimizeResult(x=np.full(11, valor), fun=valor/10, nit=7, nfev=700, message="ok")
+
+
+def _chave(semente=1, **configuracoes):
+    return cache.chave('W1', [0.1, 0.2], [0.3, 0.4], 0.5, 2.6, [[5, 100]]*8 + [[0, 6.28]]*3,
+                       dict({'modo': 'completo'}, **configuracoes), semente)
+
+
+def test_chave_muda_com_dados_configuracoes_e_semente():
+    assert _chave() == _chave()
+    assert _chave() != _chave(semente=2)
+    assert _chave() != _chave(modo='normalizado')
+
+
+def test_ida_e_volta_com_derivados(tmp_path):
+    resultados = cache.CacheResultados(pasta=tmp_path)
+    curva = CurvaS2(0.0, np.array([0.0, 1.0]), np.array([0.5, np.nan]), np.array([0.1, np.nan]))
+    resultados.gravar('a', _resultado(), cache.Derivados((-1.0, 2.0, -3.0, 4.0), curva), 'S2')
+
+    lido = resultados.buscar('a')
+    np.testing.assert_array_equal(lido.x, np.ones(11))
+    assert (lido.fun, lido.nit, lido.nfev) == (0.1, 7, 700)
+    assert lido.derivados.limites == (-1.0, 2.0, -3.0, 4.0)
+    np.testing.assert_array_equal(lido.derivados.curva_S2.gammas, curva.gammas)
+    assert len(resultados.projetos('S2')) == 1
+    assert resultados.projetos('W1') == []
+    assert resultados.buscar('b') is None
+
+
+def test_versao_antiga_e_invalidada(tmp_path):
+    resultados = cache.CacheResultados(pasta=tmp_path)
+    resultados.gravar('a', _resultado())
+    antigo = os.path.join(tmp_path, 'versaoantiga_a.npz')
+    os.replace(resultados._arquivo('a'), antigo)
+
+    # Abrir o cache apaga os arquivos de outras versões do código
+    resultados = cache.CacheResultados(pasta=tmp_path)
+    assert not os.path.exists(antigo)
+    assert resultados.buscar('a') is None
+
+
+def test_versao_cobre_os_modulos_do_resultado():
+    nomes = {modulo.__name__.rsplit('.', 1)[-1] for modulo in cache.MODULOS_RESULTADO}
+    assert {'cinematica', 'objetivos', 'motores', 'refinamento', 'normalizacao', 'decomposicao',
+            'inicializacao'} <= nomes
+
+
+def test_descarta_os_usados_ha_mais_tempo(tmp_path):
+    resultados = cache.CacheResultados(pasta=tmp_path, tamanho_max=np.inf)
+    for k, nome in enumerate('abc'):
+        resultados.gravar(nome, _resultado(k))
+        os.utime(resultados._arquivo(nome), (1000 + k, 1000 + k))
+    resultados.buscar('a')                  # 'a' passa a ser o usado mais recentemente
+
+    tamanho = os.path.getsize(resultados._arquivo('a'))
+    resultados.tamanho_max = 3*tamanho      # a próxima gravação tira só a entrada mais antiga
+    resultados.gravar('d', _resultado(3))
+    assert resultados.buscar('b') is None
+    assert all(resultados.buscar(nome) is not None for nome in 'acd')
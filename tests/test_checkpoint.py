@@ -0,0 +1,61 @@
+"""Gravação e leitura do estado do DE (`sintese.checkpoint`)."""
+
+import numpy as np
+from scipy.optimize import OptimizeResult
+
+from sintese import checkpoint
+
+
+def _intermediario(nit, rng, energia_minima=1.0):
+    populacao = rng.random((6, 3))
+    energias = energia_minima + rng.random(6)
+    return OptimizeResult(nit=nit, population=populacao, population_energies=energias)
+
+
+def test_ida_e_volta_com_o_gerador(tmp_path):
+    rng = np.random.default_rng(7)
+    impressao = checkpoint.impressao(np.sum, [[0, 1]]*3, (np.arange(3), 'S2'))
+    gravador = checkpoint.Checkpoint(impressao, rng, nit_inicial=10, intervalo=0, pasta=tmp_path)
+    intermediario = _intermediario(4, rng)
+    gravador.registrar(intermediario)
+    seguinte = rng.random(5)
+    gravador.fechar()
+
+    estado = checkpoint.carregar(impressao, pasta=tmp_path)
+    assert estado.nit == 14
+    np.testing.assert_array_equal(estado.populacao, intermediario.population)
+    np.testing.assert_array_equal(estado.energias, intermediario.population_energies)
+
+    # O gerador retomado continua a sequência de onde a execução gravada parou
+    retomado = np.random.default_rng()
+    retomado.bit_generator.state = estado.estado_rng
+    np.testing.assert_array_equal(retomado.random(5), seguinte)
+
+    checkpoint.apagar(impressao, pasta=tmp_path)
+    assert checkpoint.carregar(impressao, pasta=tmp_path) is None
+
+
+def test_grava_quando_a_geracao_avanca_mesmo_sem_melhora(tmp_path):
+    rng = np.random.default_rng(0)
+    gravador = checkpoint.Checkpoint('teste', rng, intervalo=0, pasta=tmp_path)
+    gravador.registrar(_intermediario(1, rng, energia_minima=1.0))
+    gravador.registrar(_intermediario(1, rng, energia_minima=0.0))     # mesma geração: ignorado
+    pior = _intermediario(2, rng, energia_minima=5.0)
+    gravador.registrar(pior)
+    gravador.fechar()
+
+    estado = checkpoint.carregar('teste', pasta=tmp_path)
+    assert estado.nit == 2
+    np.testing.assert_array_equal(estado.energias, pior.population_energies)
+
+
+def test_respeita_o_intervalo(tmp_path):
+    rng = np.random.default_rng(0)
+    gravador = checkpoint.Checkpoint('teste', rng, intervalo=3600, pasta=tmp_path)
+    gravador.registrar(_intermediario(1, rng))
+    gravador.registrar(_intermediario(2, rng))
+    final = _intermediario(3, rng)
+    gravador.registrar(final, forcar=True)
+    gravador.fechar()
+
+    assert checkpoint.carregar('teste', pasta=tmp_path).nit == 3
@@ -0,0 +1,98 @@
+"""Fechamento do Stephenson 2: Newton em lote e continuação contra a solução direta."""
+
+import math
+
+import numpy as np
+
+from sintese.cinematica import (
+    Parametros,
+    continuar_gamma_S2,
+    escolher_gamma_S2,
+    interpolar_gamma_S2,
+    newton_gamma_S2,
+    resolver_gamma_S2,
+    residuo_S2,
+    solucoes_gamma_S2,
+)
+
+
+def _casos(S=2000, n=5, semente=0):
+    """Mecanismos aleatórios nos limites da interface e sequências crescentes de entrada."""
+
+    rng = np.random.default_rng(semente)
+    lo = np.array([5]*8 + [0]*3, dtype=float)
+    hi = np.array([100]*8 + [2*math.pi]*3)
+    X = lo + rng.random((S, 11))*(hi - lo)
+    inicio = rng.random((S, 1))*2*math.pi
+    thetaI = inicio + np.radians(np.cumsum(rng.uniform(5, 20, (S, n)), axis=1))
+    return Parametros._make(X.T[:, :, None]), thetaI
+
+
+def _distancia(a, b):
+    return np.abs(np.remainder(a - b + math.pi, 2*math.pi) - math.pi)
+
+
+def test_newton_fecha_o_mecanismo():
+    par, thetaI = _casos(S=300)
+    gamma = newton_gamma_S2(par, thetaI[:, :1], 1)
+    convergiu = np.flatnonzero(np.isfinite(gamma[:, 0]))
+    assert convergiu.size > 0
+    for k in convergiu:
+        par_k = Parametros._make(float(campo[k, 0]) for campo in par)
+        assert abs(residuo_S2(gamma[k, 0], par_k, thetaI[k, 0])) < 1e-6
+        # a raiz convergida é uma das soluções diretas, perto do chute
+        solucoes = solucoes_gamma_S2(par_k, thetaI[k, 0])
+        assert np.nanmin(_distancia(solucoes, gamma[k, 0])) < 1e-6
+        assert _distancia(gamma[k, 0], 1) < 0.5
+
+
+def test_resolver_segue_o_ramo_da_solucao_direta():
+    par, thetaI = _casos()
+    gamma = resolver_gamma_S2(par, thetaI)
+
+    # Referência: solução direta, ponto a ponto, no modo mais próximo do ponto anterior
+    solucoes = solucoes_gamma_S2(par, thetaI)
+    base = np.empty_like(gamma)
+    chute = np.ones(thetaI.shape[0])
+    for j in range(thetaI.shape[1]):
+        base[:, j] = escolher_gamma_S2(solucoes[:, j], chute)
+        chute = np.where(np.isnan(base[:, j]), chute, base[:, j])
+
+    np.testing.assert_array_equal(np.isnan(gamma), np.isnan(base))
+    monta = ~np.isnan(base)
+    assert monta.sum() > 1000
+    assert np.max(_distancia(gamma, base)[monta]) < 1e-6
+    # sem deriva: os valores ficam em (-pi, pi]
+    assert np.nanmax(np.abs(gamma)) <= math.pi
+
+
+def test_resolver_escalar_igual_ao_lote():
+    par, thetaI = _casos(S=50, n=1)
+    lote = resolver_gamma_S2(par, thetaI)[:, 0]
+    for k in range(50):
+        par_k = Parametros._make(float(campo[k, 0]) for campo in par)
+        escalar = resolver_gamma_S2(par_k, thetaI[k, 0])
+        assert np.isnan(escalar) == np.isnan(lote[k])
+        if not np.isnan(escalar):
+            assert abs(escalar - lote[k]) < 1e-9
+
+
+def test_continuacao_interpola_sobre_a_curva():
+    par, thetaI = _casos(S=400, n=1, semente=1)
+    testados = 0
+    for k in range(400):
+        par_k = Parametros._make(float(campo[k, 0]) for campo in par)
+        curva = continuar_gamma_S2(par_k, 0)
+        validos = np.isfinite(curva.gammas)
+        if validos.sum() < 20:
+            continue
+        # no meio de cada trecho contínuo, a interpolação fecha o mecanismo
+        meios = (curva.angulos[:-1] + curva.angulos[1:])/2
+        contiguos = validos[:-1] & validos[1:]
+        for ang in meios[contiguos][::10]:
+            gamma = interpolar_gamma_S2(curva, ang)
+            assert abs(residuo_S2(gamma, par_k, ang)) < 1e-3*(par_k.L1 + par_k.L9)
+        testados += 1
+        if testados == 5:
+            break
+    assert testados == 5
@@ -0,0 +1,38 @@
+"""Comparação simultânea das topologias (`sintese.comparacao`)."""
+
+import math
+
+import numpy as np
+
+from sintese import comparacao
+
+
+def _args():
+    thetaI, thetaOd = np.radians([30, 60, 90]), np.radians([20, 40, 55])
+    return thetaI, thetaOd, 3, math.radians(40), math.radians(140)
+
+
+def _limites():
+    limites = {tipo: [[5, 100]]*8 + [[0, 2*math.pi]]*3 for tipo in comparacao.TIPOS_COMPARADOS}
+    limites['S3'] = [[30, 100]] + [[5, 100]]*7 + [[0, 2*math.pi]]*3
+    return limites
+
+
+def _comparar(**opcoes):
+    return comparacao.comparar(_limites(), _args(), processos=2, tol=1e-2, atol=1e-4, maxiter=20, popsize=8,
+                               seed=3, **opcoes)
+
+
+def test_limites_proprios_de_cada_topologia():
+    tabela = _comparar(strategy='best1bin', init='sobol')
+    assert sorted(linha['tipo'] for linha in tabela) == sorted(comparacao.TIPOS_COMPARADOS)
+    for linha in tabela:
+        lo, hi = np.asarray(_limites()[linha['tipo']]).T
+        assert np.all((linha['x'] >= lo) & (linha['x'] <= hi))
+    # mesma semente, mesma tabela
+    assert [linha['erro'] for linha in _comparar(strategy='best1bin', init='sobol')] == [linha['erro'] for linha in tabela]
+
+
+def test_estrategia_autoadaptativa():
+    tabela = _comparar(strategy='L-SHADE')
+    assert all(0 < linha['nit'] <= 20 and np.isfinite(linha['erro']) for linha in tabela)
@@ -0,0 +1,83 @@
+"""Motores de evolução diferencial (`sintese.motores`) numa função de teste."""
+
+import numpy as np
+import pytest
+
+from sintese import inicializacao, motores, parada
+
+
+LIMITES = [[-5, 5]]*4
+
+
+def esfera(X):
+    """Soma dos quadrados em torno de 1, vetorizada como no scipy (X é N x S)."""
+
+    return np.sum((np.asarray(X) - 1)**2, axis=0)
+
+
+@pytest.mark.parametrize('variante', sorted(motores.VARIANTES_ADAPTATIVAS))
+def test_adaptativo_converge_e_e_reproduzivel(variante):
+    resultado = motores.de_adaptativo(esfera, LIMITES, variante=variante, maxiter=200, seed=1, polish=False)
+    assert resultado.fun < 1e-8
+    np.testing.assert_allclose(resultado.x, np.ones(4), atol=1e-4)
+    assert resultado.nit == 200
+    de_novo = motores.de_adaptativo(esfera, LIMITES, variante=variante, maxiter=200, seed=1, polish=False)
+    np.testing.assert_array_equal(de_novo.x, resultado.x)
+
+
+def test_lshade_reduz_a_populacao_ao_longo_do_maxiter():
+    tamanhos = []
+    motores.de_adaptativo(esfera, LIMITES, variante='lshade', maxiter=50, seed=1, polish=False, tol=0,
+                          callback=lambda intermediate_result: tamanhos.append(len(intermediate_result.population)))
+    assert tamanhos[0] < 60 and tamanhos[-1] == motores.POPULACAO_MINIMA
+    assert all(b <= a for a, b in zip(tamanhos, tamanhos[1:]))
+
+
+def test_lshade_reduz_a_populacao_ao_longo_do_orcamento():
+    orcamento = parada.Orcamento(avaliacoes=3000)
+    tamanhos = []
+
+    def acompanhar(intermediate_result):
+        tamanhos.append(len(intermediate_result.population))
+        return orcamento(intermediate_result)
+
+    resultado = motores.de_adaptativo(esfera, LIMITES, variante='lshade', maxiter=parada.MAXITER_ORCAMENTO,
+                                      seed=1, polish=False, tol=0, callback=acompanhar, orcamento=orcamento)
+    assert resultado.message == "Interrompido pelo callback."
+    # O orçamento conta as avaliações feitas, e a população chega ao mínimo perto do fim dele
+    assert abs(orcamento.avaliacoes_usadas - resultado.nfev) <= tamanhos[0]
+    assert tamanhos[-1] <= 2*motores.POPULACAO_MINIMA
+
+
+def test_reinicios_crescem_a_populacao_e_guardam_a_elite():
+    def executar(popsize, init, maxiter, callback):
+        return motores.de_adaptativo(esfera, LIMITES, variante='shade', popsize=popsize, maxiter=maxiter,
+                                     callback=callback, polish=False, seed=2, init=init)
+
+    resultado = motores.de_reinicios(executar, esfera, LIMITES, popsize=5, reinicios=2, maxiter=600, seed=3,
+                                     polish=False, estagnacao=parada.Estagnacao(LIMITES, geracoes=30))
+    assert resultado.reinicios >= 1
+    assert resultado.populacoes[:2] == [20, 40]
+    assert resultado.fun == resultado.arquivo_energias[0] == np.min(resultado.arquivo_energias)
+    assert resultado.fun < 1e-3
+    assert resultado.nit <= 600
+
+
+def test_callback_interrompe_sem_polimento():
+    resultado = motores.de_adaptativo(esfera, LIMITES, variante='jade', maxiter=100, seed=1,
+                                      callback=lambda intermediate_result: intermediate_result.nit >= 3)
+    assert resultado.nit == 3
+    assert resultado.message == "Interrompido pelo callback."
+    assert resultado.nfev == 4*15*4       # população inicial + 3 gerações, sem avaliações do polimento
+
+
+@pytest.mark.parametrize('popsize, ilhas_usadas', [(5, 16), (1, 10)])
+def test_ilhas_com_populacao_inicial_dada(popsize, ilhas_usadas):
+    # Poucos vetores dados: completados até popsize*N por ilha; com popsize=1 (4 por ilha),
+    # as ilhas são reduzidas até cada uma ter os 6 indivíduos que a 'rand2bin' sorteia
+    init = inicializacao.populacao_inicial(LIMITES, 5, 'sobol', rng=0)
+    resultado = motores.de_ilhas(esfera, LIMITES, estrategias=('best2bin', 'rand2bin'), ilhas=16, popsize=popsize,
+                                 maxiter=4, migracao=2, workers=2, seed=1, init=init, polish=False, tol=0)
+    assert resultado.ilhas == ilhas_usadas
+    assert len(resultado.population) == 16*popsize*len(LIMITES)
+    np.testing.assert_array_equal(resultado.population_energies, esfera(resultado.population.T))
@@ -0,0 +1,31 @@
+"""Avaliação com abandono antecipado (`objetivos.ObjetivoComLimite`) contra as funções completas."""
+
+import numpy as np
+import pytest
+
+from sintese import bancada
+from sintese.objetivos import OBJETIVOS, OBJETIVOS_GRADUADOS, ObjetivoComLimite
+
+
+def _candidatos(tipo, rng, S=400):
+    """Candidatos aleatórios nos limites e perturbações pequenas do mecanismo de referência."""
+
+    bounds, args, referencia = bancada._referencia(tipo, bancada.PONTOS, bancada.DELTA_MI, 0)
+    limites = np.asarray(bounds)
+    aleatorios = limites[:, :1] + rng.random((11, S))*(limites[:, 1:] - limites[:, :1])
+    vizinhos = np.asarray(referencia)[:, None]*(1 + 0.01*rng.standard_normal((11, S)))
+    return args, np.hstack([aleatorios, vizinhos])
+
+
+@pytest.mark.parametrize('graduadas', [False, True])
+@pytest.mark.parametrize('tipo', sorted(OBJETIVOS))
+def test_sem_limite_igual_a_funcao_completa(tipo, graduadas):
+    rng = np.random.default_rng(0)
+    args, P = _candidatos(tipo, rng)
+    completa = (OBJETIVOS_GRADUADOS if graduadas else OBJETIVOS)[tipo][1]
+    objetivo = ObjetivoComLimite(tipo, graduadas)
+    # A primeira chamada aprende uma ordem dos pontos diferente da natural; a segunda já a usa
+    objetivo(P, *args)
+    assert not np.array_equal(objetivo.ordem(args[2]), np.arange(args[2]))
+
+    np.testing.assert_allclose(objetivo(P, *args, limites=None), completa(P, *args), rtol=1e-9)